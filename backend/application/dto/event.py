@@ -0,0 +1,35 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from uuid import UUID
+
+from backend.domain.entities.event_dm import EventType
+from backend.domain.entities.event_stats import StatsBucket
+
+
+@dataclass(slots=True)
+class EventFilterDTO:
+    start: datetime | None = None
+    end: datetime | None = None
+    types: Sequence[EventType] = ()
+    secret_id: UUID | None = None
+    client_ip: str | None = None
+
+
+@dataclass(slots=True)
+class EventPartitionReportDTO:
+    created: list[str]
+    removed: list[str]
+
+
+@dataclass(slots=True)
+class EventStatsBucketDTO:
+    bucket_start: datetime
+    counts: dict[EventType, int]
+
+
+@dataclass(slots=True)
+class EventStatsDTO:
+    bucket: StatsBucket
+    rolled_up_to: datetime | None
+    buckets: list[EventStatsBucketDTO]
@@ -1,4 +1,6 @@
 from dataclasses import dataclass
+from datetime import timedelta
+from uuid import UUID
 
 
 @dataclass(slots=True)
@@ -6,3 +8,22 @@ class CreateSecretDTO:
     secret: str
     passphrase: str | None
     ttl_seconds: int | None
+
+
+@dataclass(slots=True)
+class SweptSecretDTO:
+    uuid: UUID
+    expiry_lag: timedelta
+
+
+@dataclass(slots=True)
+class SweepReportDTO:
+    swept: int
+    chunks: int
+    max_lag: timedelta | None
+
+
+@dataclass(slots=True)
+class PurgeReportDTO:
+    purged: int
+    batches: int
@@ -1,3 +1,6 @@
+from backend.application.exceptions.hashing import HashingEngineOverloadedError
+from backend.application.exceptions.pagination import InvalidCursorError
 from backend.application.exceptions.secret import IncorrectPassphraseError
+from backend.application.exceptions.stats import InvalidStatsRangeError
 
-__all__ = ['IncorrectPassphraseError']
+__all__ = ['HashingEngineOverloadedError', 'IncorrectPassphraseError', 'InvalidCursorError', 'InvalidStatsRangeError']
@@ -0,0 +1,7 @@
+from backend.application.exceptions.base import AppError
+
+
+class HashingEngineOverloadedError(AppError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__('Too many passphrase operations in progress, try again later')
+        self.retry_after = retry_after
@@ -0,0 +1,6 @@
+from backend.application.exceptions.base import AppError
+
+
+class InvalidCursorError(AppError):
+    def __init__(self) -> None:
+        super().__init__('Invalid pagination cursor')
@@ -0,0 +1,4 @@
+from backend.application.exceptions.base import AppError
+
+
+class InvalidStatsRangeError(AppError): ...
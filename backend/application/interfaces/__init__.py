@@ -1,20 +1,56 @@
 from backend.application.interfaces.bcrypt_hasher import BcryptHasher
+from backend.application.interfaces.count_cache import CountCache
 from backend.application.interfaces.current_dt import GenerateCurrentDT
 from backend.application.interfaces.db_session import DBSession
 from backend.application.interfaces.encryption import EncryptionService
-from backend.application.interfaces.event_repo import EventReader, EventSaver
-from backend.application.interfaces.secret_repo import SecretDeleter, SecretReader, SecretSaver
+from backend.application.interfaces.event_repo import (
+    EventCountEstimator,
+    EventExporter,
+    EventPageReader,
+    EventPartitionManager,
+    EventReader,
+    EventRollupUpdater,
+    EventSaver,
+    EventStatsReader,
+)
+from backend.application.interfaces.hashing_engine import HashingEngine
+from backend.application.interfaces.metrics import Metrics, StageTimer
+from backend.application.interfaces.secret_filter import SecretIdFilter
+from backend.application.interfaces.secret_repo import (
+    SecretClaimer,
+    SecretDeleter,
+    SecretIdLister,
+    SecretPurger,
+    SecretReader,
+    SecretSaver,
+    SecretSweeper,
+)
 from backend.application.interfaces.uuid_generator import UUIDGenerator
 
 __all__ = [
     'BcryptHasher',
+    'CountCache',
     'DBSession',
     'EncryptionService',
+    'EventCountEstimator',
+    'EventExporter',
+    'EventPageReader',
+    'EventPartitionManager',
     'EventReader',
+    'EventRollupUpdater',
     'EventSaver',
+    'EventStatsReader',
     'GenerateCurrentDT',
+    'HashingEngine',
+    'Metrics',
+    'SecretClaimer',
     'SecretDeleter',
+    'SecretIdFilter',
+    'SecretIdLister',
+    'SecretPurger',
     'SecretReader',
     'SecretSaver',
+    'SecretSweeper',
+    'StageTimer',
     'UUIDGenerator',
 ]
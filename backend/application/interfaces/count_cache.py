@@ -0,0 +1,10 @@
+from abc import abstractmethod
+from typing import Protocol
+
+
+class CountCache(Protocol):
+    @abstractmethod
+    async def get(self, key: str) -> int | None: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: int) -> None: ...
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+from collections.abc import Sequence
 from typing import Protocol
 
 
@@ -8,3 +9,9 @@ class EncryptionService(Protocol):
 
     @abstractmethod
     def decrypt(self, ciphertext: bytes) -> bytes: ...
+
+    @abstractmethod
+    def encrypt_many(self, plaintexts: Sequence[str]) -> list[bytes]: ...
+
+    @abstractmethod
+    def decrypt_many(self, ciphertexts: Sequence[bytes]) -> list[bytes]: ...
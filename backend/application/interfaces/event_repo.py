@@ -1,8 +1,12 @@
 from abc import abstractmethod
-from collections.abc import Collection
+from collections.abc import AsyncIterator, Collection, Sequence
+from datetime import date, datetime
 from typing import Protocol
 
+from backend.application.dto.event import EventFilterDTO
 from backend.domain.entities.event_dm import EventDM
+from backend.domain.entities.event_stats import EventCountDM, StatsBucket
+from backend.domain.entities.pagination import KeysetCursor
 
 
 class EventReader(Protocol):
@@ -10,6 +14,69 @@ class EventReader(Protocol):
     async def get_all(self) -> Collection[EventDM]: ...
 
 
+class EventPageReader(Protocol):
+    @abstractmethod
+    async def get_page(
+        self,
+        limit: int,
+        after: KeysetCursor | None = None,
+        offset: int = 0,
+        filters: EventFilterDTO | None = None,
+    ) -> Sequence[EventDM]: ...
+
+    @abstractmethod
+    async def count(self, filters: EventFilterDTO | None = None) -> int: ...
+
+
+class EventCountEstimator(Protocol):
+    @abstractmethod
+    async def estimate_count(self, filters: EventFilterDTO | None = None) -> int: ...
+
+
+class EventExporter(Protocol):
+    @abstractmethod
+    def export(self, filters: EventFilterDTO) -> AsyncIterator[Sequence[EventDM]]: ...
+
+
 class EventSaver(Protocol):
     @abstractmethod
     async def save(self, event: EventDM) -> None: ...
+
+    @abstractmethod
+    async def save_many(self, events: Sequence[EventDM]) -> None: ...
+
+
+class EventPartitionManager(Protocol):
+    @abstractmethod
+    async def try_lock(self) -> bool: ...
+
+    @abstractmethod
+    async def create_partitions(self, months: Sequence[date]) -> Sequence[str]: ...
+
+    @abstractmethod
+    async def remove_partitions(self, before: date, detach: bool = False) -> Sequence[str]: ...
+
+
+class EventStatsReader(Protocol):
+    @abstractmethod
+    async def get_counts(self, bucket: StatsBucket, start: datetime, end: datetime) -> Sequence[EventCountDM]: ...
+
+    @abstractmethod
+    async def get_rolled_up_to(self) -> datetime | None: ...
+
+
+class EventRollupUpdater(Protocol):
+    @abstractmethod
+    async def try_lock(self) -> bool: ...
+
+    @abstractmethod
+    async def get_watermark(self) -> datetime | None: ...
+
+    @abstractmethod
+    async def get_first_event_time(self) -> datetime | None: ...
+
+    @abstractmethod
+    async def roll_up(self, start: datetime, end: datetime) -> int: ...
+
+    @abstractmethod
+    async def set_watermark(self, watermark: datetime) -> None: ...
@@ -0,0 +1,14 @@
+from abc import abstractmethod
+from collections.abc import Sequence
+from typing import Protocol
+
+
+class HashingEngine(Protocol):
+    @abstractmethod
+    async def hash(self, raw_data: str) -> bytes: ...
+
+    @abstractmethod
+    async def hash_many(self, raw_data: Sequence[str]) -> list[bytes]: ...
+
+    @abstractmethod
+    async def verify(self, raw_data: bytes, hashed_data: bytes) -> bool: ...
@@ -0,0 +1,19 @@
+from abc import abstractmethod
+from contextlib import AbstractContextManager
+from typing import Protocol
+
+
+class StageTimer(Protocol):
+    @abstractmethod
+    def lap(self, stage: str) -> None: ...
+
+
+class Metrics(Protocol):
+    @abstractmethod
+    def observe(self, metric: str, value: float, **labels: str) -> None: ...
+
+    @abstractmethod
+    def measure(self, metric: str, **labels: str) -> AbstractContextManager[None]: ...
+
+    @abstractmethod
+    def stages(self, operation: str) -> StageTimer: ...
@@ -0,0 +1,24 @@
+from abc import abstractmethod
+from collections.abc import Sequence
+from typing import Protocol
+from uuid import UUID
+
+
+class SecretIdFilter(Protocol):
+    @abstractmethod
+    async def might_contain(self, secret_id: UUID) -> bool: ...
+
+    @abstractmethod
+    async def add_many(self, secret_ids: Sequence[UUID]) -> None: ...
+
+    @abstractmethod
+    async def discard_many(self, secret_ids: Sequence[UUID]) -> None: ...
+
+    @abstractmethod
+    async def is_ready(self) -> bool: ...
+
+    @abstractmethod
+    async def claim_rebuild(self) -> bool: ...
+
+    @abstractmethod
+    async def mark_ready(self) -> None: ...
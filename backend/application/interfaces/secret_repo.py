@@ -1,8 +1,10 @@
 from abc import abstractmethod
-from collections.abc import Collection
+from collections.abc import Collection, Sequence
+from datetime import timedelta
 from typing import Protocol
 from uuid import UUID
 
+from backend.application.dto.secret import SweptSecretDTO
 from backend.domain.entities.secret_dm import SecretDM
 
 
@@ -10,15 +12,35 @@ class SecretReader(Protocol):
     @abstractmethod
     async def get_by_id(self, secret_id: UUID) -> SecretDM: ...
 
-    @abstractmethod
-    async def get_all_expirable(self) -> Collection[SecretDM]: ...
-
 
 class SecretSaver(Protocol):
     @abstractmethod
     async def save(self, secret: SecretDM) -> None: ...
 
+    @abstractmethod
+    async def save_many(self, secrets: Sequence[SecretDM]) -> None: ...
+
 
 class SecretDeleter(Protocol):
     @abstractmethod
     async def delete(self, secret: SecretDM) -> None: ...
+
+
+class SecretClaimer(Protocol):
+    @abstractmethod
+    async def claim(self, secret_id: UUID) -> SecretDM: ...
+
+
+class SecretIdLister(Protocol):
+    @abstractmethod
+    async def get_live_ids(self, limit: int, after: UUID | None = None) -> Sequence[UUID]: ...
+
+
+class SecretSweeper(Protocol):
+    @abstractmethod
+    async def sweep_expired(self, limit: int, shard: int = 0, shards: int = 1) -> Collection[SweptSecretDTO]: ...
+
+
+class SecretPurger(Protocol):
+    @abstractmethod
+    async def purge_deleted(self, grace: timedelta, limit: int) -> int: ...
@@ -1,18 +1,47 @@
-from collections.abc import Collection
+import base64
+import binascii
+from collections.abc import Callable, Sequence
+from datetime import datetime
 from typing import TypeVar
+from uuid import UUID
 
-from backend.domain.entities.pagination import Pagination
+from backend.application import exceptions as app_exceptions
+from backend.domain.entities.pagination import KeysetCursor, Pagination
 
 T = TypeVar('T')
 
 
 class PaginationService:
     @staticmethod
-    def create_page(page: int, page_size: int, items: Collection[T]) -> Pagination[T]:
-        offset = (page - 1) * page_size
+    def encode_cursor(cursor: KeysetCursor) -> str:
+        raw = f'{cursor.created_at.isoformat()}|{cursor.uuid}'.encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(token: str) -> KeysetCursor:
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+            created_at, uuid = raw.split('|')
+            return KeysetCursor(created_at=datetime.fromisoformat(created_at), uuid=UUID(uuid))
+        except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+            raise app_exceptions.InvalidCursorError from e
+
+    def create_page(
+        self,
+        page_size: int,
+        items: Sequence[T],
+        total: int,
+        cursor_key: Callable[[T], KeysetCursor],
+    ) -> Pagination[T]:
+        # items are fetched with one extra row to find out whether a next page exists
+        page_items = items[:page_size]
+        next_cursor = (
+            self.encode_cursor(cursor_key(page_items[-1])) if len(items) > page_size and page_items else None
+        )
 
         return Pagination[T](
-            total=len(items),
+            total=total,
             size=page_size,
-            items=items[offset : offset + page_size],
+            items=page_items,
+            next_cursor=next_cursor,
         )
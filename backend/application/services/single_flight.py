@@ -0,0 +1,38 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any, TypeVar
+
+T = TypeVar('T')
+
+# handed to waiters when the running call was cancelled, so one of them runs the call instead
+_ABANDONED = object()
+
+
+class SingleFlight:
+    # per process and event loop; concurrent calls with the same key run once, callers that join a running call
+    # get its outcome flagged as shared and decide themselves what a shared result means
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future[Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        while (call := self._calls.get(key)) is not None:
+            result = await asyncio.shield(call)
+            if result is not _ABANDONED:
+                return result, True
+
+        call = self._calls[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            call.set_result(_ABANDONED)
+            raise
+        except BaseException as e:
+            call.set_exception(e)
+            # waiters re-raise it; without any, retrieving it here keeps asyncio from logging it as lost
+            call.exception()
+            raise
+        else:
+            call.set_result(result)
+            return result, False
+        finally:
+            del self._calls[key]
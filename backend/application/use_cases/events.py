@@ -1,18 +1,185 @@
-from backend.application import interfaces
+import hashlib
+from collections.abc import AsyncIterator, Sequence
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+
+from backend.application import exceptions as app_exceptions, interfaces
+from backend.application.dto.event import (
+    EventFilterDTO,
+    EventPartitionReportDTO,
+    EventStatsBucketDTO,
+    EventStatsDTO,
+)
 from backend.application.services.pagination import PaginationService
-from backend.domain.entities.event_dm import EventDM
-from backend.domain.entities.pagination import Pagination
+from backend.domain.entities.event_dm import EventDM, EventType, add_months
+from backend.domain.entities.event_stats import StatsBucket
+from backend.domain.entities.pagination import CountStrategy, KeysetCursor, Pagination
+
+MAX_STATS_BUCKETS = 1440
 
 
 class GetEventsInteractor:
     def __init__(
         self,
-        event_reader: interfaces.EventReader,
+        event_reader: interfaces.EventPageReader,
+        count_estimator: interfaces.EventCountEstimator,
+        count_cache: interfaces.CountCache,
         pagination_service: PaginationService,
     ):
         self._event_reader = event_reader
+        self._count_estimator = count_estimator
+        self._count_cache = count_cache
         self._pagination_service = pagination_service
 
-    async def __call__(self, page: int, page_size: int) -> Pagination[EventDM]:
-        events = await self._event_reader.get_all()
-        return self._pagination_service.create_page(page=page, page_size=page_size, items=events)
+    async def __call__(
+        self,
+        page_size: int,
+        page: int | None = None,
+        cursor: str | None = None,
+        filters: EventFilterDTO | None = None,
+        count_strategy: CountStrategy | None = None,
+    ) -> Pagination[EventDM]:
+        after = self._pagination_service.decode_cursor(cursor) if cursor else None
+        offset = (page - 1) * page_size if page and after is None else 0
+        filters = _normalize_filters(filters or EventFilterDTO())
+        if count_strategy is None:
+            # an exact count scans every matching row, which would undo the flat latency of keyset pages;
+            # offset paging already pays for its depth and needs the exact total to number its pages
+            count_strategy = CountStrategy.EXACT if page and after is None else CountStrategy.ESTIMATED
+
+        events = await self._event_reader.get_page(limit=page_size + 1, after=after, offset=offset, filters=filters)
+        total = await self._count(filters=filters, count_strategy=count_strategy)
+        if count_strategy != CountStrategy.EXACT:
+            # an estimate or a stale count must not claim fewer events than the client has already been shown
+            total = max(total, offset + min(len(events), page_size))
+
+        return self._pagination_service.create_page(
+            page_size=page_size,
+            items=events,
+            total=total,
+            cursor_key=lambda event: KeysetCursor(created_at=event.created_at, uuid=event.uuid),
+        )
+
+    async def _count(self, filters: EventFilterDTO, count_strategy: CountStrategy) -> int:
+        match count_strategy:
+            case CountStrategy.ESTIMATED:
+                return await self._count_estimator.estimate_count(filters=filters)
+            case CountStrategy.CACHED:
+                key = 'event-count:' + hashlib.blake2b(repr(filters).encode(), digest_size=16).hexdigest()
+                total = await self._count_cache.get(key=key)
+                if total is None:
+                    total = await self._event_reader.count(filters=filters)
+                    await self._count_cache.set(key=key, value=total)
+                return total
+        return await self._event_reader.count(filters=filters)
+
+
+def _as_utc(value: datetime) -> datetime:
+    # a time without an offset is read as utc, the zone every event is recorded in
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value
+
+
+def _normalize_filters(filters: EventFilterDTO) -> EventFilterDTO:
+    return replace(
+        filters,
+        start=_as_utc(filters.start) if filters.start else None,
+        end=_as_utc(filters.end) if filters.end else None,
+    )
+
+
+class ExportEventsInteractor:
+    def __init__(self, event_exporter: interfaces.EventExporter):
+        self._event_exporter = event_exporter
+
+    def __call__(self, filters: EventFilterDTO) -> AsyncIterator[Sequence[EventDM]]:
+        return self._event_exporter.export(filters=_normalize_filters(filters))
+
+
+class MaintainEventPartitionsInteractor:
+    def __init__(
+        self,
+        partition_manager: interfaces.EventPartitionManager,
+        session: interfaces.DBSession,
+        current_dt: interfaces.GenerateCurrentDT,
+    ):
+        self._partition_manager = partition_manager
+        self._session = session
+        self._current_dt = current_dt
+
+    async def __call__(
+        self,
+        months_ahead: int,
+        retention_months: int = 0,
+        detach: bool = False,
+    ) -> EventPartitionReportDTO:
+        report = EventPartitionReportDTO(created=[], removed=[])
+        # every instance runs the job; whoever loses the lock leaves the DDL to the winner
+        if not await self._partition_manager.try_lock():
+            return report
+
+        current_month = self._current_dt().date().replace(day=1)
+        months = [add_months(current_month, i) for i in range(months_ahead + 1)]
+        report.created.extend(await self._partition_manager.create_partitions(months=months))
+
+        if retention_months > 0:
+            # a partition goes only once all of its rows are older than the retention
+            before = add_months(current_month, -retention_months)
+            report.removed.extend(await self._partition_manager.remove_partitions(before=before, detach=detach))
+
+        await self._session.commit()
+        return report
+
+
+class GetEventStatsInteractor:
+    def __init__(self, stats_reader: interfaces.EventStatsReader):
+        self._stats_reader = stats_reader
+
+    async def __call__(self, bucket: StatsBucket, start: datetime, end: datetime) -> EventStatsDTO:
+        start, end = _as_utc(start), _as_utc(end)
+        if end <= start:
+            raise app_exceptions.InvalidStatsRangeError('The end of the range must be after its start')
+        if (end - start) / bucket.width > MAX_STATS_BUCKETS:
+            raise app_exceptions.InvalidStatsRangeError(
+                f'The range spans more than {MAX_STATS_BUCKETS} {bucket} buckets, use a larger bucket',
+            )
+
+        buckets: dict[datetime, dict[EventType, int]] = {}
+        for row in await self._stats_reader.get_counts(bucket=bucket, start=start, end=end):
+            buckets.setdefault(row.bucket_start, dict.fromkeys(EventType, 0))[row.type] = row.count
+
+        return EventStatsDTO(
+            bucket=bucket,
+            rolled_up_to=await self._stats_reader.get_rolled_up_to(),
+            buckets=[EventStatsBucketDTO(bucket_start=key, counts=counts) for key, counts in buckets.items()],
+        )
+
+
+class RollUpEventsInteractor:
+    def __init__(
+        self,
+        rollup_updater: interfaces.EventRollupUpdater,
+        session: interfaces.DBSession,
+        current_dt: interfaces.GenerateCurrentDT,
+    ):
+        self._rollup_updater = rollup_updater
+        self._session = session
+        self._current_dt = current_dt
+
+    async def __call__(self, delay: timedelta, window: timedelta = timedelta(hours=1)) -> int:
+        # events younger than the delay may still sit in a write buffer, rolling them up now would lose them
+        until = self._current_dt() - delay
+        written = 0
+        # one transaction per window; the lock is taken again for each, so a crash loses at most one window
+        while await self._rollup_updater.try_lock():
+            start = await self._rollup_updater.get_watermark() or await self._rollup_updater.get_first_event_time()
+            if start is None:
+                await self._rollup_updater.set_watermark(watermark=until)
+            if start is None or start >= until:
+                await self._session.commit()
+                break
+
+            end = min(start + window, until)
+            written += await self._rollup_updater.roll_up(start=start, end=end)
+            await self._rollup_updater.set_watermark(watermark=end)
+            await self._session.commit()
+        return written
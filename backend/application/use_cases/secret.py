@@ -1,4 +1,5 @@
 import asyncio
+from collections.abc import Sequence
 from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
 from functools import partial
@@ -6,7 +7,9 @@ from typing import Protocol
 from uuid import UUID
 
 from backend.application import exceptions as app_exceptions, interfaces
-from backend.application.dto.secret import CreateSecretDTO
+from backend.application.dto.secret import CreateSecretDTO, PurgeReportDTO, SweepReportDTO
+from backend.application.services.single_flight import SingleFlight
+from backend.domain import exceptions as domain_exceptions
 from backend.domain.entities.event_dm import EventDM, EventType
 from backend.domain.entities.secret_dm import SecretDM
 
@@ -16,34 +19,38 @@ class CreateSecretInteractor:
         self,
         thread_pool: ThreadPoolExecutor,
         secret_saver: interfaces.SecretSaver,
+        secret_filter: interfaces.SecretIdFilter,
         event_saver: interfaces.EventSaver,
         db_session: interfaces.DBSession,
         encription_service: interfaces.EncryptionService,
-        hasher: interfaces.BcryptHasher,
+        hashing_engine: interfaces.HashingEngine,
         current_dt: interfaces.GenerateCurrentDT,
         uuid_generator: interfaces.UUIDGenerator,
+        metrics: interfaces.Metrics,
     ):
         self._thread_pool = thread_pool
         self._secret_saver = secret_saver
+        self._secret_filter = secret_filter
         self._event_saver = event_saver
         self._db_session = db_session
         self._encription_service = encription_service
-        self._hasher = hasher
+        self._hashing_engine = hashing_engine
         self._current_dt = current_dt
         self._uuid_generator = uuid_generator
+        self._metrics = metrics
 
     async def __call__(self, data: CreateSecretDTO, client_ip: str, client_user_agent: str) -> UUID:
-        loop = asyncio.get_running_loop()
-        hashed_passphrase = (
-            await loop.run_in_executor(self._thread_pool, partial(self._hasher.hash, raw_data=data.passphrase))
-            if data.passphrase
-            else None
-        )
+        stages = self._metrics.stages(operation='create_secret')
+
+        hashed_passphrase = await self._hashing_engine.hash(raw_data=data.passphrase) if data.passphrase else None
+        stages.lap(stage='hash')
 
+        loop = asyncio.get_running_loop()
         encrypted_secret = await loop.run_in_executor(
             self._thread_pool,
             partial(self._encription_service.encrypt, plaintext=data.secret),
         )
+        stages.lap(stage='encrypt')
 
         current_dt = self._current_dt()
         expired_at = current_dt + timedelta(seconds=data.ttl_seconds) if data.ttl_seconds else None
@@ -67,12 +74,106 @@ class CreateSecretInteractor:
         )
 
         await self._secret_saver.save(secret=secret_dm)
+        stages.lap(stage='save_secret')
         await self._event_saver.save(event=event_dm)
+        stages.lap(stage='save_event')
+        await self._secret_filter.add_many(secret_ids=[secret_dm.uuid])
+        stages.lap(stage='filter')
         await self._db_session.commit()
+        stages.lap(stage='commit')
 
         return secret_dm.uuid
 
 
+class CreateSecretBatchInteractor:
+    encrypt_chunk_size = 256
+
+    def __init__(
+        self,
+        thread_pool: ThreadPoolExecutor,
+        secret_saver: interfaces.SecretSaver,
+        secret_filter: interfaces.SecretIdFilter,
+        event_saver: interfaces.EventSaver,
+        db_session: interfaces.DBSession,
+        encription_service: interfaces.EncryptionService,
+        hashing_engine: interfaces.HashingEngine,
+        current_dt: interfaces.GenerateCurrentDT,
+        uuid_generator: interfaces.UUIDGenerator,
+        metrics: interfaces.Metrics,
+    ):
+        self._thread_pool = thread_pool
+        self._secret_saver = secret_saver
+        self._secret_filter = secret_filter
+        self._event_saver = event_saver
+        self._db_session = db_session
+        self._encription_service = encription_service
+        self._hashing_engine = hashing_engine
+        self._current_dt = current_dt
+        self._uuid_generator = uuid_generator
+        self._metrics = metrics
+
+    async def __call__(self, data: Sequence[CreateSecretDTO], client_ip: str, client_user_agent: str) -> list[UUID]:
+        stages = self._metrics.stages(operation='create_secret_batch')
+
+        hashed_passphrases, encrypted_secrets = await asyncio.gather(
+            self._hashing_engine.hash_many(raw_data=[item.passphrase for item in data if item.passphrase]),
+            self._encrypt([item.secret for item in data]),
+        )
+        stages.lap(stage='hash_and_encrypt')
+        hashed_passphrases = iter(hashed_passphrases)
+
+        current_dt = self._current_dt()
+        secrets = []
+        events = []
+        for item, encrypted_secret in zip(data, encrypted_secrets, strict=True):
+            secret_dm = SecretDM(
+                uuid=self._uuid_generator(),
+                secret=encrypted_secret,
+                passphrase=next(hashed_passphrases) if item.passphrase else None,
+                created_at=current_dt,
+                expired_at=current_dt + timedelta(seconds=item.ttl_seconds) if item.ttl_seconds else None,
+                is_deleted=False,
+            )
+            secrets.append(secret_dm)
+            events.append(
+                EventDM(
+                    uuid=self._uuid_generator(),
+                    client_ip=client_ip,
+                    client_user_agent=client_user_agent,
+                    type=EventType.CREATE,
+                    created_at=current_dt,
+                    secret_id=secret_dm.uuid,
+                ),
+            )
+
+        secret_ids = [secret.uuid for secret in secrets]
+
+        await self._secret_saver.save_many(secrets=secrets)
+        stages.lap(stage='save_secret')
+        await self._event_saver.save_many(events=events)
+        stages.lap(stage='save_event')
+        await self._secret_filter.add_many(secret_ids=secret_ids)
+        stages.lap(stage='filter')
+        await self._db_session.commit()
+        stages.lap(stage='commit')
+
+        return secret_ids
+
+    async def _encrypt(self, plaintexts: Sequence[str]) -> list[bytes]:
+        loop = asyncio.get_running_loop()
+        chunk_size = self.encrypt_chunk_size
+        chunks = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    self._thread_pool,
+                    partial(self._encription_service.encrypt_many, plaintexts=plaintexts[i : i + chunk_size]),
+                )
+                for i in range(0, len(plaintexts), chunk_size)
+            ),
+        )
+        return [ciphertext for chunk in chunks for ciphertext in chunk]
+
+
 class SecretDeleteManager(interfaces.SecretReader, interfaces.SecretDeleter, Protocol): ...
 
 
@@ -80,31 +181,55 @@ class GetSecretInteractor:
     def __init__(
         self,
         thread_pool: ThreadPoolExecutor,
-        secret_delete_manager: SecretDeleteManager,
+        secret_claimer: interfaces.SecretClaimer,
+        secret_filter: interfaces.SecretIdFilter,
         event_saver: interfaces.EventSaver,
         db_session: interfaces.DBSession,
         encription_service: interfaces.EncryptionService,
         current_dt: interfaces.GenerateCurrentDT,
         uuid_generator: interfaces.UUIDGenerator,
+        metrics: interfaces.Metrics,
+        single_flight: SingleFlight,
     ):
         self._thread_pool = thread_pool
-        self._secret_delete_manager = secret_delete_manager
+        self._secret_claimer = secret_claimer
+        self._secret_filter = secret_filter
         self._event_saver = event_saver
         self._db_session = db_session
         self._encription_service = encription_service
         self._current_dt = current_dt
         self._uuid_generator = uuid_generator
+        self._metrics = metrics
+        self._single_flight = single_flight
 
     async def __call__(self, secret_id: UUID, client_ip: str, client_user_agent: str) -> str:
-        secret_dm = await self._secret_delete_manager.get_by_id(secret_id=secret_id)
+        # link previews and the human fetch the same secret at once; only the first request burns it,
+        # the ones that arrive while it runs wait for it and then get the 404 they would get afterwards
+        secret, shared = await self._single_flight.do(
+            key=secret_id,
+            func=partial(self._read, secret_id=secret_id, client_ip=client_ip, client_user_agent=client_user_agent),
+        )
+        if shared:
+            raise domain_exceptions.SecretNotFound
+        return secret
+
+    async def _read(self, secret_id: UUID, client_ip: str, client_user_agent: str) -> str:
+        stages = self._metrics.stages(operation='get_secret')
+
+        if not await self._secret_filter.might_contain(secret_id=secret_id):
+            raise domain_exceptions.SecretNotFound
+        stages.lap(stage='filter')
+
+        secret_dm = await self._secret_claimer.claim(secret_id=secret_id)
+        stages.lap(stage='claim')
 
         loop = asyncio.get_running_loop()
         decrypted_secret = await loop.run_in_executor(
             self._thread_pool,
             partial(self._encription_service.decrypt, ciphertext=secret_dm.secret),
         )
+        stages.lap(stage='decrypt')
 
-        secret_dm.is_deleted = True
         event_dm = EventDM(
             uuid=self._uuid_generator(),
             client_ip=client_ip,
@@ -114,9 +239,12 @@ class GetSecretInteractor:
             secret_id=secret_dm.uuid,
         )
 
-        await self._secret_delete_manager.delete(secret=secret_dm)
         await self._event_saver.save(event=event_dm)
+        stages.lap(stage='save_event')
         await self._db_session.commit()
+        stages.lap(stage='commit')
+        await self._secret_filter.discard_many(secret_ids=[secret_dm.uuid])
+        stages.lap(stage='filter_discard')
 
         return decrypted_secret.decode()
 
@@ -124,31 +252,40 @@ class GetSecretInteractor:
 class DeleteSecretInteractor:
     def __init__(
         self,
-        thread_pool: ThreadPoolExecutor,
         secret_delete_manager: SecretDeleteManager,
+        secret_filter: interfaces.SecretIdFilter,
         event_saver: interfaces.EventSaver,
         db_session: interfaces.DBSession,
-        hasher: interfaces.BcryptHasher,
+        hashing_engine: interfaces.HashingEngine,
         current_dt: interfaces.GenerateCurrentDT,
         uuid_generator: interfaces.UUIDGenerator,
+        metrics: interfaces.Metrics,
     ):
-        self._thread_pool = thread_pool
         self._secret_delete_manager = secret_delete_manager
+        self._secret_filter = secret_filter
         self._event_saver = event_saver
         self._db_session = db_session
-        self._hasher = hasher
+        self._hashing_engine = hashing_engine
         self._current_dt = current_dt
         self._uuid_generator = uuid_generator
+        self._metrics = metrics
 
     async def __call__(self, secret_id: UUID, passphrase: str | None, client_ip: str, client_user_agent: str) -> None:
+        stages = self._metrics.stages(operation='delete_secret')
+
+        if not await self._secret_filter.might_contain(secret_id=secret_id):
+            raise domain_exceptions.SecretNotFound
+        stages.lap(stage='filter')
+
         secret_dm = await self._secret_delete_manager.get_by_id(secret_id=secret_id)
+        stages.lap(stage='load')
 
         if secret_dm.passphrase:
-            loop = asyncio.get_running_loop()
-            is_correct_passphrase = await loop.run_in_executor(
-                self._thread_pool,
-                partial(self._hasher.verify, raw_data=passphrase.encode(), hashed_data=secret_dm.passphrase),
+            is_correct_passphrase = await self._hashing_engine.verify(
+                raw_data=passphrase.encode(),
+                hashed_data=secret_dm.passphrase,
             )
+            stages.lap(stage='verify')
             if not is_correct_passphrase:
                 raise app_exceptions.IncorrectPassphraseError
 
@@ -163,25 +300,113 @@ class DeleteSecretInteractor:
         )
 
         await self._secret_delete_manager.delete(secret=secret_dm)
+        stages.lap(stage='delete')
         await self._event_saver.save(event=event_dm)
+        stages.lap(stage='save_event')
         await self._db_session.commit()
+        stages.lap(stage='commit')
+        await self._secret_filter.discard_many(secret_ids=[secret_dm.uuid])
+        stages.lap(stage='filter_discard')
 
 
 class CheckSecretExpirationInteractor:
     def __init__(
         self,
-        secret_delete_manager: SecretDeleteManager,
+        secret_sweeper: interfaces.SecretSweeper,
+        secret_filter: interfaces.SecretIdFilter,
         session: interfaces.DBSession,
     ):
-        self._secret_delete_manager = secret_delete_manager
+        self._secret_sweeper = secret_sweeper
+        self._secret_filter = secret_filter
+        self._session = session
+
+    async def __call__(self, chunk_size: int = 1000, shard: int = 0, shards: int = 1) -> SweepReportDTO:
+        report = SweepReportDTO(swept=0, chunks=0, max_lag=None)
+
+        while True:
+            swept_secrets = await self._secret_sweeper.sweep_expired(limit=chunk_size, shard=shard, shards=shards)
+            await self._session.commit()
+
+            if not swept_secrets:
+                break
+
+            await self._secret_filter.discard_many(secret_ids=[secret.uuid for secret in swept_secrets])
+            chunk_lag = max(secret.expiry_lag for secret in swept_secrets)
+            report.swept += len(swept_secrets)
+            report.chunks += 1
+            report.max_lag = chunk_lag if report.max_lag is None else max(report.max_lag, chunk_lag)
+
+            if len(swept_secrets) < chunk_size:
+                break
+
+        return report
+
+
+class PurgeDeletedSecretsInteractor:
+    def __init__(
+        self,
+        secret_purger: interfaces.SecretPurger,
+        session: interfaces.DBSession,
+        metrics: interfaces.Metrics,
+    ):
+        self._secret_purger = secret_purger
         self._session = session
+        self._metrics = metrics
+
+    async def __call__(
+        self,
+        grace: timedelta,
+        batch_size: int = 500,
+        max_batches: int = 100,
+        pause: float = 0.0,
+    ) -> PurgeReportDTO:
+        report = PurgeReportDTO(purged=0, batches=0)
+
+        # one transaction per batch, with a pause in between so replication and autovacuum keep up;
+        # whatever is left over after max_batches waits for the next run
+        while report.batches < max_batches:
+            with self._metrics.measure('secret_purge_batch_seconds'):
+                purged = await self._secret_purger.purge_deleted(grace=grace, limit=batch_size)
+                await self._session.commit()
+
+            report.purged += purged
+            report.batches += 1
+            if purged < batch_size:
+                break
+            await asyncio.sleep(pause)
+
+        return report
+
+
+class RebuildSecretFilterInteractor:
+    def __init__(
+        self,
+        secret_id_lister: interfaces.SecretIdLister,
+        secret_filter: interfaces.SecretIdFilter,
+    ):
+        self._secret_id_lister = secret_id_lister
+        self._secret_filter = secret_filter
+
+    async def __call__(self, chunk_size: int = 10000) -> int:
+        if await self._secret_filter.is_ready():
+            return 0
 
-    async def __call__(self) -> None:
-        secrets = await self._secret_delete_manager.get_all_expirable()
+        # nothing is cleared first: ids saved while the rebuild runs are already in the filter,
+        # and counting some of them twice only costs false positives
+        added = 0
+        after = None
+        while True:
+            # claimed again before every chunk, so a rebuild whose claim ran out stops instead of adding twice
+            if not await self._secret_filter.claim_rebuild():
+                return added
+            secret_ids = await self._secret_id_lister.get_live_ids(limit=chunk_size, after=after)
+            if secret_ids:
+                await self._secret_filter.add_many(secret_ids=secret_ids)
+                added += len(secret_ids)
 
-        for secret in secrets:
-            if secret.is_secret_expired:
-                secret.is_deleted = True
-                await self._secret_delete_manager.delete(secret=secret)
+            if len(secret_ids) < chunk_size:
+                break
+            after = secret_ids[-1]
 
-        await self._session.commit()
+        await self._secret_filter.mark_ready()
+        return added
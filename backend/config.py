@@ -1,14 +1,17 @@
+import os
 from dataclasses import dataclass, field
+from enum import StrEnum
 from os import environ as env
 
 
 @dataclass(slots=True)
 class PgConfig:
-    db: str = field(default_factory=lambda: env.get('POSTGRES_DB').strip())
-    host: str = field(default_factory=lambda: env.get('POSTGRES_HOST').strip())
-    port: int = field(default_factory=lambda: int(env.get('POSTGRES_PORT').strip()))
-    user: str = field(default_factory=lambda: env.get('POSTGRES_USER').strip())
-    password: str = field(default_factory=lambda: env.get('POSTGRES_PASSWORD').strip())
+    # defaults only exist so that STORAGE_BACKEND=memory starts without a database configured
+    db: str = field(default_factory=lambda: env.get('POSTGRES_DB', '').strip())
+    host: str = field(default_factory=lambda: env.get('POSTGRES_HOST', 'localhost').strip())
+    port: int = field(default_factory=lambda: int(env.get('POSTGRES_PORT', '5432').strip()))
+    user: str = field(default_factory=lambda: env.get('POSTGRES_USER', '').strip())
+    password: str = field(default_factory=lambda: env.get('POSTGRES_PASSWORD', '').strip())
 
     def create_connection_string(self) -> str:
         return f'postgresql+psycopg://{self.user}:{self.password}@{self.host}:{self.port}/{self.db}'
@@ -16,9 +19,9 @@ class PgConfig:
 
 @dataclass(slots=True)
 class RedisConfig:
-    host: str = field(default_factory=lambda: env.get('REDIS_HOST').strip())
-    port: int = field(default_factory=lambda: int(env.get('REDIS_PORT').strip()))
-    db: str = field(default_factory=lambda: env.get('REDIS_DB').strip())
+    host: str = field(default_factory=lambda: env.get('REDIS_HOST', 'localhost').strip())
+    port: int = field(default_factory=lambda: int(env.get('REDIS_PORT', '6379').strip()))
+    db: str = field(default_factory=lambda: env.get('REDIS_DB', '0').strip())
 
     def create_connection_string(self) -> str:
         return f'redis://{self.host}:{self.port}/{self.db}'
@@ -29,8 +32,111 @@ class EncryptionConfig:
     secret_key: str = field(default_factory=lambda: env.get('SECRET_KEY').strip())
 
 
+@dataclass(slots=True)
+class HttpConfig:
+    cors_allow_origins: list[str] = field(
+        default_factory=lambda: [
+            origin.strip() for origin in env.get('CORS_ALLOW_ORIGINS', '*').split(',') if origin.strip()
+        ],
+    )
+    security_headers: bool = field(
+        default_factory=lambda: env.get('HTTP_SECURITY_HEADERS', 'false').strip().lower() == 'true',
+    )
+
+
+@dataclass(slots=True)
+class HashingConfig:
+    workers: int = field(default_factory=lambda: int(env.get('HASHING_WORKERS', str(os.cpu_count() or 1)).strip()))
+    queue_size: int = field(default_factory=lambda: int(env.get('HASHING_QUEUE_SIZE', '64').strip()))
+    retry_after: int = field(default_factory=lambda: int(env.get('HASHING_RETRY_AFTER', '1').strip()))
+    bcrypt_rounds: int = field(default_factory=lambda: int(env.get('BCRYPT_ROUNDS', '12').strip()))
+
+
+@dataclass(slots=True)
+class SweeperConfig:
+    chunk_size: int = field(default_factory=lambda: int(env.get('SWEEPER_CHUNK_SIZE', '1000').strip()))
+    interval: int = field(default_factory=lambda: int(env.get('SWEEPER_INTERVAL', '60').strip()))
+    jitter: float = field(default_factory=lambda: float(env.get('SWEEPER_JITTER', '5').strip()))
+    shards: int = field(default_factory=lambda: int(env.get('SWEEPER_SHARDS', '1').strip()))
+
+
+@dataclass(slots=True)
+class PurgeConfig:
+    grace: int = field(default_factory=lambda: int(env.get('SECRET_PURGE_GRACE', '86400').strip()))
+    batch_size: int = field(default_factory=lambda: int(env.get('SECRET_PURGE_BATCH_SIZE', '500').strip()))
+    max_batches: int = field(default_factory=lambda: int(env.get('SECRET_PURGE_MAX_BATCHES', '100').strip()))
+    pause_ms: int = field(default_factory=lambda: int(env.get('SECRET_PURGE_PAUSE_MS', '50').strip()))
+    interval: int = field(default_factory=lambda: int(env.get('SECRET_PURGE_INTERVAL', '300').strip()))
+
+
+@dataclass(slots=True)
+class SecretFilterConfig:
+    enabled: bool = field(default_factory=lambda: env.get('SECRET_FILTER_ENABLED', 'true').strip().lower() == 'true')
+    capacity: int = field(default_factory=lambda: int(env.get('SECRET_FILTER_CAPACITY', '1000000').strip()))
+    error_rate: float = field(default_factory=lambda: float(env.get('SECRET_FILTER_ERROR_RATE', '0.01').strip()))
+
+
+class EventDurability(StrEnum):
+    SYNC = 'sync'
+    BUFFERED = 'buffered'
+    OFF = 'off'
+
+
+@dataclass(slots=True)
+class EventsConfig:
+    durability: EventDurability = field(
+        default_factory=lambda: EventDurability(env.get('EVENT_DURABILITY', EventDurability.SYNC).strip()),
+    )
+    flush_interval_ms: int = field(default_factory=lambda: int(env.get('EVENT_FLUSH_INTERVAL_MS', '50').strip()))
+    flush_batch_size: int = field(default_factory=lambda: int(env.get('EVENT_FLUSH_BATCH_SIZE', '500').strip()))
+    max_buffer_size: int = field(default_factory=lambda: int(env.get('EVENT_MAX_BUFFER_SIZE', '100000').strip()))
+    partitions_ahead: int = field(default_factory=lambda: int(env.get('EVENT_PARTITIONS_AHEAD', '3').strip()))
+    retention_months: int = field(default_factory=lambda: int(env.get('EVENT_RETENTION_MONTHS', '0').strip()))
+    detach_expired: bool = field(
+        default_factory=lambda: env.get('EVENT_RETENTION_DETACH', 'false').strip().lower() == 'true',
+    )
+    rollup_interval: int = field(default_factory=lambda: int(env.get('EVENT_ROLLUP_INTERVAL', '60').strip()))
+    rollup_delay: int = field(default_factory=lambda: int(env.get('EVENT_ROLLUP_DELAY', '60').strip()))
+    count_cache_ttl: int = field(default_factory=lambda: int(env.get('EVENT_COUNT_CACHE_TTL', '30').strip()))
+    export_batch_size: int = field(default_factory=lambda: int(env.get('EVENT_EXPORT_BATCH_SIZE', '1000').strip()))
+
+
+class StorageBackend(StrEnum):
+    POSTGRES = 'postgres'
+    MEMORY = 'memory'
+    LOG = 'log'
+
+
+@dataclass(slots=True)
+class StorageConfig:
+    backend: StorageBackend = field(
+        default_factory=lambda: StorageBackend(env.get('STORAGE_BACKEND', StorageBackend.POSTGRES).strip()),
+    )
+    memory_event_capacity: int = field(
+        default_factory=lambda: int(env.get('MEMORY_EVENT_CAPACITY', '100000').strip()),
+    )
+    log_path: str = field(default_factory=lambda: env.get('LOG_STORE_PATH', 'data/secrets').strip())
+    log_segment_size: int = field(
+        default_factory=lambda: int(env.get('LOG_STORE_SEGMENT_SIZE', str(64 * 1024 * 1024)).strip()),
+    )
+    log_fsync: bool = field(default_factory=lambda: env.get('LOG_STORE_FSYNC', 'true').strip().lower() == 'true')
+    log_compaction_ratio: float = field(
+        default_factory=lambda: float(env.get('LOG_STORE_COMPACTION_RATIO', '0.5').strip()),
+    )
+    log_compaction_interval: int = field(
+        default_factory=lambda: int(env.get('LOG_STORE_COMPACTION_INTERVAL', '300').strip()),
+    )
+
+
 @dataclass(slots=True)
 class Config:
     pg: PgConfig = field(default_factory=PgConfig)
     redis: RedisConfig = field(default_factory=RedisConfig)
     encryption: EncryptionConfig = field(default_factory=EncryptionConfig)
+    http: HttpConfig = field(default_factory=HttpConfig)
+    hashing: HashingConfig = field(default_factory=HashingConfig)
+    sweeper: SweeperConfig = field(default_factory=SweeperConfig)
+    purge: PurgeConfig = field(default_factory=PurgeConfig)
+    secret_filter: SecretFilterConfig = field(default_factory=SecretFilterConfig)
+    events: EventsConfig = field(default_factory=EventsConfig)
+    storage: StorageConfig = field(default_factory=StorageConfig)
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
 from enum import StrEnum
 from uuid import UUID
 
@@ -18,3 +18,9 @@ class EventDM:
     type: EventType
     created_at: datetime
     secret_id: UUID
+
+
+def add_months(month: date, months: int) -> date:
+    # events are partitioned and retained by calendar month, these are the month boundaries
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
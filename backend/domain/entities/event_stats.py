@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import StrEnum
+
+from backend.domain.entities.event_dm import EventType
+
+
+class StatsBucket(StrEnum):
+    MINUTE = 'minute'
+    HOUR = 'hour'
+    DAY = 'day'
+
+    @property
+    def width(self) -> timedelta:
+        return _BUCKET_WIDTHS[self]
+
+
+_BUCKET_WIDTHS = {
+    StatsBucket.MINUTE: timedelta(minutes=1),
+    StatsBucket.HOUR: timedelta(hours=1),
+    StatsBucket.DAY: timedelta(days=1),
+}
+
+
+@dataclass(slots=True)
+class EventCountDM:
+    bucket_start: datetime
+    type: EventType
+    count: int
@@ -1,12 +1,28 @@
 from collections.abc import Collection
 from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
 from typing import Generic, TypeVar
+from uuid import UUID
 
 T = TypeVar('T')
 
 
+class CountStrategy(StrEnum):
+    EXACT = 'exact'
+    ESTIMATED = 'estimated'
+    CACHED = 'cached'
+
+
 @dataclass(slots=True)
 class Pagination(Generic[T]):
     total: int
     size: int
     items: Collection[T]
+    next_cursor: str | None = None
+
+
+@dataclass(slots=True, frozen=True)
+class KeysetCursor:
+    created_at: datetime
+    uuid: UUID
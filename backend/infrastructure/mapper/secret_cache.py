@@ -1,18 +1,88 @@
 import json
-from datetime import datetime
+import struct
+from datetime import UTC, datetime, timedelta
 from uuid import UUID
 
 from backend.domain.entities.secret_dm import SecretDM
 
+# version | flags | uuid | created_at | expired_at | secret length | passphrase length, followed by both payloads
+_HEADER = struct.Struct('>BB16sqqII')
+_VERSION = 0x01
+
+_IS_DELETED = 0x01
+_HAS_PASSPHRASE = 0x02
+_HAS_EXPIRED_AT = 0x04
+_CREATED_AT_UTC = 0x08
+_EXPIRED_AT_UTC = 0x10
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    # naive values are counted as the same wall clock time in utc and come back naive
+    return (value - _EPOCH if value.tzinfo is not None else value.replace(tzinfo=UTC) - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int, is_utc: bool) -> datetime:
+    result = _EPOCH + timedelta(microseconds=value)
+    return result if is_utc else result.replace(tzinfo=None)
+
 
 class SecretCacheDataMapper:
     @staticmethod
-    def entity_to_json(secret: SecretDM) -> dict:
+    def entity_to_bytes(secret: SecretDM) -> bytes:
+        flags = 0
+        if secret.is_deleted:
+            flags |= _IS_DELETED
+        if secret.passphrase is not None:
+            flags |= _HAS_PASSPHRASE
+        if secret.expired_at is not None:
+            flags |= _HAS_EXPIRED_AT
+            if secret.expired_at.tzinfo is not None:
+                flags |= _EXPIRED_AT_UTC
+        if secret.created_at.tzinfo is not None:
+            flags |= _CREATED_AT_UTC
+
+        passphrase = secret.passphrase or b''
+        header = _HEADER.pack(
+            _VERSION,
+            flags,
+            secret.uuid.bytes,
+            _to_epoch_us(secret.created_at),
+            _to_epoch_us(secret.expired_at) if secret.expired_at is not None else 0,
+            len(secret.secret),
+            len(passphrase),
+        )
+        return b''.join((header, secret.secret, passphrase))
+
+    def bytes_to_entity(self, data: bytes) -> SecretDM:
+        if data[0] != _VERSION:
+            # entries written before the binary layout are still JSON until their ttl runs out
+            return self.json_to_entity(data=data)
+
+        _, flags, uuid, created_at, expired_at, secret_length, passphrase_length = _HEADER.unpack_from(data)
+        secret_end = _HEADER.size + secret_length
+
+        return SecretDM(
+            uuid=UUID(bytes=uuid),
+            secret=data[_HEADER.size : secret_end],
+            passphrase=data[secret_end : secret_end + passphrase_length] if flags & _HAS_PASSPHRASE else None,
+            created_at=_from_epoch_us(created_at, is_utc=bool(flags & _CREATED_AT_UTC)),
+            expired_at=(
+                _from_epoch_us(expired_at, is_utc=bool(flags & _EXPIRED_AT_UTC)) if flags & _HAS_EXPIRED_AT else None
+            ),
+            is_deleted=bool(flags & _IS_DELETED),
+        )
+
+    @staticmethod
+    def entity_to_json(secret: SecretDM) -> str:
+        # latin-1 maps every byte to one code point, so binary ciphertexts survive and ascii ones look as before
         return json.dumps(
             {
                 'uuid': str(secret.uuid),
-                'secret': secret.secret.decode(),
-                'passphrase': secret.passphrase.decode() if secret.passphrase else None,
+                'secret': secret.secret.decode('latin-1'),
+                'passphrase': secret.passphrase.decode('latin-1') if secret.passphrase else None,
                 'created_at': secret.created_at.isoformat(),
                 'expired_at': secret.expired_at.isoformat() if secret.expired_at else None,
                 'is_deleted': secret.is_deleted,
@@ -25,8 +95,8 @@ class SecretCacheDataMapper:
 
         return SecretDM(
             uuid=UUID(json_data['uuid']),
-            secret=json_data['secret'].encode(),
-            passphrase=json_data['passphrase'].encode() if json_data['passphrase'] else None,
+            secret=json_data['secret'].encode('latin-1'),
+            passphrase=json_data['passphrase'].encode('latin-1') if json_data['passphrase'] else None,
             created_at=datetime.fromisoformat(json_data['created_at']),
             expired_at=datetime.fromisoformat(json_data['expired_at']) if json_data['expired_at'] else None,
             is_deleted=json_data['is_deleted'],
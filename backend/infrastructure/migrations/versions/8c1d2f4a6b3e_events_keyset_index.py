@@ -0,0 +1,35 @@
+"""events keyset index
+
+Revision ID: 8c1d2f4a6b3e
+Revises: 56de75749916
+Create Date: 2025-05-06 11:02:17.914203
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8c1d2f4a6b3e'
+down_revision: str | None = '56de75749916'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_created_at_uuid',
+            'events',
+            ['created_at', 'uuid'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_events_created_at_uuid', table_name='events', postgresql_concurrently=True)
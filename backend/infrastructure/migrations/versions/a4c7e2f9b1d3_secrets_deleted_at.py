@@ -0,0 +1,41 @@
+"""secrets deleted_at
+
+Revision ID: a4c7e2f9b1d3
+Revises: f1a9d3b7c5e2
+Create Date: 2025-05-27 11:05:19.640215
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2f9b1d3'
+down_revision: str | None = 'f1a9d3b7c5e2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # a nullable column without a default is a catalog change only; rows deleted before it stay NULL
+    # and are purged on the first run instead of being backfilled here
+    op.add_column('secrets', sa.Column('deleted_at', sa.TIMESTAMP(), nullable=True))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_secrets_deleted_at',
+            'secrets',
+            ['deleted_at'],
+            unique=False,
+            postgresql_where=sa.text('is_deleted'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_secrets_deleted_at', table_name='secrets', postgresql_concurrently=True)
+    op.drop_column('secrets', 'deleted_at')
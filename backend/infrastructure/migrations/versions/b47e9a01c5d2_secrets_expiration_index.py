@@ -0,0 +1,37 @@
+"""secrets expiration index
+
+Revision ID: b47e9a01c5d2
+Revises: 8c1d2f4a6b3e
+Create Date: 2025-05-08 16:40:03.512877
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b47e9a01c5d2'
+down_revision: str | None = '8c1d2f4a6b3e'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_secrets_expired_at_live',
+            'secrets',
+            ['expired_at'],
+            unique=False,
+            postgresql_where=sa.text('NOT is_deleted AND expired_at IS NOT NULL'),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_secrets_expired_at_live', table_name='secrets', postgresql_concurrently=True)
@@ -0,0 +1,107 @@
+"""partition events by month
+
+Revision ID: d3f5a7c9e1b2
+Revises: b47e9a01c5d2
+Create Date: 2025-05-14 10:21:36.204518
+
+"""
+
+from collections.abc import Sequence
+from datetime import date
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3f5a7c9e1b2'
+down_revision: str | None = 'b47e9a01c5d2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+MONTHS_AHEAD = 3
+
+
+# a frozen copy of backend.domain.entities.event_dm.add_months, migrations do not import application code
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    current_month = op.get_bind().execute(sa.text("SELECT date_trunc('month', now())::date")).scalar_one()
+    next_month = _add_months(current_month, 1)
+
+    # attaching the old table checks every row against the partition range and needs a unique index matching the
+    # new primary key; both are prepared here without blocking writes, so the attach below only looks them up
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_events_legacy_uuid_created_at',
+            'events',
+            ['uuid', 'created_at'],
+            unique=True,
+            postgresql_concurrently=True,
+        )
+        op.execute(
+            f"ALTER TABLE events ADD CONSTRAINT events_legacy_range CHECK (created_at < '{next_month}') NOT VALID",
+        )
+        op.execute('ALTER TABLE events VALIDATE CONSTRAINT events_legacy_range')
+
+    # the existing table is not copied: it becomes the partition of everything before next month
+    op.execute('ALTER TABLE events RENAME TO events_legacy')
+    op.execute('ALTER TABLE events_legacy RENAME CONSTRAINT events_pkey TO events_legacy_pkey')
+    op.execute('ALTER INDEX ix_events_created_at_uuid RENAME TO ix_events_legacy_created_at_uuid')
+    # an index is only attached to a primary key of the parent when a constraint of the partition owns it
+    op.execute(
+        'ALTER TABLE events_legacy ADD CONSTRAINT events_legacy_uuid_created_at_key '
+        'UNIQUE USING INDEX ix_events_legacy_uuid_created_at',
+    )
+
+    # a primary key of a partitioned table has to include the partition key
+    op.execute(
+        'CREATE TABLE events ('
+        'uuid UUID NOT NULL, '
+        'client_ip VARCHAR NOT NULL, '
+        'client_user_agent VARCHAR NOT NULL, '
+        'type eventtype NOT NULL, '
+        'created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, '
+        'secret_id UUID NOT NULL, '
+        'CONSTRAINT events_pkey PRIMARY KEY (uuid, created_at)'
+        ') PARTITION BY RANGE (created_at)',
+    )
+    op.create_index('ix_events_created_at_uuid', 'events', ['created_at', 'uuid'], unique=False)
+
+    op.execute(f"ALTER TABLE events ATTACH PARTITION events_legacy FOR VALUES FROM (MINVALUE) TO ('{next_month}')")
+    op.execute('ALTER TABLE events_legacy DROP CONSTRAINT events_legacy_range')
+
+    for i in range(1, MONTHS_AHEAD + 1):
+        month = _add_months(current_month, i)
+        op.execute(
+            f'CREATE TABLE events_p{month:%Y%m} PARTITION OF events '
+            f"FOR VALUES FROM ('{month}') TO ('{_add_months(month, 1)}')",
+        )
+    # catches rows only when the maintenance job has not created their month in time
+    op.execute('CREATE TABLE events_default PARTITION OF events DEFAULT')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute('ALTER TABLE events RENAME TO events_partitioned')
+    op.execute('ALTER TABLE events_partitioned RENAME CONSTRAINT events_pkey TO events_partitioned_pkey')
+    op.execute('ALTER INDEX ix_events_created_at_uuid RENAME TO ix_events_partitioned_created_at_uuid')
+    op.create_table(
+        'events',
+        sa.Column('uuid', sa.Uuid(), nullable=False),
+        sa.Column('client_ip', sa.String(), nullable=False),
+        sa.Column('client_user_agent', sa.String(), nullable=False),
+        sa.Column('type', sa.Enum('READ', 'CREATE', 'DELETE', name='eventtype', create_type=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('secret_id', sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint('uuid', name='events_pkey'),
+    )
+    op.execute(
+        'INSERT INTO events (uuid, client_ip, client_user_agent, type, created_at, secret_id) '
+        'SELECT uuid, client_ip, client_user_agent, type, created_at, secret_id FROM events_partitioned',
+    )
+    op.execute('DROP TABLE events_partitioned')
+    op.create_index('ix_events_created_at_uuid', 'events', ['created_at', 'uuid'], unique=False)
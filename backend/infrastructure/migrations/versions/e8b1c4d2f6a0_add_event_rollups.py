@@ -0,0 +1,43 @@
+"""add event rollups
+
+Revision ID: e8b1c4d2f6a0
+Revises: d3f5a7c9e1b2
+Create Date: 2025-05-20 09:12:48.731502
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b1c4d2f6a0'
+down_revision: str | None = 'd3f5a7c9e1b2'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'event_rollups',
+        sa.Column('bucket_size', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('type', sa.Enum('READ', 'CREATE', 'DELETE', name='eventtype', create_type=False), nullable=False),
+        sa.Column('count', sa.BigInteger(), nullable=False),
+        sa.PrimaryKeyConstraint('bucket_size', 'bucket_start', 'type'),
+    )
+    op.create_table(
+        'event_rollup_state',
+        sa.Column('id', sa.SmallInteger(), nullable=False),
+        sa.Column('rolled_up_to', sa.DateTime(), nullable=False),
+        sa.CheckConstraint('id = 1', name='ck_event_rollup_state_single_row'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('event_rollup_state')
+    op.drop_table('event_rollups')
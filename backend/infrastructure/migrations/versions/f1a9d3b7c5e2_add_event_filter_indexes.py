@@ -0,0 +1,68 @@
+"""add event filter indexes
+
+Revision ID: f1a9d3b7c5e2
+Revises: e8b1c4d2f6a0
+Create Date: 2025-05-23 15:40:02.118734
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a9d3b7c5e2'
+down_revision: str | None = 'e8b1c4d2f6a0'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# name and columns of each index; plain time ranges are already served by ix_events_created_at_uuid
+INDEXES = (
+    ('ix_events_secret_id', 'secret_id'),
+    ('ix_events_type_created_at_uuid', 'type, created_at, uuid'),
+    ('ix_events_client_ip_created_at', 'client_ip, created_at'),
+)
+
+
+def _partition_index(index: str, partition: str) -> str:
+    return index.replace('events', partition, 1)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    partitions = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                'SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                "WHERE i.inhparent = 'events'::regclass",
+            ),
+        )
+        .scalars()
+        .all()
+    )
+
+    # an index built on the partitioned table blocks writes to every partition until it is done, and Postgres has no
+    # CREATE INDEX CONCURRENTLY for it. Instead the parent gets an empty, invalid index, every partition builds its
+    # own concurrently, and the parent index turns valid once the last one is attached. Partitions created later
+    # get the indexes from the parent
+    for index, columns in INDEXES:
+        op.execute(f'CREATE INDEX {index} ON ONLY events ({columns})')
+
+    with op.get_context().autocommit_block():
+        for partition in partitions:
+            for index, columns in INDEXES:
+                op.execute(f'CREATE INDEX CONCURRENTLY {_partition_index(index, partition)} ON {partition} ({columns})')
+
+    for partition in partitions:
+        for index, _ in INDEXES:
+            op.execute(f'ALTER INDEX {index} ATTACH PARTITION {_partition_index(index, partition)}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_events_client_ip_created_at', table_name='events')
+    op.drop_index('ix_events_type_created_at_uuid', table_name='events')
+    op.drop_index('ix_events_secret_id', table_name='events')
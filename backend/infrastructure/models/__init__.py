@@ -1,3 +1,4 @@
 from backend.infrastructure.models.base import Base
+from backend.infrastructure.models.event_rollups import EventRollup, EventRollupState
 from backend.infrastructure.models.events import Event
 from backend.infrastructure.models.secret import Secret
@@ -0,0 +1,24 @@
+from datetime import datetime
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Mapped, mapped_column
+
+from backend.domain.entities.event_dm import EventType
+from backend.infrastructure.models.base import Base
+
+
+class EventRollup(Base):
+    __tablename__ = 'event_rollups'
+
+    bucket_size: Mapped[str] = mapped_column(primary_key=True)
+    bucket_start: Mapped[datetime] = mapped_column(primary_key=True)
+    type: Mapped[EventType] = mapped_column(primary_key=True)
+    count: Mapped[int] = mapped_column(sa.BigInteger)
+
+
+class EventRollupState(Base):
+    __tablename__ = 'event_rollup_state'
+    __table_args__ = (sa.CheckConstraint('id = 1', name='ck_event_rollup_state_single_row'),)
+
+    id: Mapped[int] = mapped_column(sa.SmallInteger, primary_key=True)
+    rolled_up_to: Mapped[datetime]
@@ -10,6 +10,13 @@ from backend.infrastructure.models.base import Base
 
 class Event(Base):
     __tablename__ = 'events'
+    __table_args__ = (
+        sa.Index('ix_events_created_at_uuid', 'created_at', 'uuid'),
+        sa.Index('ix_events_secret_id', 'secret_id'),
+        sa.Index('ix_events_type_created_at_uuid', 'type', 'created_at', 'uuid'),
+        sa.Index('ix_events_client_ip_created_at', 'client_ip', 'created_at'),
+        {'postgresql_partition_by': 'RANGE (created_at)'},
+    )
 
     uuid: Mapped[str] = mapped_column(
         'uuid',
@@ -19,5 +26,13 @@ class Event(Base):
     client_ip: Mapped[str]
     client_user_agent: Mapped[str]
     type: Mapped[EventType]
-    created_at: Mapped[datetime]
+    created_at: Mapped[datetime] = mapped_column(primary_key=True)
     secret_id: Mapped[UUID]
+
+
+# monthly partitions are created by the maintenance job; with metadata.create_all everything lands in the default one
+sa.event.listen(
+    Event.__table__,
+    'after_create',
+    sa.DDL('CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT'),
+)
@@ -10,6 +10,15 @@ from backend.infrastructure.models.base import Base
 
 class Secret(Base):
     __tablename__ = 'secrets'
+    __table_args__ = (
+        sa.Index(
+            'ix_secrets_expired_at_live',
+            'expired_at',
+            postgresql_where=sa.text('NOT is_deleted AND expired_at IS NOT NULL'),
+        ),
+        sa.Index('ix_secrets_deleted_at', 'deleted_at', postgresql_where=sa.text('is_deleted')),
+    )
+
     uuid: Mapped[str] = mapped_column(
         'uuid',
         sa.Uuid,
@@ -20,3 +29,4 @@ class Secret(Base):
     created_at: Mapped[datetime]
     expired_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=True)
     is_deleted: Mapped[bool]
+    deleted_at: Mapped[datetime] = mapped_column(TIMESTAMP, nullable=True)
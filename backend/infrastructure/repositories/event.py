@@ -1,14 +1,56 @@
-from collections.abc import Collection
+import json
+from collections.abc import AsyncIterator, Collection, Sequence
+from datetime import UTC, datetime
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.sql import text
 
 from backend.application import interfaces
+from backend.application.dto.event import EventFilterDTO
 from backend.domain.entities.event_dm import EventDM
+from backend.domain.entities.pagination import KeysetCursor
+
+
+def from_column_time(value: datetime) -> datetime:
+    # event timestamps are stored as naive utc
+    return value.replace(tzinfo=UTC) if value.tzinfo is None else value.astimezone(UTC)
+
+
+def to_column_time(value: datetime) -> datetime:
+    return from_column_time(value).replace(tzinfo=None)
+
+
+def filter_conditions(filters: EventFilterDTO) -> tuple[list[str], dict[str, Any]]:
+    conditions = []
+    params: dict[str, Any] = {}
+    if filters.start is not None:
+        conditions.append('created_at >= :start')
+        params['start'] = to_column_time(filters.start)
+    if filters.end is not None:
+        conditions.append('created_at < :end')
+        params['end'] = to_column_time(filters.end)
+    if filters.types:
+        conditions.append('type = ANY(CAST(:types AS eventtype[]))')
+        params['types'] = [event_type.value for event_type in filters.types]
+    if filters.secret_id is not None:
+        conditions.append('secret_id = :secret_id')
+        params['secret_id'] = filters.secret_id
+    if filters.client_ip is not None:
+        conditions.append('client_ip = :client_ip')
+        params['client_ip'] = filters.client_ip
+    return conditions, params
+
+
+def where_clause(conditions: Sequence[str]) -> str:
+    # the conditions are fixed fragments from filter_conditions, every value stays a bound parameter
+    return f'WHERE {" AND ".join(conditions)} ' if conditions else ''
 
 
 class EventRepository(
     interfaces.EventReader,
+    interfaces.EventPageReader,
+    interfaces.EventCountEstimator,
     interfaces.EventSaver,
 ):
     def __init__(self, session: AsyncSession) -> None:
@@ -31,7 +73,79 @@ class EventRepository(
             for row in rows
         ]
 
+    async def get_page(
+        self,
+        limit: int,
+        after: KeysetCursor | None = None,
+        offset: int = 0,
+        filters: EventFilterDTO | None = None,
+    ) -> Sequence[EventDM]:
+        conditions, params = filter_conditions(filters or EventFilterDTO())
+        if after:
+            # (created_at, uuid) row comparison lets postgres walk ix_events_created_at_uuid backwards
+            conditions.append('(created_at, uuid) < (:created_at, :uuid)')
+            params.update(created_at=after.created_at, uuid=after.uuid)
+        query = text(
+            'SELECT uuid, client_ip, client_user_agent, type, created_at, secret_id FROM events '  # noqa: S608
+            f'{where_clause(conditions)}'
+            'ORDER BY created_at DESC, uuid DESC '
+            'LIMIT :limit OFFSET :offset',
+        )
+        params.update(limit=limit, offset=offset)
+
+        result = await self._session.execute(statement=query, params=params)
+        rows = result.fetchall()
+
+        return [
+            EventDM(
+                uuid=row.uuid,
+                client_ip=row.client_ip,
+                client_user_agent=row.client_user_agent,
+                type=row.type,
+                created_at=row.created_at,
+                secret_id=row.secret_id,
+            )
+            for row in rows
+        ]
+
+    async def count(self, filters: EventFilterDTO | None = None) -> int:
+        conditions, params = filter_conditions(filters or EventFilterDTO())
+        result = await self._session.execute(
+            statement=text(f'SELECT count(*) FROM events {where_clause(conditions)}'),  # noqa: S608
+            params=params,
+        )
+        return result.scalar_one()
+
+    async def estimate_count(self, filters: EventFilterDTO | None = None) -> int:
+        conditions, params = filter_conditions(filters or EventFilterDTO())
+        if not conditions:
+            # the row counts autovacuum keeps in the catalog; a partitioned parent has none of its own
+            result = await self._session.execute(
+                text(
+                    'SELECT coalesce(sum(greatest(c.reltuples, 0)), 0)::bigint '
+                    'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                    "WHERE i.inhparent = 'events'::regclass",
+                ),
+            )
+            return result.scalar_one()
+
+        # the planner's row estimate costs a plan, not a scan
+        result = await self._session.execute(
+            statement=text(f'EXPLAIN (FORMAT JSON) SELECT 1 FROM events {where_clause(conditions)}'),  # noqa: S608
+            params=params,
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
     async def save(self, event: EventDM) -> None:
+        await self.save_many(events=[event])
+
+    async def save_many(self, events: Sequence[EventDM]) -> None:
+        if not events:
+            return
+
         stmt = text(
             'INSERT INTO events(uuid, client_ip, client_user_agent, type, created_at, secret_id) '
             'VALUES '
@@ -40,12 +154,46 @@ class EventRepository(
 
         await self._session.execute(
             statement=stmt,
-            params={
-                'uuid': event.uuid,
-                'client_ip': event.client_ip,
-                'client_user_agent': event.client_user_agent,
-                'type': event.type,
-                'created_at': event.created_at,
-                'secret_id': event.secret_id,
-            },
+            params=[
+                {
+                    'uuid': event.uuid,
+                    'client_ip': event.client_ip,
+                    'client_user_agent': event.client_user_agent,
+                    'type': event.type,
+                    'created_at': event.created_at,
+                    'secret_id': event.secret_id,
+                }
+                for event in events
+            ],
         )
+
+
+class EventExportRepository(interfaces.EventExporter):
+    # the response body is streamed after the request scope is closed, so every export opens a session of its own
+    def __init__(self, session_maker: async_sessionmaker[AsyncSession], batch_size: int) -> None:
+        self._session_maker = session_maker
+        self._batch_size = batch_size
+
+    async def export(self, filters: EventFilterDTO) -> AsyncIterator[Sequence[EventDM]]:
+        conditions, params = filter_conditions(filters)
+        query = text(
+            'SELECT uuid, client_ip, client_user_agent, type, created_at, secret_id FROM events '  # noqa: S608
+            f'{where_clause(conditions)}'
+            'ORDER BY created_at, uuid',
+        ).execution_options(yield_per=self._batch_size)
+
+        async with self._session_maker() as session:
+            # a server-side cursor: only one batch of rows is held in memory at a time
+            result = await session.stream(statement=query, params=params)
+            async for rows in result.partitions():
+                yield [
+                    EventDM(
+                        uuid=row.uuid,
+                        client_ip=row.client_ip,
+                        client_user_agent=row.client_user_agent,
+                        type=row.type,
+                        created_at=row.created_at,
+                        secret_id=row.secret_id,
+                    )
+                    for row in rows
+                ]
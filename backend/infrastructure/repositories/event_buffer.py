@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Sequence
+from contextlib import suppress
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from backend.application import interfaces
+from backend.domain.entities.event_dm import EventDM
+from backend.infrastructure.repositories.event import EventRepository
+
+logger = logging.getLogger(__name__)
+
+
+class BufferedEventSaver(interfaces.EventSaver):
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        flush_interval: float,
+        flush_batch_size: int,
+        max_buffer_size: int,
+    ) -> None:
+        self._session_maker = session_maker
+        self._flush_interval = flush_interval
+        self._flush_batch_size = flush_batch_size
+        self._max_buffer_size = max_buffer_size
+
+        self._events: deque[EventDM] = deque()
+        self._not_empty = asyncio.Event()
+        self._batch_ready = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+
+    async def save(self, event: EventDM) -> None:
+        await self.save_many(events=[event])
+
+    async def save_many(self, events: Sequence[EventDM]) -> None:
+        if len(self._events) + len(events) > self._max_buffer_size:
+            await self.flush()
+        if len(self._events) + len(events) > self._max_buffer_size:
+            logger.error('Event buffer is full, dropping %d events', len(events))
+            return
+
+        self._events.extend(events)
+        self._not_empty.set()
+        if len(self._events) >= self._flush_batch_size:
+            self._batch_ready.set()
+
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run())
+
+    async def flush(self) -> bool:
+        async with self._flush_lock:
+            while self._events:
+                batch = [self._events.popleft() for _ in range(min(self._flush_batch_size, len(self._events)))]
+                if len(self._events) < self._flush_batch_size:
+                    self._batch_ready.clear()
+                if not self._events:
+                    self._not_empty.clear()
+
+                try:
+                    async with self._session_maker() as session:
+                        await EventRepository(session=session).save_many(events=batch)
+                        await session.commit()
+                except Exception:
+                    logger.exception('Failed to flush %d events, will retry', len(batch))
+                    self._events.extendleft(reversed(batch))
+                    self._not_empty.set()
+                    return False
+
+        return True
+
+    async def close(self) -> None:
+        # holding the lock guarantees the background task is not cancelled in the middle of a write
+        async with self._flush_lock:
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._flush_task
+                self._flush_task = None
+
+        await self.flush()
+
+    async def _run(self) -> None:
+        while True:
+            await self._not_empty.wait()
+            # a full batch is written right away, a partial one after at most flush_interval
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self._batch_ready.wait(), timeout=self._flush_interval)
+
+            if not await self.flush():
+                await asyncio.sleep(self._flush_interval)
+
+
+class NullEventSaver(interfaces.EventSaver):
+    async def save(self, event: EventDM) -> None:
+        pass
+
+    async def save_many(self, events: Sequence[EventDM]) -> None:
+        pass
@@ -0,0 +1,123 @@
+import logging
+import re
+from collections.abc import Sequence
+from datetime import date, datetime
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from backend.application import interfaces
+from backend.domain.entities.event_dm import add_months
+
+logger = logging.getLogger(__name__)
+
+# "FOR VALUES FROM (MINVALUE) TO ('2025-06-01 00:00:00')" as printed by pg_get_expr; the default partition is "DEFAULT"
+_RANGE_BOUND = re.compile(r"FROM \((MINVALUE|'[^']+')\) TO \((MAXVALUE|'[^']+')\)")
+
+
+def partition_name(month: date) -> str:
+    return f'events_p{month:%Y%m}'
+
+
+def _parse_bound(value: str) -> date | None:
+    # None stands for MINVALUE and MAXVALUE, which leave that end of the range open
+    return datetime.fromisoformat(value.strip("'")).date() if value.startswith("'") else None
+
+
+class _Partition(NamedTuple):
+    name: str
+    is_default: bool
+    lower: date | None
+    upper: date | None
+
+    def overlaps(self, start: date, end: date) -> bool:
+        return (
+            not self.is_default
+            and (self.lower is None or self.lower < end)
+            and (self.upper is None or self.upper > start)
+        )
+
+
+class EventPartitionRepository(interfaces.EventPartitionManager):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def try_lock(self) -> bool:
+        result = await self._session.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('event-partitions'))"))
+        return result.scalar_one()
+
+    async def create_partitions(self, months: Sequence[date]) -> Sequence[str]:
+        partitions = await self._get_partitions()
+        default = next((partition.name for partition in partitions if partition.is_default), None)
+        created = []
+        for month in months:
+            start, end = month, add_months(month, 1)
+            # compared by bounds, not names: right after the migration the legacy partition covers the current month
+            if any(partition.overlaps(start, end) for partition in partitions):
+                continue
+            if default is not None and await self._has_rows(default, start, end):
+                # Postgres refuses a partition whose rows already sit in the default one; they stay there
+                logger.warning('Not creating %s, the default partition already holds its rows', partition_name(month))
+                continue
+            # names and bounds come from dates, never from input, so formatting them into DDL is safe
+            await self._session.execute(
+                text(
+                    f'CREATE TABLE {partition_name(month)} PARTITION OF events '
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')",
+                ),
+            )
+            partitions.append(_Partition(name=partition_name(month), is_default=False, lower=start, upper=end))
+            created.append(partition_name(month))
+        return created
+
+    async def remove_partitions(self, before: date, detach: bool = False) -> Sequence[str]:
+        removed = []
+        for partition in await self._get_partitions():
+            if partition.is_default or partition.upper is None or partition.upper > before:
+                continue
+            # dropping a whole partition is a catalog change, no matter how many rows it holds
+            name = partition.name
+            statement = f'ALTER TABLE events DETACH PARTITION "{name}"' if detach else f'DROP TABLE "{name}"'
+            await self._session.execute(text(statement))
+            removed.append(name)
+        return removed
+
+    async def _get_partitions(self) -> list[_Partition]:
+        result = await self._session.execute(
+            text(
+                'SELECT c.relname AS name, pg_get_expr(c.relpartbound, c.oid) AS bound '
+                'FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid '
+                "WHERE i.inhparent = 'events'::regclass",
+            ),
+        )
+        partitions = []
+        for row in result.fetchall():
+            match = _RANGE_BOUND.search(row.bound)
+            if match is None:
+                partitions.append(_Partition(name=row.name, is_default=True, lower=None, upper=None))
+            else:
+                lower, upper = (_parse_bound(value) for value in match.groups())
+                partitions.append(_Partition(name=row.name, is_default=False, lower=lower, upper=upper))
+        return partitions
+
+    async def _has_rows(self, partition: str, start: date, end: date) -> bool:
+        # the partition name comes from the catalog
+        result = await self._session.execute(
+            text(
+                f'SELECT EXISTS (SELECT 1 FROM "{partition}" WHERE created_at >= :start AND created_at < :end)',  # noqa: S608
+            ),
+            params={'start': start, 'end': end},
+        )
+        return result.scalar_one()
+
+
+class NullEventPartitionManager(interfaces.EventPartitionManager):
+    async def try_lock(self) -> bool:
+        return False
+
+    async def create_partitions(self, months: Sequence[date]) -> Sequence[str]:  # noqa: ARG002
+        return []
+
+    async def remove_partitions(self, before: date, detach: bool = False) -> Sequence[str]:  # noqa: ARG002
+        return []
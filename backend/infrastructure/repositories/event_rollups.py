@@ -0,0 +1,89 @@
+from collections.abc import Sequence
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import text
+
+from backend.application import interfaces
+from backend.domain.entities.event_dm import EventType
+from backend.domain.entities.event_stats import EventCountDM, StatsBucket
+from backend.infrastructure.repositories.event import from_column_time, to_column_time
+
+
+class EventRollupRepository(interfaces.EventStatsReader, interfaces.EventRollupUpdater):
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_counts(self, bucket: StatsBucket, start: datetime, end: datetime) -> Sequence[EventCountDM]:
+        query = text(
+            'SELECT bucket_start, type, count FROM event_rollups '
+            'WHERE bucket_size = :bucket_size AND bucket_start >= :start AND bucket_start < :end '
+            'ORDER BY bucket_start, type',
+        )
+        result = await self._session.execute(
+            statement=query,
+            params={'bucket_size': bucket, 'start': to_column_time(start), 'end': to_column_time(end)},
+        )
+        return [
+            EventCountDM(bucket_start=from_column_time(row.bucket_start), type=EventType(row.type), count=row.count)
+            for row in result.fetchall()
+        ]
+
+    async def get_rolled_up_to(self) -> datetime | None:
+        return await self.get_watermark()
+
+    async def try_lock(self) -> bool:
+        result = await self._session.execute(text("SELECT pg_try_advisory_xact_lock(hashtext('event-rollups'))"))
+        return result.scalar_one()
+
+    async def get_watermark(self) -> datetime | None:
+        result = await self._session.execute(text('SELECT rolled_up_to FROM event_rollup_state WHERE id = 1'))
+        watermark = result.scalar_one_or_none()
+        return from_column_time(watermark) if watermark is not None else None
+
+    async def get_first_event_time(self) -> datetime | None:
+        result = await self._session.execute(text('SELECT min(created_at) FROM events'))
+        first = result.scalar_one()
+        return from_column_time(first) if first is not None else None
+
+    async def roll_up(self, start: datetime, end: datetime) -> int:
+        # one pass over the window feeds all three bucket sizes; counts are added, so windows must not overlap
+        query = text(
+            'INSERT INTO event_rollups (bucket_size, bucket_start, type, count) '
+            'SELECT size.bucket_size, date_trunc(size.bucket_size, e.created_at), e.type, count(*) '
+            "FROM events e CROSS JOIN (VALUES ('minute'), ('hour'), ('day')) AS size(bucket_size) "
+            'WHERE e.created_at >= :start AND e.created_at < :end '
+            'GROUP BY 1, 2, 3 '
+            'ON CONFLICT (bucket_size, bucket_start, type) DO UPDATE SET count = event_rollups.count + EXCLUDED.count',
+        )
+        result = await self._session.execute(
+            statement=query,
+            params={'start': to_column_time(start), 'end': to_column_time(end)},
+        )
+        return result.rowcount
+
+    async def set_watermark(self, watermark: datetime) -> None:
+        await self._session.execute(
+            statement=text(
+                'INSERT INTO event_rollup_state (id, rolled_up_to) VALUES (1, :watermark) '
+                'ON CONFLICT (id) DO UPDATE SET rolled_up_to = EXCLUDED.rolled_up_to',
+            ),
+            params={'watermark': to_column_time(watermark)},
+        )
+
+
+class NullEventRollupUpdater(interfaces.EventRollupUpdater):
+    async def try_lock(self) -> bool:
+        return False
+
+    async def get_watermark(self) -> datetime | None:
+        return None
+
+    async def get_first_event_time(self) -> datetime | None:
+        return None
+
+    async def roll_up(self, start: datetime, end: datetime) -> int:  # noqa: ARG002
+        return 0
+
+    async def set_watermark(self, watermark: datetime) -> None:
+        pass
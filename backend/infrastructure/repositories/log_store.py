@@ -0,0 +1,614 @@
+import asyncio
+import bisect
+import heapq
+import logging
+import mmap
+import os
+import struct
+import time
+import zlib
+from collections.abc import Collection, Iterator, Sequence
+from datetime import timedelta
+from pathlib import Path
+from typing import BinaryIO, NamedTuple
+from uuid import UUID
+
+from backend.application import interfaces
+from backend.application.dto.secret import SweptSecretDTO
+from backend.domain import exceptions as domain_exceptions
+from backend.domain.entities.secret_dm import SecretDM
+from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
+
+logger = logging.getLogger(__name__)
+
+# crc32 of kind and payload | payload length | kind, followed by the payload
+_RECORD = struct.Struct('>IIB')
+_PUT = 0x01
+_TOMBSTONE = 0x02
+# put payload: uuid | expiry in epoch microseconds (0 when it never expires), then the binary cache layout
+_PUT_HEADER = struct.Struct('>16sq')
+# tombstone payload: uuid | segment of the put record it cancels
+_TOMBSTONE_PAYLOAD = struct.Struct('>16sI')
+
+_INDEX_MAGIC = b'SMLIDX01'
+# magic | capacity | live slots | used slots, live and deleted | checkpoint segment | checkpoint offset
+_INDEX_HEADER = struct.Struct('>8sIIIIQ')
+_INDEX_HEADER_SIZE = 64
+# uuid | segment | offset | record length | expiry in epoch microseconds
+_SLOT = struct.Struct('>16sIQIq')
+_SLOT_KEY = struct.Struct('>16sI')
+_EMPTY = 0
+_DELETED = 0xFFFFFFFF
+_MAX_LOAD = 0.7
+# slots moved from the old table to the new one by every write while the index grows
+_RESIZE_STEP = 64
+
+_EXPIRY_BUCKETS = 256
+_COMPACTION_BATCH = 1000
+
+
+class IndexEntry(NamedTuple):
+    segment: int
+    offset: int
+    length: int
+    expires_at: int
+
+
+def _crc(kind: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(bytes((kind,))))
+
+
+def _iter_records(data: bytes, offset: int = 0) -> Iterator[tuple[int, int, bytes]]:
+    # stops at the first record that is cut short or fails its checksum, which is where a crash tore the log
+    while offset + _RECORD.size <= len(data):
+        crc, length, kind = _RECORD.unpack_from(data, offset)
+        end = offset + _RECORD.size + length
+        payload = data[offset + _RECORD.size : end]
+        if end > len(data) or kind not in (_PUT, _TOMBSTONE) or _crc(kind, payload) != crc:
+            return
+        yield offset, kind, payload
+        offset = end
+
+
+def _to_epoch_us(secret: SecretDM) -> int:
+    return int(secret.expired_at.timestamp() * 1_000_000) if secret.expired_at is not None else 0
+
+
+class _Table:
+    # one open addressed hash table with linear probing, kept in a memory mapped file
+    def __init__(self, path: Path, file: BinaryIO, mapping: mmap.mmap) -> None:
+        self.path = path
+        self._file = file
+        self._map = mapping
+        _, self.capacity, self.live, self.used, *checkpoint = _INDEX_HEADER.unpack_from(mapping)
+        self.checkpoint: tuple[int, int] = tuple(checkpoint)
+
+    @classmethod
+    def load(cls, path: Path) -> '_Table | None':
+        if not path.exists() or path.stat().st_size < _INDEX_HEADER_SIZE:
+            return None
+
+        file = open(path, 'r+b')  # noqa: SIM115
+        mapping = mmap.mmap(file.fileno(), 0)
+        magic, capacity, *_ = _INDEX_HEADER.unpack_from(mapping)
+        if magic != _INDEX_MAGIC or len(mapping) != _INDEX_HEADER_SIZE + capacity * _SLOT.size:
+            mapping.close()
+            file.close()
+            return None
+        table = cls(path=path, file=file, mapping=mapping)
+        # the header counters are only written on checkpoints while the slots are written in place, so after a crash
+        # the slots are newer than the counters; trusting them would keep the table from ever growing
+        table.live, table.used = table._count_slots()
+        return table
+
+    @classmethod
+    def create(cls, path: Path, capacity: int) -> '_Table':
+        if capacity <= 0 or capacity & (capacity - 1):
+            raise ValueError(f'Index capacity must be a power of two, got {capacity}')
+
+        file = open(path, 'w+b')  # noqa: SIM115
+        file.truncate(_INDEX_HEADER_SIZE + capacity * _SLOT.size)
+        file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, capacity, 0, 0, 0, 0))
+        file.flush()
+        return cls(path=path, file=file, mapping=mmap.mmap(file.fileno(), 0))
+
+    def get(self, key: bytes) -> IndexEntry | None:
+        slot, _ = self._find(key)
+        return self._live_entry(slot, key)
+
+    def put(self, key: bytes, entry: IndexEntry) -> IndexEntry | None:
+        slot, free_slot = self._find(key)
+        previous = self._live_entry(slot, key)
+        if previous is None:
+            if free_slot is None:
+                self.used += 1
+            else:
+                slot = free_slot
+            self.live += 1
+        _SLOT.pack_into(self._map, _INDEX_HEADER_SIZE + slot * _SLOT.size, key, *entry)
+        return previous
+
+    def remove(self, key: bytes) -> IndexEntry | None:
+        slot, _ = self._find(key)
+        previous = self._live_entry(slot, key)
+        if previous is not None:
+            self._delete(slot, key)
+        return previous
+
+    def pop_slot(self, slot: int) -> tuple[bytes, IndexEntry] | None:
+        uuid, segment, offset, length, expires_at = _SLOT.unpack_from(self._map, _INDEX_HEADER_SIZE + slot * _SLOT.size)
+        if segment in (_EMPTY, _DELETED):
+            return None
+        self._delete(slot, uuid)
+        return uuid, IndexEntry(segment, offset, length, expires_at)
+
+    def items(self) -> list[tuple[bytes, IndexEntry]]:
+        with memoryview(self._map) as view:
+            return [
+                (uuid, IndexEntry(segment, offset, length, expires_at))
+                for uuid, segment, offset, length, expires_at in _SLOT.iter_unpack(view[_INDEX_HEADER_SIZE:])
+                if segment not in (_EMPTY, _DELETED)
+            ]
+
+    def flush(self) -> None:
+        _INDEX_HEADER.pack_into(self._map, 0, _INDEX_MAGIC, self.capacity, self.live, self.used, *self.checkpoint)
+        self._map.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._map.close()
+        self._file.close()
+
+    def _home(self, key: bytes) -> int:
+        # the first half of a uuid4 carries the fixed version nibble, which would leave one slot in sixteen as a
+        # home slot; the second half is random apart from the two variant bits at its top
+        return int.from_bytes(key[8:], 'big') & (self.capacity - 1)
+
+    def _count_slots(self) -> tuple[int, int]:
+        live = used = 0
+        with memoryview(self._map) as view:
+            for _, segment, *_ in _SLOT.iter_unpack(view[_INDEX_HEADER_SIZE:]):
+                if segment != _EMPTY:
+                    used += 1
+                    live += segment != _DELETED
+        return live, used
+
+    def _find(self, key: bytes) -> tuple[int, int | None]:
+        # the slot holding the key, or the empty slot that ends its probe, and the first deleted slot on the way
+        mask = self.capacity - 1
+        slot = self._home(key)
+        free_slot = None
+        for _ in range(self.capacity):
+            uuid, segment = _SLOT_KEY.unpack_from(self._map, _INDEX_HEADER_SIZE + slot * _SLOT.size)
+            if segment == _EMPTY or (segment != _DELETED and uuid == key):
+                return slot, free_slot
+            if segment == _DELETED and free_slot is None:
+                free_slot = slot
+            slot = (slot + 1) & mask
+        # a full lap without an empty slot: the key is absent, and it can only go into a deleted slot
+        if free_slot is None:
+            raise RuntimeError(f'Index table {self.path} is full')
+        return free_slot, free_slot
+
+    def _live_entry(self, slot: int, key: bytes) -> IndexEntry | None:
+        uuid, segment, offset, length, expires_at = _SLOT.unpack_from(self._map, _INDEX_HEADER_SIZE + slot * _SLOT.size)
+        if segment in (_EMPTY, _DELETED) or uuid != key:
+            return None
+        return IndexEntry(segment, offset, length, expires_at)
+
+    def _delete(self, slot: int, key: bytes) -> None:
+        _SLOT.pack_into(self._map, _INDEX_HEADER_SIZE + slot * _SLOT.size, key, _DELETED, 0, 0, 0)
+        self.live -= 1
+
+
+class MmapIndex:
+    # the file is only a cache of the log: it is flushed on checkpoints and rebuilt by replaying the segments when it
+    # cannot be trusted. Growing it never stops the caller for a full rehash: a larger table is created next to the
+    # current one and every later operation moves a few slots across until the old table is empty
+    def __init__(self, path: Path, table: _Table) -> None:
+        self._path = path
+        self._table = table
+        self._old: _Table | None = None
+        self._cursor = 0
+        self.checkpoint = table.checkpoint
+
+    @classmethod
+    def load(cls, path: Path) -> 'MmapIndex | None':
+        resize_path = path.with_suffix('.resize')
+        if resize_path.exists():
+            # entries were split between two tables when the process stopped, replaying the log is simpler
+            resize_path.unlink()
+            return None
+        table = _Table.load(path)
+        return cls(path=path, table=table) if table is not None else None
+
+    @classmethod
+    def create(cls, path: Path, capacity: int) -> 'MmapIndex':
+        path.with_suffix('.resize').unlink(missing_ok=True)
+        return cls(path=path, table=_Table.create(path, capacity))
+
+    @property
+    def capacity(self) -> int:
+        return self._table.capacity
+
+    @property
+    def live(self) -> int:
+        return self._table.live + (self._old.live if self._old is not None else 0)
+
+    def get(self, key: bytes) -> IndexEntry | None:
+        entry = self._table.get(key)
+        if entry is None and self._old is not None:
+            entry = self._old.get(key)
+        return entry
+
+    def put(self, key: bytes, entry: IndexEntry) -> IndexEntry | None:
+        # a key lives in exactly one of the tables, so it leaves the old one as it is written to the new one
+        previous = self._old.remove(key) if self._old is not None else None
+        previous = self._table.put(key, entry) or previous
+        if self._old is not None:
+            self._migrate(_RESIZE_STEP)
+        elif self._table.used > self._table.capacity * _MAX_LOAD:
+            # deleted slots are not carried over, so a mostly deleted table is cleaned without growing
+            grow = self._table.live > self._table.capacity * _MAX_LOAD / 2
+            self._start_resize(self._table.capacity * 2 if grow else self._table.capacity)
+        return previous
+
+    def remove(self, key: bytes) -> IndexEntry | None:
+        entry = self._table.remove(key)
+        if self._old is not None:
+            if entry is None:
+                entry = self._old.remove(key)
+            self._migrate(_RESIZE_STEP)
+        return entry
+
+    def items(self) -> list[tuple[bytes, IndexEntry]]:
+        items = self._table.items()
+        if self._old is not None:
+            items.extend(self._old.items())
+        return items
+
+    def flush(self) -> None:
+        for table in (self._table, self._old):
+            if table is not None:
+                table.checkpoint = self.checkpoint
+                table.flush()
+
+    def close(self) -> None:
+        if self._old is not None:
+            self._migrate(self._old.capacity)
+        self._table.checkpoint = self.checkpoint
+        self._table.close()
+
+    def _start_resize(self, capacity: int) -> None:
+        # the new table takes every write from now on; it starts at most 70% full and gets 1/_RESIZE_STEP of the
+        # old capacity in new keys before the move is done, so it never has to grow in the middle of one
+        self._old = self._table
+        self._table = _Table.create(self._path.with_suffix('.resize'), capacity)
+        self._cursor = 0
+
+    def _migrate(self, slots: int) -> None:
+        old = self._old
+        end = min(self._cursor + slots, old.capacity)
+        for slot in range(self._cursor, end):
+            moved = old.pop_slot(slot)
+            if moved is not None:
+                self._table.put(*moved)
+        self._cursor = end
+        if end < old.capacity:
+            return
+
+        old.close()
+        os.replace(self._table.path, self._path)
+        self._table.path = self._path
+        self._old = None
+
+
+class LogStructuredStore:
+    # secrets are appended to numbered segment files and never rewritten in place; burns and expiry append
+    # tombstones. Every index update happens together with its append, without an await in between, so a reader
+    # never sees one without the other and two concurrent burns of one secret cannot both find it
+    def __init__(
+        self,
+        path: Path,
+        data_mapper: SecretCacheDataMapper,
+        segment_size: int = 64 * 1024 * 1024,
+        fsync: bool = True,
+        compaction_ratio: float = 0.5,
+        index_capacity: int = 1 << 16,
+    ) -> None:
+        self._path = path
+        self._data_mapper = data_mapper
+        self._segment_size = segment_size
+        self._fsync = fsync
+        self._compaction_ratio = compaction_ratio
+        self._index_capacity = index_capacity
+
+        self._index: MmapIndex | None = None
+        self._fds: dict[int, int] = {}
+        self._sizes: dict[int, int] = {}
+        self._live_bytes: dict[int, int] = {}
+        self._active = 0
+        self._expiry: list[list[tuple[int, UUID]]] = [[] for _ in range(_EXPIRY_BUCKETS)]
+        self._written = 0
+        self._synced = 0
+        self._sync_lock = asyncio.Lock()
+        self._live_ids: list[bytes] | None = None
+
+    def open(self) -> None:
+        self._path.mkdir(parents=True, exist_ok=True)
+        for segment_path in self._path.glob('segment-*.log'):
+            segment = int(segment_path.stem.removeprefix('segment-'))
+            self._sizes[segment] = segment_path.stat().st_size
+
+        index = MmapIndex.load(self._path / 'index.bin')
+        if index is not None and self._is_behind_log(index.checkpoint):
+            start_segment, start_offset = index.checkpoint
+        else:
+            # no index, or one that points past the end of the log because the log lost its tail in a crash
+            if index is not None:
+                index.close()
+            index = MmapIndex.create(self._path / 'index.bin', self._index_capacity)
+            start_segment, start_offset = 0, 0
+        self._index = index
+
+        for segment in sorted(self._sizes):
+            if segment >= start_segment:
+                self._replay(segment, start_offset if segment == start_segment else 0)
+
+        if not self._sizes:
+            self._sizes[1] = 0
+        for segment in sorted(self._sizes):
+            self._fds[segment] = os.open(self._segment_path(segment), os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+            self._live_bytes[segment] = 0
+        self._active = max(self._sizes)
+
+        for key, entry in self._index.items():
+            self._live_bytes[entry.segment] = self._live_bytes.get(entry.segment, 0) + entry.length
+            if entry.expires_at:
+                heapq.heappush(self._expiry[key[15]], (entry.expires_at, UUID(bytes=key)))
+        self.checkpoint()
+        logger.info(
+            'Opened secret log %s: %d live secrets in %d segments',
+            self._path,
+            self._index.live,
+            len(self._sizes),
+        )
+
+    def close(self) -> None:
+        if self._fsync:
+            os.fsync(self._fds[self._active])
+        self.checkpoint()
+        self._index.close()
+        for fd in self._fds.values():
+            os.close(fd)
+        self._fds.clear()
+
+    def checkpoint(self) -> None:
+        # everything before this position is reflected in the index, so recovery replays only what comes after it
+        self._index.checkpoint = (self._active, self._sizes[self._active])
+        self._index.flush()
+
+    async def sync(self) -> None:
+        # group commit: the caller that gets the lock fsyncs everything written so far, the ones queued behind it
+        # usually find their records already durable
+        if not self._fsync:
+            return
+        target = self._written
+        async with self._sync_lock:
+            if self._synced >= target:
+                return
+            written = self._written
+            await asyncio.to_thread(os.fsync, self._fds[self._active])
+            self._synced = written
+
+    def get(self, secret_id: UUID) -> SecretDM | None:
+        entry = self._index.get(secret_id.bytes)
+        if entry is None:
+            return None
+        return self._read(secret_id, entry)
+
+    def put(self, secret: SecretDM) -> None:
+        expires_at = _to_epoch_us(secret)
+        payload = _PUT_HEADER.pack(secret.uuid.bytes, expires_at) + self._data_mapper.entity_to_bytes(secret=secret)
+        segment, offset, length = self._append(_PUT, payload)
+
+        previous = self._index.put(secret.uuid.bytes, IndexEntry(segment, offset, length, expires_at))
+        if previous is not None:
+            self._live_bytes[previous.segment] -= previous.length
+        self._live_bytes[segment] += length
+        if expires_at:
+            heapq.heappush(self._expiry[secret.uuid.bytes[15]], (expires_at, secret.uuid))
+
+    def remove(self, secret_id: UUID) -> SecretDM | None:
+        entry = self._index.get(secret_id.bytes)
+        if entry is None:
+            return None
+        secret = self._read(secret_id, entry)
+        self._tombstone(secret_id, entry)
+        return secret
+
+    def sweep_expired(self, limit: int, shard: int = 0, shards: int = 1) -> list[SweptSecretDTO]:
+        now = int(time.time() * 1_000_000)
+        swept = []
+        for bucket in range(shard, _EXPIRY_BUCKETS, shards) if shards > 1 else range(_EXPIRY_BUCKETS):
+            heap = self._expiry[bucket]
+            while heap and heap[0][0] <= now and len(swept) < limit:
+                expires_at, secret_id = heapq.heappop(heap)
+                entry = self._index.get(secret_id.bytes)
+                if entry is None or entry.expires_at != expires_at:
+                    continue
+                self._tombstone(secret_id, entry)
+                swept.append(SweptSecretDTO(uuid=secret_id, expiry_lag=timedelta(microseconds=now - expires_at)))
+            if len(swept) >= limit:
+                break
+        return swept
+
+    def live_ids(self, limit: int, after: UUID | None = None) -> list[UUID]:
+        # a keyset walk sorts the index once, when it starts, and pages through that snapshot. Ids saved after that
+        # are missing from it and burned ones still in it, which is fine for the filter rebuild, the only walker
+        if after is None or self._live_ids is None:
+            self._live_ids = sorted(key for key, _ in self._index.items())
+        start = bisect.bisect_right(self._live_ids, after.bytes) if after is not None else 0
+        keys = self._live_ids[start : start + limit]
+        if len(keys) < limit:
+            self._live_ids = None
+        return [UUID(bytes=key) for key in keys]
+
+    async def compact(self) -> int:
+        reclaimed = 0
+        for segment in sorted(self._sizes):
+            size = self._sizes[segment]
+            if segment == self._active or (size and self._live_bytes.get(segment, 0) / size > self._compaction_ratio):
+                continue
+            reclaimed += await self._compact_segment(segment)
+        return reclaimed
+
+    async def _compact_segment(self, segment: int) -> int:
+        # sealed segments are never written again, so the file can be read outside the event loop
+        data = await asyncio.to_thread(self._segment_path(segment).read_bytes)
+        for i, (offset, kind, payload) in enumerate(_iter_records(data)):
+            if kind == _PUT:
+                key = payload[:16]
+                entry = self._index.get(key)
+                if entry is not None and entry.segment == segment and entry.offset == offset:
+                    new_segment, new_offset, length = self._append(_PUT, payload)
+                    self._index.put(key, entry._replace(segment=new_segment, offset=new_offset))
+                    self._live_bytes[new_segment] += length
+            else:
+                _, put_segment = _TOMBSTONE_PAYLOAD.unpack(payload)
+                if put_segment != segment and put_segment in self._sizes:
+                    # the put it cancels is still on disk, dropping the tombstone would bring it back on replay
+                    self._append(_TOMBSTONE, payload)
+            if i % _COMPACTION_BATCH == _COMPACTION_BATCH - 1:
+                await asyncio.sleep(0)
+
+        # the copies have to be durable and indexed before the only other copy is deleted
+        await self.sync()
+        self.checkpoint()
+        os.close(self._fds.pop(segment))
+        del self._sizes[segment]
+        self._live_bytes.pop(segment, None)
+        self._segment_path(segment).unlink()
+        logger.info('Compacted segment %d of %s, reclaimed %d bytes', segment, self._path, len(data))
+        return len(data)
+
+    def _segment_path(self, segment: int) -> Path:
+        return self._path / f'segment-{segment:08d}.log'
+
+    def _is_behind_log(self, checkpoint: tuple[int, int]) -> bool:
+        segment, offset = checkpoint
+        return segment == 0 or (segment in self._sizes and offset <= self._sizes[segment])
+
+    def _replay(self, segment: int, offset: int) -> None:
+        data = self._segment_path(segment).read_bytes()
+        end = offset
+        for record_offset, kind, payload in _iter_records(data, offset):
+            end = record_offset + _RECORD.size + len(payload)
+            if kind == _PUT:
+                key, expires_at = _PUT_HEADER.unpack_from(payload)
+                self._index.put(key, IndexEntry(segment, record_offset, end - record_offset, expires_at))
+            else:
+                key, _ = _TOMBSTONE_PAYLOAD.unpack(payload)
+                self._index.remove(key)
+
+        if end < len(data):
+            logger.warning('Truncating %d bytes of a torn record at the end of segment %d', len(data) - end, segment)
+            os.truncate(self._segment_path(segment), end)
+            self._sizes[segment] = end
+
+    def _append(self, kind: int, payload: bytes) -> tuple[int, int, int]:
+        record = _RECORD.pack(_crc(kind, payload), len(payload), kind) + payload
+        if self._sizes[self._active] and self._sizes[self._active] + len(record) > self._segment_size:
+            self._roll()
+
+        segment = self._active
+        offset = self._sizes[segment]
+        os.write(self._fds[segment], record)
+        self._sizes[segment] = offset + len(record)
+        self._written += len(record)
+        return segment, offset, len(record)
+
+    def _roll(self) -> None:
+        if self._fsync:
+            os.fsync(self._fds[self._active])
+        self._active += 1
+        self._fds[self._active] = os.open(
+            self._segment_path(self._active),
+            os.O_RDWR | os.O_CREAT | os.O_APPEND,
+            0o600,
+        )
+        self._sizes[self._active] = 0
+        self._live_bytes[self._active] = 0
+
+    def _read(self, secret_id: UUID, entry: IndexEntry) -> SecretDM | None:
+        fd = self._fds.get(entry.segment)
+        record = os.pread(fd, entry.length, entry.offset) if fd is not None else b''
+        if len(record) < _RECORD.size + _PUT_HEADER.size:
+            return None
+
+        crc, length, kind = _RECORD.unpack_from(record)
+        payload = record[_RECORD.size :]
+        if kind != _PUT or len(payload) != length or _crc(kind, payload) != crc or payload[:16] != secret_id.bytes:
+            # an index entry can outlive a log tail lost to a crash and then point at someone else's record
+            logger.warning('Index entry of secret %s does not match the log, ignoring it', secret_id)
+            return None
+        return self._data_mapper.bytes_to_entity(data=payload[_PUT_HEADER.size :])
+
+    def _tombstone(self, secret_id: UUID, entry: IndexEntry) -> None:
+        self._append(_TOMBSTONE, _TOMBSTONE_PAYLOAD.pack(secret_id.bytes, entry.segment))
+        self._index.remove(secret_id.bytes)
+        self._live_bytes[entry.segment] -= entry.length
+
+
+class LogStoreSession(interfaces.DBSession):
+    def __init__(self, store: LogStructuredStore) -> None:
+        self._store = store
+
+    async def commit(self) -> None:
+        await self._store.sync()
+
+    async def flush(self) -> None:
+        pass
+
+
+class LogSecretRepository(
+    interfaces.SecretReader,
+    interfaces.SecretSaver,
+    interfaces.SecretDeleter,
+    interfaces.SecretClaimer,
+    interfaces.SecretSweeper,
+    interfaces.SecretIdLister,
+):
+    def __init__(self, store: LogStructuredStore) -> None:
+        self._store = store
+
+    async def get_by_id(self, secret_id: UUID) -> SecretDM:
+        secret = self._store.get(secret_id)
+        if secret is None:
+            raise domain_exceptions.SecretNotFound
+        return secret
+
+    async def save(self, secret: SecretDM) -> None:
+        await self.save_many(secrets=[secret])
+
+    async def save_many(self, secrets: Sequence[SecretDM]) -> None:
+        for secret in secrets:
+            if not secret.is_deleted:
+                self._store.put(secret)
+
+    async def delete(self, secret: SecretDM) -> None:
+        if self._store.remove(secret.uuid) is None:
+            raise domain_exceptions.SecretNotFound
+
+    async def claim(self, secret_id: UUID) -> SecretDM:
+        secret = self._store.remove(secret_id)
+        if secret is None:
+            raise domain_exceptions.SecretNotFound
+        secret.is_deleted = True
+        return secret
+
+    async def sweep_expired(self, limit: int, shard: int = 0, shards: int = 1) -> Collection[SweptSecretDTO]:
+        return self._store.sweep_expired(limit=limit, shard=shard, shards=shards)
+
+    async def get_live_ids(self, limit: int, after: UUID | None = None) -> Sequence[UUID]:
+        return self._store.live_ids(limit=limit, after=after)
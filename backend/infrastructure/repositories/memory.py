@@ -0,0 +1,222 @@
+import heapq
+import time
+from bisect import bisect_right
+from collections import deque
+from collections.abc import AsyncIterator, Collection, Sequence
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+from backend.application import interfaces
+from backend.application.dto.event import EventFilterDTO
+from backend.application.dto.secret import SweptSecretDTO
+from backend.domain import exceptions as domain_exceptions
+from backend.domain.entities.event_dm import EventDM, EventType
+from backend.domain.entities.event_stats import EventCountDM, StatsBucket
+from backend.domain.entities.pagination import KeysetCursor
+from backend.domain.entities.secret_dm import SecretDM
+
+_EXPORT_BATCH_SIZE = 1000
+
+# expiry heaps are split by the last uuid byte, the same hash ranges sweep_expired of the postgres repository uses
+_EXPIRY_BUCKETS = 256
+
+
+class _SecretRecord:
+    __slots__ = ('created_at', 'expired_at', 'expires_at', 'passphrase', 'secret')
+
+    def __init__(self, secret: SecretDM) -> None:
+        self.secret = secret.secret
+        self.passphrase = secret.passphrase
+        self.created_at = secret.created_at
+        self.expired_at = secret.expired_at
+        self.expires_at = secret.expired_at.timestamp() if secret.expired_at is not None else None
+
+    def to_entity(self, uuid: UUID, is_deleted: bool = False) -> SecretDM:
+        return SecretDM(
+            uuid=uuid,
+            secret=self.secret,
+            passphrase=self.passphrase,
+            created_at=self.created_at,
+            expired_at=self.expired_at,
+            is_deleted=is_deleted,
+        )
+
+
+class InMemorySession(interfaces.DBSession):
+    # writes of the in-memory repositories are visible immediately, there is no transaction to commit
+    async def commit(self) -> None:
+        pass
+
+    async def flush(self) -> None:
+        pass
+
+
+class InMemorySecretRepository(
+    interfaces.SecretReader,
+    interfaces.SecretSaver,
+    interfaces.SecretDeleter,
+    interfaces.SecretClaimer,
+    interfaces.SecretSweeper,
+    interfaces.SecretIdLister,
+):
+    # deleted and burned secrets are dropped instead of flagged, nothing ever reads them back
+    def __init__(self) -> None:
+        self._secrets: dict[UUID, _SecretRecord] = {}
+        self._expiry: list[list[tuple[float, UUID]]] = [[] for _ in range(_EXPIRY_BUCKETS)]
+
+    async def get_by_id(self, secret_id: UUID) -> SecretDM:
+        record = self._secrets.get(secret_id)
+        if record is None:
+            raise domain_exceptions.SecretNotFound
+        return record.to_entity(uuid=secret_id)
+
+    async def save(self, secret: SecretDM) -> None:
+        await self.save_many(secrets=[secret])
+
+    async def save_many(self, secrets: Sequence[SecretDM]) -> None:
+        for secret in secrets:
+            if secret.is_deleted:
+                continue
+            record = self._secrets[secret.uuid] = _SecretRecord(secret=secret)
+            if record.expires_at is not None:
+                heapq.heappush(self._expiry[secret.uuid.bytes[15]], (record.expires_at, secret.uuid))
+
+    async def delete(self, secret: SecretDM) -> None:
+        if self._secrets.pop(secret.uuid, None) is None:
+            raise domain_exceptions.SecretNotFound
+
+    async def claim(self, secret_id: UUID) -> SecretDM:
+        # a single dict pop, so of two concurrent readers exactly one gets the record
+        record = self._secrets.pop(secret_id, None)
+        if record is None:
+            raise domain_exceptions.SecretNotFound
+        return record.to_entity(uuid=secret_id, is_deleted=True)
+
+    async def sweep_expired(self, limit: int, shard: int = 0, shards: int = 1) -> Collection[SweptSecretDTO]:
+        # only heap tops that are due are visited, so a sweep costs O(expired) instead of a scan of every secret;
+        # entries of secrets that were burned or deleted earlier are stale and just dropped on the way
+        now = time.time()
+        swept = []
+        for bucket in range(shard, _EXPIRY_BUCKETS, shards) if shards > 1 else range(_EXPIRY_BUCKETS):
+            heap = self._expiry[bucket]
+            while heap and heap[0][0] <= now and len(swept) < limit:
+                expires_at, secret_id = heapq.heappop(heap)
+                record = self._secrets.get(secret_id)
+                if record is None or record.expires_at != expires_at:
+                    continue
+                del self._secrets[secret_id]
+                swept.append(SweptSecretDTO(uuid=secret_id, expiry_lag=timedelta(seconds=now - expires_at)))
+            if len(swept) >= limit:
+                break
+        return swept
+
+    async def get_live_ids(self, limit: int, after: UUID | None = None) -> Sequence[UUID]:
+        ids = sorted(self._secrets)
+        start = bisect_right(ids, after) if after is not None else 0
+        return ids[start : start + limit]
+
+
+def _event_key(event: EventDM) -> tuple[datetime, UUID]:
+    return event.created_at, event.uuid
+
+
+def _truncate(value: datetime, bucket: StatsBucket) -> datetime:
+    match bucket:
+        case StatsBucket.MINUTE:
+            return value.replace(second=0, microsecond=0)
+        case StatsBucket.HOUR:
+            return value.replace(minute=0, second=0, microsecond=0)
+    return value.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _matches(event: EventDM, filters: EventFilterDTO) -> bool:
+    if filters.start is not None and event.created_at < filters.start:
+        return False
+    if filters.end is not None and event.created_at >= filters.end:
+        return False
+    if filters.secret_id is not None and event.secret_id != filters.secret_id:
+        return False
+    if filters.client_ip is not None and event.client_ip != filters.client_ip:
+        return False
+    return not filters.types or event.type in filters.types
+
+
+class InMemoryEventRepository(
+    interfaces.EventReader,
+    interfaces.EventPageReader,
+    interfaces.EventCountEstimator,
+    interfaces.EventSaver,
+    interfaces.EventStatsReader,
+    interfaces.EventExporter,
+):
+    # a ring buffer: once capacity is reached every new event pushes out the oldest one
+    def __init__(self, capacity: int) -> None:
+        self._events: deque[EventDM] = deque(maxlen=capacity)
+
+    async def get_all(self) -> Collection[EventDM]:
+        return list(self._events)
+
+    async def get_page(
+        self,
+        limit: int,
+        after: KeysetCursor | None = None,
+        offset: int = 0,
+        filters: EventFilterDTO | None = None,
+    ) -> Sequence[EventDM]:
+        page = []
+        for event in reversed(self._events):
+            if after is not None and _event_key(event) >= (after.created_at, after.uuid):
+                continue
+            if filters is not None and not _matches(event, filters):
+                continue
+            if offset:
+                offset -= 1
+                continue
+            page.append(event)
+            if len(page) == limit:
+                break
+        return page
+
+    async def count(self, filters: EventFilterDTO | None = None) -> int:
+        if filters is None:
+            return len(self._events)
+        return sum(1 for event in self._events if _matches(event, filters))
+
+    async def estimate_count(self, filters: EventFilterDTO | None = None) -> int:
+        return await self.count(filters=filters)
+
+    async def save(self, event: EventDM) -> None:
+        await self.save_many(events=[event])
+
+    async def save_many(self, events: Sequence[EventDM]) -> None:
+        for event in events:
+            if not self._events or _event_key(event) >= _event_key(self._events[-1]):
+                self._events.append(event)
+                continue
+            # concurrent requests can finish out of order; keeping the buffer sorted keeps keyset pages stable
+            if len(self._events) == self._events.maxlen:
+                self._events.popleft()
+            position = bisect_right(self._events, _event_key(event), key=_event_key)
+            self._events.insert(position, event)
+
+    async def get_counts(self, bucket: StatsBucket, start: datetime, end: datetime) -> Sequence[EventCountDM]:
+        # the buffer is small enough to count on every request, there is nothing to roll up
+        counts: dict[tuple[datetime, EventType], int] = {}
+        for event in self._events:
+            if not start <= event.created_at < end:
+                continue
+            key = (_truncate(event.created_at, bucket), event.type)
+            counts[key] = counts.get(key, 0) + 1
+        return [
+            EventCountDM(bucket_start=bucket_start, type=event_type, count=count)
+            for (bucket_start, event_type), count in sorted(counts.items())
+        ]
+
+    async def get_rolled_up_to(self) -> datetime | None:
+        return datetime.now(UTC)
+
+    async def export(self, filters: EventFilterDTO) -> AsyncIterator[Sequence[EventDM]]:
+        # a snapshot, so saves during a slow download do not break the iteration
+        events = [event for event in self._events if _matches(event, filters)]
+        for start in range(0, len(events), _EXPORT_BATCH_SIZE):
+            yield events[start : start + _EXPORT_BATCH_SIZE]
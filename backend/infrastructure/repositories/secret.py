@@ -1,4 +1,5 @@
-from collections.abc import Collection
+from collections.abc import Collection, Sequence
+from datetime import timedelta
 from uuid import UUID
 
 import redis.asyncio as redis
@@ -6,24 +7,26 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import text
 
 from backend.application import interfaces
+from backend.application.dto.secret import SweptSecretDTO
 from backend.domain import exceptions as domain_exceptions
 from backend.domain.entities.secret_dm import SecretDM
 from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
 
-from sqlalchemy.exc import ProgrammingError
-from psycopg.errors import UndefinedTable
-
 
 class SecretRepository(
     interfaces.SecretReader,
     interfaces.SecretSaver,
     interfaces.SecretDeleter,
+    interfaces.SecretClaimer,
+    interfaces.SecretSweeper,
+    interfaces.SecretIdLister,
+    interfaces.SecretPurger,
 ):
     def __init__(
-            self,
-            session: AsyncSession,
-            redis_client: redis.Redis,
-            data_mapper: SecretCacheDataMapper,
+        self,
+        session: AsyncSession,
+        redis_client: redis.Redis,
+        data_mapper: SecretCacheDataMapper,
     ) -> None:
         self._session = session
         self._redis_client = redis_client
@@ -32,10 +35,11 @@ class SecretRepository(
     async def get_by_id(self, secret_id: UUID) -> SecretDM:
         cache = await self._redis_client.get(str(secret_id))
         if cache:
-            return self._data_mapper.json_to_entity(data=cache)
+            return self._data_mapper.bytes_to_entity(data=cache)
 
         query = text(
-            'SELECT uuid, secret, passphrase, created_at, expired_at, is_deleted FROM secrets WHERE uuid = :uuid AND is_deleted = FALSE',
+            'SELECT uuid, secret, passphrase, created_at, expired_at, is_deleted '
+            'FROM secrets WHERE uuid = :uuid AND is_deleted = FALSE',
         )
         result = await self._session.execute(statement=query, params={'uuid': secret_id})
         row = result.fetchone()
@@ -52,26 +56,13 @@ class SecretRepository(
             is_deleted=row.is_deleted,
         )
 
-    async def get_all_expirable(self) -> Collection[SecretDM]:
-        query = text(
-            'SELECT uuid, secret, passphrase, created_at, expired_at, is_deleted FROM secrets WHERE expired_at IS NOT NULL AND is_deleted = FALSE',
-        )
-        result = await self._session.execute(statement=query)
-        rows = result.fetchall()
+    async def save(self, secret: SecretDM, ttl: int = 300) -> None:
+        await self.save_many(secrets=[secret], ttl=ttl)
 
-        return [
-            SecretDM(
-                uuid=row.uuid,
-                secret=row.secret,
-                passphrase=row.passphrase,
-                created_at=row.created_at,
-                expired_at=row.expired_at,
-                is_deleted=row.is_deleted,
-            )
-            for row in rows
-        ]
+    async def save_many(self, secrets: Sequence[SecretDM], ttl: int = 300) -> None:
+        if not secrets:
+            return
 
-    async def save(self, secret: SecretDM, ttl: int = 300) -> None:
         stmt = text(
             'INSERT INTO secrets(uuid, secret, passphrase, created_at, expired_at, is_deleted) '
             'VALUES '
@@ -80,24 +71,127 @@ class SecretRepository(
 
         await self._session.execute(
             statement=stmt,
-            params={
-                'uuid': secret.uuid,
-                'secret': secret.secret,
-                'passphrase': secret.passphrase,
-                'created_at': secret.created_at,
-                'expired_at': secret.expired_at,
-                'is_deleted': secret.is_deleted,
-            },
+            params=[
+                {
+                    'uuid': secret.uuid,
+                    'secret': secret.secret,
+                    'passphrase': secret.passphrase,
+                    'created_at': secret.created_at,
+                    'expired_at': secret.expired_at,
+                    'is_deleted': secret.is_deleted,
+                }
+                for secret in secrets
+            ],
         )
 
-        value = self._data_mapper.entity_to_json(secret=secret)
-        await self._redis_client.set(name=str(secret.uuid), value=value, ex=ttl)
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for secret in secrets:
+                value = self._data_mapper.entity_to_bytes(secret=secret)
+                pipe.set(name=str(secret.uuid), value=value, ex=ttl)
+            await pipe.execute()
 
     async def delete(self, secret: SecretDM) -> None:
-        stmt = text('UPDATE secrets SET is_deleted = TRUE WHERE uuid = :uuid')
-        await self._session.execute(
+        # guarded like claim: of a delete racing another delete or a burn only one matches the row,
+        # so the secret filter is decremented once
+        stmt = text(
+            'UPDATE secrets SET is_deleted = TRUE, deleted_at = now() '
+            'WHERE uuid = :uuid AND is_deleted = FALSE RETURNING uuid',
+        )
+        result = await self._session.execute(
             statement=stmt,
             params={'uuid': secret.uuid},
         )
+        if not result.fetchone():
+            raise domain_exceptions.SecretNotFound
 
         await self._redis_client.delete(str(secret.uuid))
+
+    async def claim(self, secret_id: UUID) -> SecretDM:
+        # GETDEL and the guarded UPDATE make sure only one reader walks away with the secret;
+        # a concurrent claimer blocks on the row lock and then matches zero rows
+        cache = await self._redis_client.getdel(str(secret_id))
+        if cache:
+            stmt = text(
+                'UPDATE secrets SET is_deleted = TRUE, deleted_at = now() '
+                'WHERE uuid = :uuid AND is_deleted = FALSE RETURNING uuid',
+            )
+            result = await self._session.execute(statement=stmt, params={'uuid': secret_id})
+            if not result.fetchone():
+                raise domain_exceptions.SecretNotFound
+
+            secret = self._data_mapper.bytes_to_entity(data=cache)
+            secret.is_deleted = True
+            return secret
+
+        stmt = text(
+            'UPDATE secrets SET is_deleted = TRUE, deleted_at = now() WHERE uuid = :uuid AND is_deleted = FALSE '
+            'RETURNING uuid, secret, passphrase, created_at, expired_at, is_deleted',
+        )
+        result = await self._session.execute(statement=stmt, params={'uuid': secret_id})
+        row = result.fetchone()
+
+        if not row:
+            raise domain_exceptions.SecretNotFound
+
+        return SecretDM(
+            uuid=row.uuid,
+            secret=row.secret,
+            passphrase=row.passphrase,
+            created_at=row.created_at,
+            expired_at=row.expired_at,
+            is_deleted=row.is_deleted,
+        )
+
+    async def sweep_expired(self, limit: int, shard: int = 0, shards: int = 1) -> Collection[SweptSecretDTO]:
+        # the last uuid byte is uniformly distributed for uuid4, so it splits the sweep into even hash ranges
+        shard_filter = 'AND get_byte(uuid_send(uuid), 15) % :shards = :shard ' if shards > 1 else ''
+        # shard_filter is a constant fragment, the shard values stay bound parameters
+        stmt = text(
+            'UPDATE secrets SET is_deleted = TRUE, deleted_at = now() '  # noqa: S608
+            'WHERE uuid IN ('
+            'SELECT uuid FROM secrets WHERE is_deleted = FALSE AND expired_at <= now() '
+            f'{shard_filter}'
+            'ORDER BY expired_at LIMIT :limit FOR UPDATE SKIP LOCKED'
+            ') '
+            'RETURNING uuid, now() - expired_at AS expiry_lag',
+        )
+        result = await self._session.execute(
+            statement=stmt,
+            params={'limit': limit, 'shard': shard, 'shards': shards},
+        )
+        rows = result.fetchall()
+
+        if rows:
+            await self._redis_client.unlink(*(str(row.uuid) for row in rows))
+
+        return [SweptSecretDTO(uuid=row.uuid, expiry_lag=row.expiry_lag) for row in rows]
+
+    async def get_live_ids(self, limit: int, after: UUID | None = None) -> Sequence[UUID]:
+        if after is None:
+            stmt = text('SELECT uuid FROM secrets WHERE is_deleted = FALSE ORDER BY uuid LIMIT :limit')
+            params = {'limit': limit}
+        else:
+            stmt = text(
+                'SELECT uuid FROM secrets WHERE is_deleted = FALSE AND uuid > :after ORDER BY uuid LIMIT :limit',
+            )
+            params = {'limit': limit, 'after': after}
+
+        result = await self._session.execute(statement=stmt, params=params)
+        return result.scalars().all()
+
+    async def purge_deleted(self, grace: timedelta, limit: int) -> int:
+        # a short batch keeps row locks and WAL bursts small; rows deleted before deleted_at existed have it NULL
+        stmt = text(
+            'DELETE FROM secrets '
+            'WHERE uuid IN ('
+            'SELECT uuid FROM secrets WHERE is_deleted AND (deleted_at IS NULL OR deleted_at < now() - :grace) '
+            'LIMIT :limit FOR UPDATE SKIP LOCKED'
+            ')',
+        )
+        result = await self._session.execute(statement=stmt, params={'grace': grace, 'limit': limit})
+        return result.rowcount
+
+
+class NullSecretPurger(interfaces.SecretPurger):
+    async def purge_deleted(self, grace: timedelta, limit: int) -> int:  # noqa: ARG002
+        return 0
@@ -4,8 +4,11 @@ from backend.application import interfaces
 
 
 class BcryptHasher(interfaces.BcryptHasher):
+    def __init__(self, rounds: int = 12) -> None:
+        self._rounds = rounds
+
     def hash(self, raw_data: str) -> bytes:
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self._rounds)
         return bcrypt.hashpw(raw_data.encode(), salt)
 
     def verify(self, raw_data: bytes, hashed_data: bytes) -> bool:
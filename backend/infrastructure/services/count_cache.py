@@ -0,0 +1,47 @@
+import logging
+import time
+
+import redis.asyncio as redis
+
+from backend.application import interfaces
+
+logger = logging.getLogger(__name__)
+
+
+class RedisCountCache(interfaces.CountCache):
+    # shared by all api processes, so one exact count per ttl serves every instance
+    def __init__(self, redis_client: redis.Redis, ttl: int) -> None:
+        self._redis_client = redis_client
+        self._ttl = ttl
+
+    async def get(self, key: str) -> int | None:
+        try:
+            value = await self._redis_client.get(key)
+        except redis.RedisError:
+            logger.warning('Count cache is unavailable, counting instead', exc_info=True)
+            return None
+        return int(value) if value is not None else None
+
+    async def set(self, key: str, value: int) -> None:
+        try:
+            await self._redis_client.set(key, value, ex=self._ttl)
+        except redis.RedisError:
+            logger.warning('Failed to cache the count of %s', key, exc_info=True)
+
+
+class InMemoryCountCache(interfaces.CountCache):
+    def __init__(self, ttl: int) -> None:
+        self._ttl = ttl
+        self._values: dict[str, tuple[float, int]] = {}
+
+    async def get(self, key: str) -> int | None:
+        entry = self._values.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    async def set(self, key: str, value: int) -> None:
+        now = time.monotonic()
+        # expired entries are dropped on write, so filters that are never asked for again do not pile up
+        self._values = {k: entry for k, entry in self._values.items() if entry[0] > now}
+        self._values[key] = (now + self._ttl, value)
@@ -1,30 +1,79 @@
 import base64
 import os
+from collections.abc import Sequence
+from typing import Protocol
 
-from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from backend.application import interfaces
 
 
-class EncryptionService(interfaces.EncryptionService):
+class CipherSuite(Protocol):
+    # header bytes stay below 0x20 so they can never be confused with the base64 text of legacy ciphertexts
+    header: int | None
+
+    def encrypt(self, plaintext: bytes) -> bytes: ...
+
+    def decrypt(self, payload: bytes) -> bytes: ...
+
+
+class AesGcmCipherSuite(CipherSuite):
+    header = 0x01
+    nonce_size = 12
+
     def __init__(self, secret_key: bytes) -> None:
-        self._secret_key = secret_key
+        self._aead = AESGCM(secret_key)
 
-    def encrypt(self, plaintext: str) -> bytes:
+    def encrypt(self, plaintext: bytes) -> bytes:
+        nonce = os.urandom(self.nonce_size)
+        return nonce + self._aead.encrypt(nonce, plaintext, None)
+
+    def decrypt(self, payload: bytes) -> bytes:
+        return self._aead.decrypt(payload[: self.nonce_size], payload[self.nonce_size :], None)
+
+
+class LegacyAesCbcCipherSuite(CipherSuite):
+    # unversioned base64(iv + AES-CBC) with zero padding, kept so that secrets stored before AES-GCM still decrypt
+    header = None
+
+    def __init__(self, secret_key: bytes) -> None:
+        self._algorithm = algorithms.AES(secret_key)
+
+    def encrypt(self, plaintext: bytes) -> bytes:
         iv = os.urandom(16)
-        cipher = Cipher(algorithms.AES(self._secret_key), modes.CBC(iv), backend=default_backend())
-        encryptor = cipher.encryptor()
-        plaintext_bytes = plaintext.encode('utf-8')
-        padding_length = 16 - len(plaintext_bytes) % 16
-        padded = plaintext_bytes + b'\0' * padding_length
-        ciphertext = encryptor.update(padded) + encryptor.finalize()
-        return base64.b64encode(iv + ciphertext)
+        encryptor = Cipher(self._algorithm, modes.CBC(iv)).encryptor()
+        padded = plaintext + b'\0' * (16 - len(plaintext) % 16)
+        return base64.b64encode(iv + encryptor.update(padded) + encryptor.finalize())
 
-    def decrypt(self, ciphertext: bytes) -> bytes:
-        raw = base64.b64decode(ciphertext)
-        iv = raw[:16]
-        cipher = Cipher(algorithms.AES(self._secret_key), modes.CBC(iv), backend=default_backend())
-        decryptor = cipher.decryptor()
+    def decrypt(self, payload: bytes) -> bytes:
+        raw = base64.b64decode(payload)
+        decryptor = Cipher(self._algorithm, modes.CBC(raw[:16])).decryptor()
         plaintext = decryptor.update(raw[16:]) + decryptor.finalize()
         return plaintext.rstrip(b'\0')
+
+
+class EncryptionService(interfaces.EncryptionService):
+    def __init__(self, suites: Sequence[CipherSuite], legacy_suite: CipherSuite | None = None) -> None:
+        self._default_suite = suites[0]
+        self._default_header = bytes([suites[0].header])
+        self._suites = {suite.header: suite for suite in suites}
+        self._legacy_suite = legacy_suite
+
+    def encrypt(self, plaintext: str) -> bytes:
+        return self._default_header + self._default_suite.encrypt(plaintext.encode())
+
+    def decrypt(self, ciphertext: bytes) -> bytes:
+        suite = self._suites.get(ciphertext[0])
+        if suite is None:
+            if self._legacy_suite is None:
+                raise ValueError('Unknown ciphertext format')
+            return self._legacy_suite.decrypt(ciphertext)
+
+        return suite.decrypt(ciphertext[1:])
+
+    def encrypt_many(self, plaintexts: Sequence[str]) -> list[bytes]:
+        return [self.encrypt(plaintext) for plaintext in plaintexts]
+
+    def decrypt_many(self, ciphertexts: Sequence[bytes]) -> list[bytes]:
+        return [self.decrypt(ciphertext) for ciphertext in ciphertexts]
@@ -0,0 +1,172 @@
+import asyncio
+import logging
+import multiprocessing
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any
+
+from backend.application import exceptions as app_exceptions, interfaces
+
+logger = logging.getLogger(__name__)
+
+# passphrases of a batch hashed by one worker job: small enough that single calls get a worker between two jobs
+_BATCH_CHUNK_SIZE = 8
+
+
+def _timed_call(func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def _map_call(func: Callable[[Any], Any], items: Sequence[Any]) -> list[Any]:
+    return [func(item) for item in items]
+
+
+@dataclass(slots=True)
+class HashingEngineStats:
+    workers: int
+    capacity: int
+    in_flight: int
+    queue_depth: int
+    completed: int
+    rejected: int
+    wait_time_total: float
+    wait_time_max: float
+
+    @property
+    def wait_time_avg(self) -> float:
+        return self.wait_time_total / self.completed if self.completed else 0.0
+
+
+class ProcessPoolHashingEngine(interfaces.HashingEngine):
+    def __init__(
+        self,
+        hasher: interfaces.BcryptHasher,
+        workers: int,
+        queue_size: int,
+        retry_after: int,
+        metrics: interfaces.Metrics | None = None,
+    ) -> None:
+        self._hasher = hasher
+        self._metrics = metrics
+        self._workers = workers
+        self._capacity = workers + queue_size
+        self._retry_after = retry_after
+        # batches never hold more than half of the workers, the rest stay free for single hash and verify calls
+        self._batch_slots = asyncio.Semaphore(max(1, workers // 2))
+        # and never more than half of the admission slots at a time, larger batches are hashed window by window
+        self._batch_window = max(1, self._capacity // 2)
+        self._executor = self._create_executor()
+
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_time_total = 0.0
+        self._wait_time_max = 0.0
+
+    async def hash(self, raw_data: str) -> bytes:
+        return await self._submit(self._hasher.hash, raw_data)
+
+    async def hash_many(self, raw_data: Sequence[str]) -> list[bytes]:
+        if not raw_data:
+            return []
+
+        hashed = []
+        for start in range(0, len(raw_data), self._batch_window):
+            window = raw_data[start : start + self._batch_window]
+            # every passphrase of the window takes its own admission slot, so a batch is turned away like the single
+            # calls it would otherwise queue in front of; the slots of a window are free again once it is hashed
+            self._admit(jobs=len(window))
+            chunks = [window[i : i + _BATCH_CHUNK_SIZE] for i in range(0, len(window), _BATCH_CHUNK_SIZE)]
+            results = await asyncio.gather(*(self._run_batch_chunk(chunk) for chunk in chunks))
+            hashed.extend(item for chunk in results for item in chunk)
+        return hashed
+
+    async def verify(self, raw_data: bytes, hashed_data: bytes) -> bool:
+        return await self._submit(self._hasher.verify, raw_data, hashed_data)
+
+    def stats(self) -> HashingEngineStats:
+        return HashingEngineStats(
+            workers=self._workers,
+            capacity=self._capacity,
+            in_flight=self._in_flight,
+            queue_depth=max(0, self._in_flight - self._workers),
+            completed=self._completed,
+            rejected=self._rejected,
+            wait_time_total=self._wait_time_total,
+            wait_time_max=self._wait_time_max,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(cancel_futures=True)
+
+    async def _submit(self, func: Callable[..., Any], *args: Any) -> Any:
+        self._admit(jobs=1)
+        return await self._run(func, *args)
+
+    def _admit(self, jobs: int) -> None:
+        if self._in_flight + jobs > self._capacity:
+            self._rejected += jobs
+            raise app_exceptions.HashingEngineOverloadedError(retry_after=self._retry_after)
+        self._in_flight += jobs
+
+    async def _run_batch_chunk(self, chunk: Sequence[str]) -> list[bytes]:
+        try:
+            await self._batch_slots.acquire()
+        except asyncio.CancelledError:
+            # the chunk never reached a worker, so nothing else gives its admission slots back
+            self._release(jobs=len(chunk))
+            raise
+        return await self._run(_map_call, self._hasher.hash, chunk, jobs=len(chunk), batch=True)
+
+    async def _run(self, func: Callable[..., Any], *args: Any, jobs: int = 1, batch: bool = False) -> Any:
+        submitted_at = time.perf_counter()
+
+        job = asyncio.ensure_future(self._execute(func, *args))
+        # the slots are released when the worker is done, even if the awaiting request was cancelled meanwhile
+        job.add_done_callback(lambda _: self._release(jobs, batch))
+
+        result, run_time = await asyncio.shield(job)
+        self._record_wait(time.perf_counter() - submitted_at - run_time)
+        return result
+
+    async def _execute(self, func: Callable[..., Any], *args: Any) -> tuple[Any, float]:
+        executor = self._executor
+        try:
+            return await asyncio.wrap_future(executor.submit(_timed_call, func, *args))
+        except BrokenProcessPool:
+            # a worker that died, e.g. killed for running out of memory, breaks the pool for good, so it is replaced
+            # and the job tried once more
+            self._replace_executor(executor)
+            return await asyncio.wrap_future(self._executor.submit(_timed_call, func, *args))
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # forkserver keeps the event loop, connection pools and threads of the api process out of the workers
+        return ProcessPoolExecutor(
+            max_workers=self._workers,
+            mp_context=multiprocessing.get_context('forkserver'),
+        )
+
+    def _replace_executor(self, broken: ProcessPoolExecutor) -> None:
+        # every job of a broken pool fails with it, only the first of them replaces it
+        if self._executor is not broken:
+            return
+        logger.warning('Hashing worker pool is broken, starting a new one')
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = self._create_executor()
+
+    def _release(self, jobs: int = 1, batch: bool = False) -> None:
+        self._in_flight -= jobs
+        if batch:
+            self._batch_slots.release()
+
+    def _record_wait(self, wait_time: float) -> None:
+        self._completed += 1
+        self._wait_time_total += wait_time
+        self._wait_time_max = max(self._wait_time_max, wait_time)
+        if self._metrics is not None:
+            self._metrics.observe('executor_wait_seconds', wait_time, executor='hashing')
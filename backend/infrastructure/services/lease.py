@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+from uuid import uuid4
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+# unique per process, so two workers of the same pod never mistake each other's lease for their own
+PROCESS_HOLDER_ID = f'{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}'
+
+_ACQUIRE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+_RENEW_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('PEXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisLease:
+    def __init__(self, redis_client: redis.Redis, key: str, ttl: float, holder: str = PROCESS_HOLDER_ID) -> None:
+        self._key = key
+        self._ttl_ms = int(ttl * 1000)
+        self._holder = holder
+        self._acquire = redis_client.register_script(_ACQUIRE_SCRIPT)
+        self._renew = redis_client.register_script(_RENEW_SCRIPT)
+        self._release = redis_client.register_script(_RELEASE_SCRIPT)
+
+    async def acquire(self) -> bool:
+        # taking a free lease and extending our own are the same call, so a holder keeps it across runs
+        return bool(await self._acquire(keys=[self._key], args=[self._holder, self._ttl_ms]))
+
+    async def renew(self) -> bool:
+        return bool(await self._renew(keys=[self._key], args=[self._holder, self._ttl_ms]))
+
+    async def release(self) -> None:
+        await self._release(keys=[self._key], args=[self._holder])
+
+    @asynccontextmanager
+    async def keep_alive(self) -> AsyncIterator[None]:
+        renewal = asyncio.create_task(self._keep_alive())
+        try:
+            yield
+        finally:
+            renewal.cancel()
+            with suppress(asyncio.CancelledError):
+                await renewal
+
+    async def _keep_alive(self) -> None:
+        while True:
+            await asyncio.sleep(self._ttl_ms / 3000)
+            try:
+                if not await self.renew():
+                    logger.warning('Lease %s was lost while the job was running', self._key)
+                    return
+            except redis.RedisError:
+                logger.warning('Failed to renew lease %s', self._key, exc_info=True)
+
+
+class ShardedLease:
+    # one lease per shard; the lease is not released after the run, so every shard is processed at most
+    # once per ttl by the whole cluster, and a crashed holder's shard is picked up once its ttl runs out
+    def __init__(self, redis_client: redis.Redis, name: str, shards: int, ttl: float) -> None:
+        self._leases = [
+            RedisLease(redis_client=redis_client, key=f'lease:{name}:{shard}', ttl=ttl) for shard in range(shards)
+        ]
+
+    async def claim(self) -> AsyncIterator[int]:
+        # shards are taken one at a time in random order, so holders running at the same moment split the work
+        shards = list(range(len(self._leases)))
+        random.shuffle(shards)
+
+        for shard in shards:
+            lease = self._leases[shard]
+            if not await lease.acquire():
+                continue
+            async with lease.keep_alive():
+                yield shard
+
+
+class LocalShardedLease:
+    # stands in for ShardedLease when the data lives in process memory: nobody else can sweep it
+    def __init__(self, shards: int) -> None:
+        self._shards = shards
+
+    async def claim(self) -> AsyncIterator[int]:
+        for shard in range(self._shards):
+            yield shard
@@ -0,0 +1,190 @@
+import functools
+import inspect
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, TypeVar
+
+from backend.application import interfaces
+from backend.infrastructure.services.hashing_engine import ProcessPoolHashingEngine
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[tuple[str, str], ...]
+RepositoryT = TypeVar('RepositoryT')
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels, bound: str | None = None) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if bound is not None:
+        pairs.append(f'le="{bound}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, buckets: tuple[float, ...]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        # per label set: one counter per bucket plus +Inf, then the sum; buckets are made cumulative on render only
+        self._series: dict[Labels, list[float]] = {}
+
+    def observe(self, value: float, labels: Labels) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.documentation}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, series in list(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, '+Inf'), series[:-1], strict=True):
+                cumulative += count
+                yield f'{self.name}_bucket{_format_labels(labels, bound=str(bound))} {cumulative}'
+            yield f'{self.name}_sum{_format_labels(labels)} {series[-1]}'
+            yield f'{self.name}_count{_format_labels(labels)} {cumulative}'
+
+
+class _LapTimer(interfaces.StageTimer):
+    __slots__ = ('_last', '_operation', '_registry')
+
+    def __init__(self, registry: 'MetricsRegistry', operation: str) -> None:
+        self._registry = registry
+        self._operation = operation
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        self._registry.observe('stage_seconds', now - self._last, operation=self._operation, stage=stage)
+        self._last = now
+
+
+class MetricsRegistry(interfaces.Metrics):
+    # everything stays in process memory and is rendered on scrape, nothing is pushed anywhere
+    def __init__(self, namespace: str = 'secret_manager', buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self._namespace = namespace
+        self._buckets = buckets
+        self._histograms: dict[str, Histogram] = {}
+        self._collectors: list[Callable[[], Iterable[str]]] = []
+        # observations also come from executor threads
+        self._lock = threading.Lock()
+
+    def register(self, metric: str, documentation: str) -> None:
+        name = f'{self._namespace}_{metric}'
+        self._histograms[metric] = Histogram(name=name, documentation=documentation, buckets=self._buckets)
+
+    def register_collector(self, collector: Callable[[], Iterable[str]]) -> None:
+        self._collectors.append(collector)
+
+    def observe(self, metric: str, value: float, **labels: str) -> None:
+        with self._lock:
+            histogram = self._histograms.get(metric)
+            if histogram is None:
+                self.register(metric=metric, documentation=metric.replace('_', ' '))
+                histogram = self._histograms[metric]
+            histogram.observe(value, tuple(labels.items()))
+
+    @contextmanager
+    def measure(self, metric: str, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - started, **labels)
+
+    def stages(self, operation: str) -> interfaces.StageTimer:
+        return _LapTimer(registry=self, operation=operation)
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [line for histogram in self._histograms.values() for line in histogram.render()]
+        for collector in self._collectors:
+            lines.extend(collector())
+        return '\n'.join(lines) + '\n'
+
+
+def create_metrics_registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.register('stage_seconds', 'Time spent in each stage of an interactor.')
+    registry.register(
+        'repository_call_seconds',
+        'Duration of repository calls, including their Redis and Postgres round trips.',
+    )
+    registry.register('executor_wait_seconds', 'Time a job waited in an executor queue before a worker picked it up.')
+    registry.register('secret_purge_batch_seconds', 'Duration of one batch of the purge of deleted secrets.')
+    return registry
+
+
+class InstrumentedThreadPoolExecutor(ThreadPoolExecutor):
+    def __init__(self, max_workers: int, metrics: interfaces.Metrics, name: str) -> None:
+        super().__init__(max_workers=max_workers, thread_name_prefix=name)
+        self._metrics = metrics
+        self._name = name
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        submitted_at = time.perf_counter()
+
+        def timed() -> Any:
+            self._metrics.observe('executor_wait_seconds', time.perf_counter() - submitted_at, executor=self._name)
+            return fn(*args, **kwargs)
+
+        return super().submit(timed)
+
+
+def instrument_repository(repository: RepositoryT, metrics: interfaces.Metrics, name: str) -> RepositoryT:
+    # shadows every public coroutine method on the instance with a timed one, so the repository keeps its own type
+    # and protocols while the class itself stays free of timing code
+    for attr in _public_coroutine_methods(type(repository)):
+        setattr(repository, attr, _timed(getattr(repository, attr), metrics=metrics, name=name, method_name=attr))
+    return repository
+
+
+@functools.cache
+def _public_coroutine_methods(cls: type) -> tuple[str, ...]:
+    # repositories are built for every request, the reflection only has to happen once per class
+    return tuple(attr for attr, _ in inspect.getmembers(cls, inspect.iscoroutinefunction) if not attr.startswith('_'))
+
+
+def _timed(
+    method: Callable[..., Awaitable[Any]],
+    metrics: interfaces.Metrics,
+    name: str,
+    method_name: str,
+) -> Callable[..., Awaitable[Any]]:
+    @functools.wraps(method)
+    async def timed(*args: Any, **kwargs: Any) -> Any:
+        with metrics.measure('repository_call_seconds', repository=name, method=method_name):
+            return await method(*args, **kwargs)
+
+    return timed
+
+
+def hashing_engine_collector(
+    engine: ProcessPoolHashingEngine,
+    namespace: str = 'secret_manager',
+) -> Callable[[], list[str]]:
+    def collect() -> list[str]:
+        stats = engine.stats()
+        lines = []
+        for metric, metric_type, documentation, value in (
+            ('hashing_in_flight', 'gauge', 'Passphrase jobs running or queued in the bcrypt pool.', stats.in_flight),
+            ('hashing_queue_depth', 'gauge', 'Passphrase jobs waiting for a bcrypt worker.', stats.queue_depth),
+            ('hashing_capacity', 'gauge', 'Passphrase jobs admitted before requests are rejected.', stats.capacity),
+            ('hashing_completed_total', 'counter', 'Passphrase jobs completed.', stats.completed),
+            ('hashing_rejected_total', 'counter', 'Passphrases rejected because the pool was full.', stats.rejected),
+        ):
+            name = f'{namespace}_{metric}'
+            lines.extend((f'# HELP {name} {documentation}', f'# TYPE {name} {metric_type}', f'{name} {value}'))
+        return lines
+
+    return collect
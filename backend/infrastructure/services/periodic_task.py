@@ -1,16 +1,148 @@
 import asyncio
-from functools import wraps
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from enum import StrEnum
 
+logger = logging.getLogger(__name__)
 
-def periodic_task(*, delay: float):
-    def decorator(func):
-        @wraps(func)
-        async def wrapped(*args, **kwargs):
-            loop = asyncio.get_event_loop()
-            res = await func(*args, **kwargs)
-            loop.call_later(delay, loop.create_task, wrapped(*args, **kwargs))
-            return res
 
-        return wrapped
+class ScheduleMode(StrEnum):
+    # fixed_rate runs on a fixed grid regardless of how long a run takes, fixed_delay waits the interval after each run
+    FIXED_RATE = 'fixed_rate'
+    FIXED_DELAY = 'fixed_delay'
 
-    return decorator
+
+@dataclass(slots=True)
+class PeriodicTaskStats:
+    runs: int = 0
+    failures: int = 0
+    skipped: int = 0
+    last_duration: float | None = None
+    max_duration: float = 0.0
+    total_duration: float = 0.0
+    last_lag: float | None = None
+    max_lag: float = 0.0
+
+    @property
+    def avg_duration(self) -> float:
+        return self.total_duration / self.runs if self.runs else 0.0
+
+
+@dataclass(slots=True)
+class _PeriodicTask:
+    name: str
+    func: Callable[[], Awaitable[object]]
+    interval: float
+    mode: ScheduleMode
+    jitter: float
+    initial_delay: float
+    stats: PeriodicTaskStats = field(default_factory=PeriodicTaskStats)
+    loop_task: asyncio.Task | None = None
+    running: asyncio.Task | None = None
+
+
+class PeriodicScheduler:
+    def __init__(self) -> None:
+        self._tasks: dict[str, _PeriodicTask] = {}
+
+    def add(
+        self,
+        name: str,
+        func: Callable[[], Awaitable[object]],
+        interval: float,
+        mode: ScheduleMode = ScheduleMode.FIXED_RATE,
+        jitter: float = 0.0,
+        initial_delay: float = 0.0,
+    ) -> None:
+        if name in self._tasks:
+            raise ValueError(f'Periodic task {name!r} is already registered')
+
+        self._tasks[name] = _PeriodicTask(
+            name=name,
+            func=func,
+            interval=interval,
+            mode=mode,
+            jitter=jitter,
+            initial_delay=initial_delay,
+        )
+
+    def start(self) -> None:
+        for task in self._tasks.values():
+            if task.loop_task is None:
+                task.loop_task = asyncio.create_task(self._run_loop(task), name=f'periodic:{task.name}')
+
+    async def stop(self, grace: float | None = None) -> None:
+        # no new runs are scheduled; runs in progress get up to grace seconds to finish before they are cancelled
+        loop_tasks = [task.loop_task for task in self._tasks.values() if task.loop_task is not None]
+        for loop_task in loop_tasks:
+            loop_task.cancel()
+        await asyncio.gather(*loop_tasks, return_exceptions=True)
+
+        running = [task.running for task in self._tasks.values() if task.running is not None]
+        if running:
+            _, pending = await asyncio.wait(running, timeout=grace)
+            for run in pending:
+                run.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        for task in self._tasks.values():
+            task.loop_task = None
+            task.running = None
+
+    def stats(self) -> dict[str, PeriodicTaskStats]:
+        return {name: task.stats for name, task in self._tasks.items()}
+
+    async def _run_loop(self, task: _PeriodicTask) -> None:
+        loop = asyncio.get_running_loop()
+        scheduled_at = loop.time() + task.initial_delay
+
+        while True:
+            jitter = random.uniform(0, task.jitter)  # noqa: S311
+            await asyncio.sleep(max(0.0, scheduled_at - loop.time()) + jitter)
+
+            if task.running is not None:
+                # a fixed_rate run outlived its interval; overlapping it would only pile up work
+                task.stats.skipped += 1
+                logger.warning('Periodic task %s is still running, skipping this run', task.name)
+            else:
+                task.running = asyncio.create_task(self._run_once(task, lag=loop.time() - scheduled_at - jitter))
+
+            if task.mode == ScheduleMode.FIXED_DELAY:
+                # waiting without awaiting the run itself keeps it alive when the loop is cancelled on stop
+                await asyncio.wait([task.running])
+                scheduled_at = loop.time() + task.interval
+                continue
+
+            # the next slot is computed from the grid, not from the wake-up time, so runs do not drift;
+            # slots missed because the loop was blocked are dropped instead of fired back to back
+            scheduled_at += task.interval
+            now = loop.time()
+            if scheduled_at < now:
+                missed = int((now - scheduled_at) // task.interval) + 1
+                task.stats.skipped += missed
+                scheduled_at += missed * task.interval
+
+    async def _run_once(self, task: _PeriodicTask, lag: float) -> None:
+        stats = task.stats
+        stats.last_lag = lag
+        stats.max_lag = max(stats.max_lag, lag)
+
+        started = time.perf_counter()
+        try:
+            await task.func()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            stats.failures += 1
+            logger.exception('Periodic task %s failed', task.name)
+        finally:
+            duration = time.perf_counter() - started
+            stats.runs += 1
+            stats.last_duration = duration
+            stats.max_duration = max(stats.max_duration, duration)
+            stats.total_duration += duration
+            task.running = None
+            logger.debug('Periodic task %s finished in %.3fs, started %.3fs late', task.name, duration, lag)
@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import math
+from collections.abc import Sequence
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from backend.application import interfaces
+from backend.infrastructure.services.lease import RedisLease
+
+logger = logging.getLogger(__name__)
+
+# the ready marker is one more counter after the filter's own, in the same string: if redis evicts the filter, the
+# marker goes with it. A missing marker means the filter is still being built, so every lookup answers "maybe"
+_CONTAINS_SCRIPT = """
+if redis.call('BITFIELD', KEYS[1], 'GET', 'u4', ARGV[1])[1] == 0 then
+    return 1
+end
+for i = 2, #ARGV do
+    local offset = ARGV[i]
+    if redis.call('BITFIELD', KEYS[1], 'GET', 'u4', offset)[1] == 0 then
+        return 0
+    end
+end
+return 1
+"""
+
+# saturated counters are sticky: decrementing one could hide another live id that shares it;
+# discards before the filter is ready are dropped because the rebuild may not have added the id yet
+_DISCARD_SCRIPT = """
+if redis.call('BITFIELD', KEYS[1], 'GET', 'u4', ARGV[1])[1] == 0 then
+    return 0
+end
+for i = 2, #ARGV do
+    local offset = ARGV[i]
+    local value = redis.call('BITFIELD', KEYS[1], 'GET', 'u4', offset)[1]
+    if value > 0 and value < 15 then
+        redis.call('BITFIELD', KEYS[1], 'INCRBY', 'u4', offset, -1)
+    end
+end
+return 1
+"""
+
+
+class RedisSecretIdFilter(interfaces.SecretIdFilter):
+    # counting bloom filter stored as 4-bit counters in a single redis string, shared by all api processes
+    batch_size = 1000
+    rebuild_ttl = 60
+
+    def __init__(self, redis_client: redis.Redis, key: str, capacity: int, error_rate: float) -> None:
+        self._redis_client = redis_client
+        self._key = key
+        self._counters = max(1, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._counters / capacity * math.log(2)))
+        self._ready_offset = f'#{self._counters}'
+        self._rebuild_lease = RedisLease(redis_client=redis_client, key=f'lease:{key}:rebuild', ttl=self.rebuild_ttl)
+        self._contains = redis_client.register_script(_CONTAINS_SCRIPT)
+        self._discard = redis_client.register_script(_DISCARD_SCRIPT)
+
+    async def might_contain(self, secret_id: UUID) -> bool:
+        try:
+            return bool(await self._contains(keys=[self._key], args=[self._ready_offset, *self._offsets(secret_id)]))
+        except redis.RedisError:
+            logger.warning('Secret filter is unavailable, falling back to a full lookup', exc_info=True)
+            return True
+
+    async def add_many(self, secret_ids: Sequence[UUID]) -> None:
+        # errors are not swallowed here: a secret missing from the filter would be reported as not found
+        for i in range(0, len(secret_ids), self.batch_size):
+            args = []
+            for secret_id in secret_ids[i : i + self.batch_size]:
+                for offset in self._offsets(secret_id):
+                    args.extend(('INCRBY', 'u4', offset, 1))
+            await self._redis_client.execute_command('BITFIELD', self._key, 'OVERFLOW', 'SAT', *args)
+
+    async def discard_many(self, secret_ids: Sequence[UUID]) -> None:
+        # a counter left behind only costs a false positive, so failures here are not fatal
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for secret_id in secret_ids:
+                    await self._discard(
+                        keys=[self._key],
+                        args=[self._ready_offset, *self._offsets(secret_id)],
+                        client=pipe,
+                    )
+                await pipe.execute()
+        except redis.RedisError:
+            logger.warning('Failed to discard %d ids from the secret filter', len(secret_ids), exc_info=True)
+
+    async def is_ready(self) -> bool:
+        values = await self._redis_client.execute_command('BITFIELD', self._key, 'GET', 'u4', self._ready_offset)
+        return bool(values[0])
+
+    async def claim_rebuild(self) -> bool:
+        # a second rebuild running at the same time would count every id twice, and deletes could never bring those
+        # counters back to zero; the holder extends its claim with every call
+        return await self._rebuild_lease.acquire()
+
+    async def mark_ready(self) -> None:
+        await self._redis_client.execute_command('BITFIELD', self._key, 'SET', 'u4', self._ready_offset, 1)
+        await self._rebuild_lease.release()
+
+    def _offsets(self, secret_id: UUID) -> list[str]:
+        digest = hashlib.blake2b(secret_id.bytes, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8])
+        h2 = int.from_bytes(digest[8:]) | 1
+        return [f'#{(h1 + i * h2) % self._counters}' for i in range(self._hashes)]
+
+
+class NullSecretIdFilter(interfaces.SecretIdFilter):
+    async def might_contain(self, secret_id: UUID) -> bool:  # noqa: ARG002
+        return True
+
+    async def add_many(self, secret_ids: Sequence[UUID]) -> None:
+        pass
+
+    async def discard_many(self, secret_ids: Sequence[UUID]) -> None:
+        pass
+
+    async def is_ready(self) -> bool:
+        return True
+
+    async def claim_rebuild(self) -> bool:
+        return False
+
+    async def mark_ready(self) -> None:
+        pass
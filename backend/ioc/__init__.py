@@ -1,4 +1,11 @@
 from backend.ioc.application import ApplicationProvider
 from backend.ioc.infrastructure import InfrastructureProvider
+from backend.ioc.log_store import LogStoreInfrastructureProvider
+from backend.ioc.memory import InMemoryInfrastructureProvider
 
-__all__ = ['ApplicationProvider', 'InfrastructureProvider']
+__all__ = [
+    'ApplicationProvider',
+    'InMemoryInfrastructureProvider',
+    'InfrastructureProvider',
+    'LogStoreInfrastructureProvider',
+]
@@ -5,12 +5,22 @@ from dishka import Provider, Scope, from_context, provide
 
 from backend.application import interfaces
 from backend.application.services.pagination import PaginationService
-from backend.application.use_cases.events import GetEventsInteractor
+from backend.application.services.single_flight import SingleFlight
+from backend.application.use_cases.events import (
+    ExportEventsInteractor,
+    GetEventsInteractor,
+    GetEventStatsInteractor,
+    MaintainEventPartitionsInteractor,
+    RollUpEventsInteractor,
+)
 from backend.application.use_cases.secret import (
     CheckSecretExpirationInteractor,
+    CreateSecretBatchInteractor,
     CreateSecretInteractor,
     DeleteSecretInteractor,
     GetSecretInteractor,
+    PurgeDeletedSecretsInteractor,
+    RebuildSecretFilterInteractor,
 )
 
 
@@ -24,10 +34,19 @@ class ApplicationProvider(Provider):
         return lambda: datetime.now(UTC)
 
     create_secret_interactor = provide(CreateSecretInteractor, scope=Scope.REQUEST)
+    create_secret_batch_interactor = provide(CreateSecretBatchInteractor, scope=Scope.REQUEST)
     get_secret_interactor = provide(GetSecretInteractor, scope=Scope.REQUEST)
     delete_secret_interactor = provide(DeleteSecretInteractor, scope=Scope.REQUEST)
     check_secret_expiration_interactor = provide(CheckSecretExpirationInteractor, scope=Scope.REQUEST)
+    rebuild_secret_filter_interactor = provide(RebuildSecretFilterInteractor, scope=Scope.REQUEST)
+    purge_deleted_secrets_interactor = provide(PurgeDeletedSecretsInteractor, scope=Scope.REQUEST)
 
     get_events_interactor = provide(GetEventsInteractor, scope=Scope.REQUEST)
+    maintain_event_partitions_interactor = provide(MaintainEventPartitionsInteractor, scope=Scope.REQUEST)
+    export_events_interactor = provide(ExportEventsInteractor, scope=Scope.REQUEST)
+    get_event_stats_interactor = provide(GetEventStatsInteractor, scope=Scope.REQUEST)
+    roll_up_events_interactor = provide(RollUpEventsInteractor, scope=Scope.REQUEST)
 
     pagination_service = provide(PaginationService, scope=Scope.REQUEST)
+    # shared by all requests of the process, otherwise concurrent reads would not see each other
+    single_flight = provide(SingleFlight, scope=Scope.APP)
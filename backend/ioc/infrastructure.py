@@ -8,23 +8,63 @@ from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_asyn
 
 from backend.application import interfaces
 from backend.application.use_cases.secret import SecretDeleteManager
-from backend.config import Config
+from backend.config import Config, EventDurability
 from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
-from backend.infrastructure.repositories.event import EventRepository
+from backend.infrastructure.repositories.event import EventExportRepository, EventRepository
+from backend.infrastructure.repositories.event_buffer import BufferedEventSaver, NullEventSaver
+from backend.infrastructure.repositories.event_partitions import EventPartitionRepository
+from backend.infrastructure.repositories.event_rollups import EventRollupRepository
 from backend.infrastructure.repositories.secret import SecretRepository
 from backend.infrastructure.services.bcrypt_hasher import BcryptHasher
-from backend.infrastructure.services.encryption import EncryptionService
+from backend.infrastructure.services.count_cache import RedisCountCache
+from backend.infrastructure.services.encryption import (
+    AesGcmCipherSuite,
+    EncryptionService,
+    LegacyAesCbcCipherSuite,
+)
+from backend.infrastructure.services.hashing_engine import ProcessPoolHashingEngine
+from backend.infrastructure.services.lease import ShardedLease
+from backend.infrastructure.services.metrics import (
+    InstrumentedThreadPoolExecutor,
+    MetricsRegistry,
+    create_metrics_registry,
+    hashing_engine_collector,
+    instrument_repository,
+)
+from backend.infrastructure.services.secret_filter import NullSecretIdFilter, RedisSecretIdFilter
 
 
 class InfrastructureProvider(Provider):
     config = from_context(provides=Config, scope=Scope.APP)
 
     @provide(scope=Scope.APP)
-    def get_thread_pool(self) -> Iterable[ThreadPoolExecutor]:
-        thread_pool = ThreadPoolExecutor(max_workers=8)
+    def get_metrics(self) -> AnyOf[MetricsRegistry, interfaces.Metrics]:
+        return create_metrics_registry()
+
+    @provide(scope=Scope.APP)
+    def get_thread_pool(self, metrics: interfaces.Metrics) -> Iterable[ThreadPoolExecutor]:
+        thread_pool = InstrumentedThreadPoolExecutor(max_workers=8, metrics=metrics, name='default')
         yield thread_pool
         thread_pool.shutdown()
 
+    @provide(scope=Scope.APP)
+    def get_hashing_engine(
+            self,
+            config: Config,
+            hasher: interfaces.BcryptHasher,
+            metrics: MetricsRegistry,
+    ) -> Iterable[AnyOf[ProcessPoolHashingEngine, interfaces.HashingEngine]]:
+        engine = ProcessPoolHashingEngine(
+            hasher=hasher,
+            workers=config.hashing.workers,
+            queue_size=config.hashing.queue_size,
+            retry_after=config.hashing.retry_after,
+            metrics=metrics,
+        )
+        metrics.register_collector(hashing_engine_collector(engine))
+        yield engine
+        engine.shutdown()
+
     @provide(scope=Scope.APP)
     def get_session_maker(self, config: Config) -> async_sessionmaker[AsyncSession]:
         engine = create_async_engine(
@@ -62,25 +102,140 @@ class InfrastructureProvider(Provider):
         yield client
         await client.aclose()
 
-    @provide(scope=Scope.REQUEST, provides=interfaces.EncryptionService)
+    @provide(scope=Scope.APP, provides=interfaces.EncryptionService)
     def get_encription_service(self, config: Config) -> EncryptionService:
-        return EncryptionService(secret_key=hashlib.sha256(config.encryption.secret_key.encode()).digest())
+        secret_key = hashlib.sha256(config.encryption.secret_key.encode()).digest()
+        return EncryptionService(
+            suites=[AesGcmCipherSuite(secret_key=secret_key)],
+            legacy_suite=LegacyAesCbcCipherSuite(secret_key=secret_key),
+        )
 
-    bcrypt_hasher = provide(
-        BcryptHasher,
-        scope=Scope.REQUEST,
-        provides=interfaces.BcryptHasher,
-    )
+    @provide(scope=Scope.APP, provides=interfaces.BcryptHasher)
+    def get_bcrypt_hasher(self, config: Config) -> BcryptHasher:
+        return BcryptHasher(rounds=config.hashing.bcrypt_rounds)
 
     secret_cache_data_mapper = provide(SecretCacheDataMapper, scope=Scope.REQUEST)
-    secret_repo = provide(
-        SecretRepository,
+    @provide(
         scope=Scope.REQUEST,
-        provides=AnyOf[interfaces.SecretReader, interfaces.SecretSaver, SecretDeleteManager],
+        provides=AnyOf[
+            interfaces.SecretReader,
+            interfaces.SecretSaver,
+            interfaces.SecretClaimer,
+            interfaces.SecretSweeper,
+            interfaces.SecretIdLister,
+            SecretDeleteManager,
+        ],
     )
+    def get_secret_repo(
+            self,
+            session: AsyncSession,
+            redis_client: redis.Redis,
+            data_mapper: SecretCacheDataMapper,
+            metrics: interfaces.Metrics,
+    ) -> SecretRepository:
+        repository = SecretRepository(session=session, redis_client=redis_client, data_mapper=data_mapper)
+        return instrument_repository(repository, metrics=metrics, name='secret')
+
+    @provide(scope=Scope.REQUEST)
+    def get_secret_purger(
+            self,
+            session: AsyncSession,
+            redis_client: redis.Redis,
+            data_mapper: SecretCacheDataMapper,
+            metrics: interfaces.Metrics,
+    ) -> interfaces.SecretPurger:
+        repository = SecretRepository(session=session, redis_client=redis_client, data_mapper=data_mapper)
+        return instrument_repository(repository, metrics=metrics, name='secret')
+
+    @provide(scope=Scope.REQUEST)
+    def get_sweeper_lease(self, config: Config, redis_client: redis.Redis) -> ShardedLease:
+        return ShardedLease(
+            redis_client=redis_client,
+            name='secret-sweeper',
+            shards=config.sweeper.shards,
+            ttl=config.sweeper.interval,
+        )
+
+    @provide(scope=Scope.REQUEST)
+    def get_secret_filter(
+            self,
+            config: Config,
+            redis_client: redis.Redis,
+            metrics: interfaces.Metrics,
+    ) -> interfaces.SecretIdFilter:
+        if not config.secret_filter.enabled:
+            return NullSecretIdFilter()
+
+        secret_filter = RedisSecretIdFilter(
+            redis_client=redis_client,
+            key='secret-filter',
+            capacity=config.secret_filter.capacity,
+            error_rate=config.secret_filter.error_rate,
+        )
+        return instrument_repository(secret_filter, metrics=metrics, name='secret_filter')
 
-    event_repo = provide(
-        EventRepository,
+    @provide(
         scope=Scope.REQUEST,
-        provides=AnyOf[interfaces.EventReader, interfaces.EventSaver],
+        provides=AnyOf[
+            EventRepository,
+            interfaces.EventReader,
+            interfaces.EventPageReader,
+            interfaces.EventCountEstimator,
+        ],
     )
+    def get_event_repo(self, session: AsyncSession, metrics: interfaces.Metrics) -> EventRepository:
+        return instrument_repository(EventRepository(session=session), metrics=metrics, name='event')
+
+    @provide(scope=Scope.REQUEST)
+    def get_count_cache(self, config: Config, redis_client: redis.Redis) -> interfaces.CountCache:
+        return RedisCountCache(redis_client=redis_client, ttl=config.events.count_cache_ttl)
+
+    @provide(scope=Scope.APP)
+    def get_event_exporter(
+            self,
+            config: Config,
+            session_maker: async_sessionmaker[AsyncSession],
+    ) -> interfaces.EventExporter:
+        return EventExportRepository(session_maker=session_maker, batch_size=config.events.export_batch_size)
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_partition_manager(self, session: AsyncSession) -> interfaces.EventPartitionManager:
+        return EventPartitionRepository(session=session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_stats_reader(self, session: AsyncSession) -> interfaces.EventStatsReader:
+        return EventRollupRepository(session=session)
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_rollup_updater(self, session: AsyncSession) -> interfaces.EventRollupUpdater:
+        return EventRollupRepository(session=session)
+
+    @provide(scope=Scope.APP)
+    async def get_event_buffer(
+            self,
+            config: Config,
+            session_maker: async_sessionmaker[AsyncSession],
+    ) -> AsyncIterable[BufferedEventSaver]:
+        event_buffer = BufferedEventSaver(
+            session_maker=session_maker,
+            flush_interval=config.events.flush_interval_ms / 1000,
+            flush_batch_size=config.events.flush_batch_size,
+            max_buffer_size=config.events.max_buffer_size,
+        )
+        yield event_buffer
+        await event_buffer.close()
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_saver(
+            self,
+            config: Config,
+            event_repo: EventRepository,
+            event_buffer: BufferedEventSaver,
+    ) -> interfaces.EventSaver:
+        match config.events.durability:
+            case EventDurability.BUFFERED:
+                return event_buffer
+            case EventDurability.OFF:
+                return NullEventSaver()
+            case _:
+                return event_repo
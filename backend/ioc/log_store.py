@@ -0,0 +1,47 @@
+from collections.abc import Iterable
+from pathlib import Path
+
+from dishka import AnyOf, Scope, provide
+
+from backend.application import interfaces
+from backend.application.use_cases.secret import SecretDeleteManager
+from backend.config import Config
+from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
+from backend.infrastructure.repositories.log_store import LogSecretRepository, LogStoreSession, LogStructuredStore
+from backend.infrastructure.services.metrics import instrument_repository
+from backend.ioc.memory import InMemoryInfrastructureProvider
+
+
+class LogStoreInfrastructureProvider(InMemoryInfrastructureProvider):
+    # secrets go to the log-structured store on local disk; audit events stay in the in-memory ring buffer
+
+    @provide(scope=Scope.APP)
+    def get_log_store(self, config: Config) -> Iterable[LogStructuredStore]:
+        store = LogStructuredStore(
+            path=Path(config.storage.log_path),
+            data_mapper=SecretCacheDataMapper(),
+            segment_size=config.storage.log_segment_size,
+            fsync=config.storage.log_fsync,
+            compaction_ratio=config.storage.log_compaction_ratio,
+        )
+        store.open()
+        yield store
+        store.close()
+
+    @provide(scope=Scope.REQUEST)
+    def get_session(self, store: LogStructuredStore) -> interfaces.DBSession:
+        return LogStoreSession(store=store)
+
+    @provide(
+        scope=Scope.REQUEST,
+        provides=AnyOf[
+            interfaces.SecretReader,
+            interfaces.SecretSaver,
+            interfaces.SecretClaimer,
+            interfaces.SecretSweeper,
+            interfaces.SecretIdLister,
+            SecretDeleteManager,
+        ],
+    )
+    def get_secret_repo(self, store: LogStructuredStore, metrics: interfaces.Metrics) -> LogSecretRepository:
+        return instrument_repository(LogSecretRepository(store=store), metrics=metrics, name='secret')
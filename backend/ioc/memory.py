@@ -0,0 +1,100 @@
+from dishka import AnyOf, Scope, provide
+
+from backend.application import interfaces
+from backend.application.use_cases.secret import SecretDeleteManager
+from backend.config import Config, EventDurability
+from backend.infrastructure.repositories.event_buffer import NullEventSaver
+from backend.infrastructure.repositories.event_partitions import NullEventPartitionManager
+from backend.infrastructure.repositories.event_rollups import NullEventRollupUpdater
+from backend.infrastructure.repositories.memory import (
+    InMemoryEventRepository,
+    InMemorySecretRepository,
+    InMemorySession,
+)
+from backend.infrastructure.repositories.secret import NullSecretPurger
+from backend.infrastructure.services.count_cache import InMemoryCountCache
+from backend.infrastructure.services.lease import LocalShardedLease, ShardedLease
+from backend.infrastructure.services.metrics import instrument_repository
+from backend.infrastructure.services.secret_filter import NullSecretIdFilter
+from backend.ioc.infrastructure import InfrastructureProvider
+
+
+class InMemoryInfrastructureProvider(InfrastructureProvider):
+    # replaces every factory that touches postgres or redis; encryption, hashing and metrics are shared
+
+    # the stores live as long as the app, so they are instrumented once here instead of on every request
+    @provide(scope=Scope.APP)
+    def get_secret_store(self, metrics: interfaces.Metrics) -> InMemorySecretRepository:
+        return instrument_repository(InMemorySecretRepository(), metrics=metrics, name='secret')
+
+    @provide(scope=Scope.APP)
+    def get_event_store(self, config: Config, metrics: interfaces.Metrics) -> InMemoryEventRepository:
+        store = InMemoryEventRepository(capacity=config.storage.memory_event_capacity)
+        return instrument_repository(store, metrics=metrics, name='event')
+
+    @provide(scope=Scope.REQUEST)
+    def get_session(self) -> interfaces.DBSession:
+        return InMemorySession()
+
+    @provide(
+        scope=Scope.REQUEST,
+        provides=AnyOf[
+            interfaces.SecretReader,
+            interfaces.SecretSaver,
+            interfaces.SecretClaimer,
+            interfaces.SecretSweeper,
+            interfaces.SecretIdLister,
+            SecretDeleteManager,
+        ],
+    )
+    def get_secret_repo(self, store: InMemorySecretRepository) -> InMemorySecretRepository:
+        return store
+
+    @provide(scope=Scope.REQUEST)
+    def get_secret_purger(self) -> interfaces.SecretPurger:
+        # deleted and burned secrets are dropped right away, nothing is left to purge
+        return NullSecretPurger()
+
+    @provide(scope=Scope.REQUEST, provides=ShardedLease)
+    def get_sweeper_lease(self, config: Config) -> LocalShardedLease:
+        return LocalShardedLease(shards=config.sweeper.shards)
+
+    @provide(scope=Scope.REQUEST)
+    def get_secret_filter(self) -> interfaces.SecretIdFilter:
+        # a dict lookup is already cheaper than asking a filter
+        return NullSecretIdFilter()
+
+    @provide(
+        scope=Scope.REQUEST,
+        provides=AnyOf[interfaces.EventReader, interfaces.EventPageReader, interfaces.EventCountEstimator],
+    )
+    def get_event_repo(self, store: InMemoryEventRepository) -> InMemoryEventRepository:
+        return store
+
+    @provide(scope=Scope.APP)
+    def get_count_cache(self, config: Config) -> interfaces.CountCache:
+        return InMemoryCountCache(ttl=config.events.count_cache_ttl)
+
+    @provide(scope=Scope.APP)
+    def get_event_exporter(self, store: InMemoryEventRepository) -> interfaces.EventExporter:
+        return store
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_partition_manager(self) -> interfaces.EventPartitionManager:
+        # the ring buffer drops old events by itself
+        return NullEventPartitionManager()
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_stats_reader(self, store: InMemoryEventRepository) -> interfaces.EventStatsReader:
+        return store
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_rollup_updater(self) -> interfaces.EventRollupUpdater:
+        # stats are counted straight from the ring buffer
+        return NullEventRollupUpdater()
+
+    @provide(scope=Scope.REQUEST)
+    def get_event_saver(self, config: Config, store: InMemoryEventRepository) -> interfaces.EventSaver:
+        if config.events.durability == EventDurability.OFF:
+            return NullEventSaver()
+        return store
@@ -1,7 +1,17 @@
 import argparse
 import logging
-from collections.abc import Callable, Coroutine
-from contextlib import asynccontextmanager
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Coroutine
+from contextlib import aclosing, asynccontextmanager
+from datetime import timedelta
+from functools import partial
+from multiprocessing.connection import wait
 from typing import Any
 
 import uvicorn
@@ -13,25 +23,103 @@ from psycopg.errors import UndefinedTable
 from sqlalchemy.exc import ProgrammingError
 
 from backend import ioc
-from backend.application.use_cases.secret import CheckSecretExpirationInteractor
-from backend.config import Config
-from backend.infrastructure.services.periodic_task import periodic_task
+from backend.application.use_cases.events import MaintainEventPartitionsInteractor, RollUpEventsInteractor
+from backend.application.use_cases.secret import (
+    CheckSecretExpirationInteractor,
+    PurgeDeletedSecretsInteractor,
+    RebuildSecretFilterInteractor,
+)
+from backend.config import Config, StorageBackend
+from backend.infrastructure.repositories.log_store import LogStructuredStore
+from backend.infrastructure.services.lease import ShardedLease
+from backend.infrastructure.services.periodic_task import PeriodicScheduler, ScheduleMode
 from backend.presentation.api.exceptions_mapping import EXCEPTIONS_MAPPING
 from backend.presentation.api.middlewares.no_cache import NoCacheMiddleware
 from backend.presentation.api.routers import router
 
 config = Config()
 
+# crashes of --reuse-port workers tolerated within the window before the launcher gives up
+MAX_WORKER_RESTARTS = 5
+WORKER_RESTART_WINDOW = 60
 
-@periodic_task(delay=60)
-async def check_secret_expirations_task(container: AsyncContainer):
-    async with container() as container:
+
+async def _run_if_table_exists(container: AsyncContainer, task: Callable[[AsyncContainer], Awaitable[None]]) -> None:
+    # the tasks start with the app, which may be before the migrations have been applied
+    async with container() as request_container:
         try:
-            interactor = await container.get(CheckSecretExpirationInteractor)
-            await interactor()
+            await task(request_container)
         except ProgrammingError as e:
-            if isinstance(e.orig, UndefinedTable):
-                logging.warning("Missing table in database — please ensure migrations have been applied.")
+            if not isinstance(e.orig, UndefinedTable):
+                raise
+            logging.warning('Missing table in database — please ensure migrations have been applied.')
+
+
+async def check_secret_expirations_task(container: AsyncContainer):
+    # every instance runs this, but only the holder of a shard lease sweeps that shard
+    lease = await container.get(ShardedLease)
+    interactor = await container.get(CheckSecretExpirationInteractor)
+    async with aclosing(lease.claim()) as shards:
+        async for shard in shards:
+            report = await interactor(
+                chunk_size=config.sweeper.chunk_size,
+                shard=shard,
+                shards=config.sweeper.shards,
+            )
+            if report.swept:
+                logging.info(
+                    'Swept %d expired secrets of shard %d in %d chunks, max lag %s',
+                    report.swept,
+                    shard,
+                    report.chunks,
+                    report.max_lag,
+                )
+
+
+async def rebuild_secret_filter_task(container: AsyncContainer):
+    # a no-op while the filter is ready; rebuilds it on first start and after redis loses the data
+    interactor = await container.get(RebuildSecretFilterInteractor)
+    added = await interactor()
+    if added:
+        logging.info('Rebuilt secret filter with %d live secrets', added)
+
+
+async def purge_deleted_secrets_task(container: AsyncContainer):
+    interactor = await container.get(PurgeDeletedSecretsInteractor)
+    report = await interactor(
+        grace=timedelta(seconds=config.purge.grace),
+        batch_size=config.purge.batch_size,
+        max_batches=config.purge.max_batches,
+        pause=config.purge.pause_ms / 1000,
+    )
+    if report.purged:
+        logging.info('Purged %d deleted secrets in %d batches', report.purged, report.batches)
+
+
+async def maintain_event_partitions_task(container: AsyncContainer):
+    interactor = await container.get(MaintainEventPartitionsInteractor)
+    report = await interactor(
+        months_ahead=config.events.partitions_ahead,
+        retention_months=config.events.retention_months,
+        detach=config.events.detach_expired,
+    )
+    if report.created or report.removed:
+        logging.info('Event partitions created: %s, removed: %s', report.created, report.removed)
+
+
+async def roll_up_events_task(container: AsyncContainer):
+    interactor = await container.get(RollUpEventsInteractor)
+    written = await interactor(delay=timedelta(seconds=config.events.rollup_delay))
+    if written:
+        logging.info('Rolled up events into %d buckets', written)
+
+
+async def compact_secret_log_task(container: AsyncContainer):
+    store = await container.get(LogStructuredStore)
+    reclaimed = await store.compact()
+    store.checkpoint()
+    if reclaimed:
+        logging.info('Compacted the secret log, reclaimed %d bytes', reclaimed)
 
 
 def setup_logging():
@@ -45,9 +133,58 @@ def setup_logging():
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await check_secret_expirations_task(app.state.dishka_container)
+    container = app.state.dishka_container
+
+    scheduler = PeriodicScheduler()
+    scheduler.add(
+        name='check_secret_expirations',
+        func=partial(_run_if_table_exists, container, check_secret_expirations_task),
+        interval=config.sweeper.interval,
+        jitter=config.sweeper.jitter,
+    )
+    # lookups fail open until the filter is ready, so startup does not wait for the rebuild
+    scheduler.add(
+        name='rebuild_secret_filter',
+        func=partial(_run_if_table_exists, container, rebuild_secret_filter_task),
+        interval=60,
+        mode=ScheduleMode.FIXED_DELAY,
+    )
+    if config.storage.backend == StorageBackend.POSTGRES:
+        scheduler.add(
+            name='maintain_event_partitions',
+            func=partial(_run_if_table_exists, container, maintain_event_partitions_task),
+            interval=3600,
+            mode=ScheduleMode.FIXED_DELAY,
+        )
+        scheduler.add(
+            name='purge_deleted_secrets',
+            func=partial(_run_if_table_exists, container, purge_deleted_secrets_task),
+            interval=config.purge.interval,
+            mode=ScheduleMode.FIXED_DELAY,
+        )
+        scheduler.add(
+            name='roll_up_events',
+            func=partial(_run_if_table_exists, container, roll_up_events_task),
+            interval=config.events.rollup_interval,
+            mode=ScheduleMode.FIXED_DELAY,
+        )
+    if config.storage.backend == StorageBackend.LOG:
+        # opening the store replays the log tail, better done before the first request than during it
+        await container.get(LogStructuredStore)
+        scheduler.add(
+            name='compact_secret_log',
+            func=partial(compact_secret_log_task, container),
+            interval=config.storage.log_compaction_interval,
+            mode=ScheduleMode.FIXED_DELAY,
+            initial_delay=config.storage.log_compaction_interval,
+        )
+    scheduler.start()
+    app.state.scheduler = scheduler
+
     yield
-    await app.state.dishka_container.close()
+
+    await scheduler.stop(grace=10)
+    await container.close()
 
 
 def create_app(
@@ -66,20 +203,129 @@ def create_app(
     )
     app.include_router(router)
 
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=['*'],
-        allow_credentials=True,
-        allow_methods=['*'],
-        allow_headers=['*'],
-    )
+    if config.http.cors_allow_origins:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=config.http.cors_allow_origins,
+            allow_credentials=True,
+            allow_methods=['*'],
+            allow_headers=['*'],
+        )
 
-    app.add_middleware(NoCacheMiddleware)
+    app.add_middleware(NoCacheMiddleware, security_headers=config.http.security_headers)
 
     fastapi_integration.setup_dishka(container, app)
     return app
 
 
+def make_app() -> FastAPI:
+    # app factory: every worker process builds its own container, so engines, pools and executors are never shared
+    setup_logging()
+    match config.storage.backend:
+        case StorageBackend.MEMORY:
+            infrastructure = ioc.InMemoryInfrastructureProvider()
+        case StorageBackend.LOG:
+            infrastructure = ioc.LogStoreInfrastructureProvider()
+        case _:
+            infrastructure = ioc.InfrastructureProvider()
+    container = make_async_container(ioc.ApplicationProvider(), infrastructure, context={Config: config})
+    return create_app(container=container, router=router, exc_mapping=EXCEPTIONS_MAPPING)
+
+
+def serve_worker(host: str, port: int, server_options: dict[str, Any]) -> None:
+    # each worker binds its own SO_REUSEPORT socket and the kernel balances new connections between them
+    sock = socket.socket(socket.AF_INET6 if ':' in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+
+    server = uvicorn.Server(uvicorn.Config('backend.main:make_app', factory=True, **server_options))
+    server.run(sockets=[sock])
+    if not server.started:
+        sys.exit(3)
+
+
+class RestartBudget:
+    # a worker that keeps dying, e.g. because it cannot bind or reach the database, is restarted with a growing delay;
+    # once more than max_restarts crashes fall into the window the launcher gives up, so its own supervisor sees it
+    def __init__(self, max_restarts: int, window: float) -> None:
+        self._max_restarts = max_restarts
+        self._window = window
+        self._crashes: deque[float] = deque()
+
+    def next_delay(self, now: float) -> float | None:
+        while self._crashes and self._crashes[0] < now - self._window:
+            self._crashes.popleft()
+        self._crashes.append(now)
+        if len(self._crashes) > self._max_restarts:
+            return None
+        return min(2 ** (len(self._crashes) - 1), self._window / 2)
+
+
+class WorkerSupervisor:
+    def __init__(self, workers: int, target: Callable[[], None], budget: RestartBudget) -> None:
+        self._context = multiprocessing.get_context('spawn')
+        self._target = target
+        self._budget = budget
+        self._processes = [self._start() for _ in range(workers)]
+        # slot of a crashed worker -> monotonic time it is started again
+        self._restarts: dict[int, float] = {}
+        self._stopping = False
+        self.exit_code = 0
+
+    def run(self) -> None:
+        while not self._stopping:
+            timeout = max(0.0, min([1.0, *(at - time.monotonic() for at in self._restarts.values())]))
+            wait([p.sentinel for i, p in enumerate(self._processes) if i not in self._restarts], timeout=timeout)
+
+            now = time.monotonic()
+            for i, process in enumerate(self._processes):
+                if not self._stopping and i not in self._restarts and not process.is_alive():
+                    self._schedule_restart(i, process, now)
+            for i in [i for i, at in self._restarts.items() if at <= now and not self._stopping]:
+                del self._restarts[i]
+                self._processes[i] = self._start()
+
+        for process in self._processes:
+            process.join()
+
+    def stop(self, *_: Any) -> None:
+        self._stopping = True
+        for process in self._processes:
+            if process.is_alive():
+                process.terminate()
+
+    def _start(self) -> multiprocessing.Process:
+        process = self._context.Process(target=self._target)
+        process.start()
+        return process
+
+    def _schedule_restart(self, slot: int, process: multiprocessing.Process, now: float) -> None:
+        delay = self._budget.next_delay(now)
+        if delay is None:
+            logging.error('Worker %d exited with code %s, out of restarts', process.pid, process.exitcode)
+            self.exit_code = 1
+            self.stop()
+            return
+        logging.warning('Worker %d exited with code %s, restarting in %ds', process.pid, process.exitcode, delay)
+        self._restarts[slot] = now + delay
+
+
+def serve_with_reuse_port(host: str, port: int, workers: int, server_options: dict[str, Any]) -> None:
+    setup_logging()
+    supervisor = WorkerSupervisor(
+        workers=workers,
+        target=partial(serve_worker, host, port, server_options),
+        budget=RestartBudget(max_restarts=MAX_WORKER_RESTARTS, window=WORKER_RESTART_WINDOW),
+    )
+    signal.signal(signal.SIGINT, supervisor.stop)
+    signal.signal(signal.SIGTERM, supervisor.stop)
+
+    supervisor.run()
+    if supervisor.exit_code:
+        sys.exit(supervisor.exit_code)
+
+
 def parse_argument() -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description='Launch API server with custom host and port.',
@@ -99,26 +345,71 @@ def parse_argument() -> argparse.Namespace:
         help='The port number to bind the server to. Default is 8000.',
     )
 
-    return parser.parse_args()
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=1,
+        help='Number of worker processes, each with its own event loop and DI container. Default is 1.',
+    )
+
+    parser.add_argument(
+        '--loop',
+        choices=['auto', 'asyncio', 'uvloop'],
+        default='auto',
+        help="Event loop implementation. 'auto' uses uvloop when it is installed. Default is 'auto'.",
+    )
+
+    parser.add_argument(
+        '--http',
+        choices=['auto', 'h11', 'httptools'],
+        default='auto',
+        help="HTTP/1.1 parser. 'auto' uses httptools when it is installed. Default is 'auto'.",
+    )
+
+    parser.add_argument(
+        '--reuse-port',
+        action='store_true',
+        help='Bind a separate SO_REUSEPORT socket in every worker instead of sharing one listening socket.',
+    )
+
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error('--workers must be at least 1')
+    if args.reuse_port and not hasattr(socket, 'SO_REUSEPORT'):
+        parser.error('--reuse-port is not supported on this platform')
+    if args.workers > 1 and config.storage.backend != StorageBackend.POSTGRES:
+        parser.error(
+            f'STORAGE_BACKEND={config.storage.backend} keeps secrets in one process and cannot run with --workers',
+        )
+
+    return args
 
 
 if __name__ == '__main__':
     launch_args = parse_argument()
-    setup_logging()
 
-    container = make_async_container(
-        ioc.ApplicationProvider(),
-        ioc.InfrastructureProvider(),
-        context={Config: config},
-    )
+    # bcrypt pools of all workers together should not use more processes than there are cores
+    os.environ.setdefault('HASHING_WORKERS', str(max(1, (os.cpu_count() or 1) // launch_args.workers)))
 
-    uvicorn.run(
-        create_app(
-            container=container,
-            router=router,
-            exc_mapping=EXCEPTIONS_MAPPING,
-        ),
-        host=launch_args.host,
-        port=launch_args.port,
-        lifespan='on',
-    )
+    server_options = {
+        'loop': launch_args.loop,
+        'http': launch_args.http,
+        'lifespan': 'on',
+    }
+
+    if launch_args.reuse_port:
+        serve_with_reuse_port(
+            host=launch_args.host,
+            port=launch_args.port,
+            workers=launch_args.workers,
+            server_options=server_options,
+        )
+    else:
+        uvicorn.run(
+            'backend.main:make_app',
+            factory=True,
+            host=launch_args.host,
+            port=launch_args.port,
+            workers=launch_args.workers,
+            **server_options,
+        )
@@ -3,6 +3,9 @@ from backend.domain import exceptions as domain_exceptions
 from backend.presentation.api.middlewares import exceptions_handlers
 
 EXCEPTIONS_MAPPING = {
+    app_exceptions.HashingEngineOverloadedError: exceptions_handlers.hashing_engine_overloaded_exception_handler,
     app_exceptions.IncorrectPassphraseError: exceptions_handlers.incorrect_passphrase_exception_handler,
+    app_exceptions.InvalidCursorError: exceptions_handlers.invalid_cursor_exception_handler,
+    app_exceptions.InvalidStatsRangeError: exceptions_handlers.invalid_stats_range_exception_handler,
     domain_exceptions.SecretNotFound: exceptions_handlers.secret_not_found_exception_handler,
 }
@@ -2,6 +2,8 @@ from fastapi.requests import Request
 from fastapi.responses import JSONResponse
 from starlette import status
 
+from backend.application import exceptions as app_exceptions
+
 
 async def secret_not_found_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     return JSONResponse(
@@ -15,3 +17,28 @@ async def incorrect_passphrase_exception_handler(request: Request, exc: Exceptio
         status_code=status.HTTP_401_UNAUTHORIZED,
         content={'detail': str(exc)},
     )
+
+
+async def invalid_cursor_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={'detail': str(exc)},
+    )
+
+
+async def invalid_stats_range_exception_handler(request: Request, exc: Exception) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        content={'detail': str(exc)},
+    )
+
+
+async def hashing_engine_overloaded_exception_handler(
+    request: Request,
+    exc: app_exceptions.HashingEngineOverloadedError,
+) -> JSONResponse:
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={'detail': str(exc)},
+        headers={'Retry-After': str(exc.retry_after)},
+    )
@@ -1,11 +1,38 @@
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+NO_CACHE_HEADERS = (
+    (b'cache-control', b'no-cache, no-store, must-revalidate'),
+    (b'pragma', b'no-cache'),
+    (b'expires', b'0'),
+)
 
-class NoCacheMiddleware(BaseHTTPMiddleware):
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
-        response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
-        response.headers["Pragma"] = "no-cache"
-        response.headers["Expires"] = "0"
-        return response
+SECURITY_HEADERS = (
+    (b'x-content-type-options', b'nosniff'),
+    (b'x-frame-options', b'DENY'),
+    (b'referrer-policy', b'no-referrer'),
+    (b'content-security-policy', b"default-src 'none'; frame-ancestors 'none'"),
+)
+
+
+class NoCacheMiddleware:
+    # plain ASGI instead of BaseHTTPMiddleware: no extra task or body stream per request,
+    # the header tuples are built once and appended to http.response.start
+    def __init__(self, app: ASGIApp, security_headers: bool = False) -> None:
+        self.app = app
+        self._headers = NO_CACHE_HEADERS + SECURITY_HEADERS if security_headers else NO_CACHE_HEADERS
+        self._header_names = frozenset(name for name, _ in self._headers)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message['type'] == 'http.response.start':
+                message['headers'] = [
+                    *(header for header in message.get('headers', ()) if header[0].lower() not in self._header_names),
+                    *self._headers,
+                ]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
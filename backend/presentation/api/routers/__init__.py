@@ -1,11 +1,17 @@
 from fastapi import APIRouter
 
 from backend.presentation.api.routers.event.route import router as event_router
+from backend.presentation.api.routers.metrics.route import router as metrics_router
 from backend.presentation.api.routers.secret.route import router as secret_router
 
-router = APIRouter(
+api_router = APIRouter(
     prefix='/api',
 )
 
-router.include_router(event_router)
-router.include_router(secret_router)
+api_router.include_router(event_router)
+api_router.include_router(secret_router)
+
+router = APIRouter()
+
+router.include_router(api_router)
+router.include_router(metrics_router)
@@ -0,0 +1,64 @@
+import csv
+import io
+import json
+import zlib
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing
+from enum import StrEnum
+
+from backend.domain.entities.event_dm import EventDM
+
+
+class ExportFormat(StrEnum):
+    NDJSON = 'ndjson'
+    CSV = 'csv'
+
+
+MEDIA_TYPES = {
+    ExportFormat.NDJSON: 'application/x-ndjson',
+    ExportFormat.CSV: 'text/csv',
+}
+FIELDS = ('id', 'client_ip', 'client_user_agent', 'type', 'created_at', 'secret_id')
+
+
+def _row(event: EventDM) -> tuple[str, ...]:
+    return (
+        str(event.uuid),
+        event.client_ip,
+        event.client_user_agent,
+        str(event.type),
+        event.created_at.isoformat(),
+        str(event.secret_id),
+    )
+
+
+async def encode_events(
+    batches: AsyncIterator[Sequence[EventDM]],
+    export_format: ExportFormat,
+) -> AsyncIterator[bytes]:
+    # one chunk per batch instead of per row keeps the number of ASGI sends low
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    async with aclosing(batches):
+        if export_format == ExportFormat.CSV:
+            writer.writerow(FIELDS)
+            yield buffer.getvalue().encode()
+        async for batch in batches:
+            if export_format == ExportFormat.NDJSON:
+                yield ''.join(
+                    json.dumps(dict(zip(FIELDS, _row(event), strict=True))) + '\n' for event in batch
+                ).encode()
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(map(_row, batch))
+            yield buffer.getvalue().encode()
+
+
+async def gzip_chunks(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    # a sync flush per chunk lets the client decompress what it has so far instead of waiting for the end
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async with aclosing(chunks):
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
@@ -1,8 +1,22 @@
+from datetime import datetime
+from uuid import UUID
+
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
-from fastapi import APIRouter
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
 
-from backend.application.use_cases.events import GetEventsInteractor
-from backend.presentation.api.routers.event.schemas import EventResponseSchema, EventsReponseSchema
+from backend.application.dto.event import EventFilterDTO
+from backend.application.use_cases.events import ExportEventsInteractor, GetEventsInteractor, GetEventStatsInteractor
+from backend.domain.entities.event_dm import EventType
+from backend.domain.entities.event_stats import StatsBucket
+from backend.domain.entities.pagination import CountStrategy
+from backend.presentation.api.routers.event.export import MEDIA_TYPES, ExportFormat, encode_events, gzip_chunks
+from backend.presentation.api.routers.event.schemas import (
+    EventResponseSchema,
+    EventsReponseSchema,
+    EventStatsBucketSchema,
+    EventStatsResponseSchema,
+)
 
 router = APIRouter(
     prefix='/event',
@@ -14,10 +28,24 @@ router = APIRouter(
 @router.get('', response_model=EventsReponseSchema)
 async def get_events(
     interactor: FromDishka[GetEventsInteractor],
-    page: int,
-    page_size: int,
+    page_size: int = Query(ge=1, le=1000),
+    page: int | None = Query(default=None, ge=1),
+    cursor: str | None = None,
+    secret_id: UUID | None = None,
+    types: list[EventType] | None = Query(default=None, alias='type'),
+    client_ip: str | None = None,
+    start: datetime | None = Query(default=None, alias='from'),
+    end: datetime | None = Query(default=None, alias='to'),
+    count_strategy: CountStrategy | None = Query(default=None, alias='count'),
 ):
-    paginated_data = await interactor(page=page, page_size=page_size)
+    filters = EventFilterDTO(start=start, end=end, types=types or (), secret_id=secret_id, client_ip=client_ip)
+    paginated_data = await interactor(
+        page_size=page_size,
+        page=page,
+        cursor=cursor,
+        filters=filters,
+        count_strategy=count_strategy,
+    )
 
     return EventsReponseSchema(
         total=paginated_data.total,
@@ -33,4 +61,43 @@ async def get_events(
             )
             for event in paginated_data.items
         ],
+        next_cursor=paginated_data.next_cursor,
+    )
+
+
+@router.get('/stats', response_model=EventStatsResponseSchema)
+async def get_event_stats(
+    interactor: FromDishka[GetEventStatsInteractor],
+    start: datetime,
+    end: datetime,
+    bucket: StatsBucket = StatsBucket.HOUR,
+):
+    stats = await interactor(bucket=bucket, start=start, end=end)
+
+    return EventStatsResponseSchema(
+        bucket=stats.bucket,
+        rolled_up_to=stats.rolled_up_to,
+        buckets=[EventStatsBucketSchema(bucket_start=item.bucket_start, counts=item.counts) for item in stats.buckets],
     )
+
+
+@router.get('/export', response_class=StreamingResponse)
+async def export_events(
+    interactor: FromDishka[ExportEventsInteractor],
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias='format'),
+    start: datetime | None = Query(default=None, alias='from'),
+    end: datetime | None = Query(default=None, alias='to'),
+    types: list[EventType] | None = Query(default=None, alias='type'),
+    secret_id: UUID | None = None,
+    client_ip: str | None = None,
+    gzip: bool = False,
+):
+    filters = EventFilterDTO(start=start, end=end, types=types or (), secret_id=secret_id, client_ip=client_ip)
+    batches = interactor(filters=filters)
+    body = encode_events(batches=batches, export_format=export_format)
+    headers = {'Content-Disposition': f'attachment; filename="events.{export_format}"'}
+    if gzip:
+        body = gzip_chunks(chunks=body)
+        headers['Content-Encoding'] = 'gzip'
+
+    return StreamingResponse(body, media_type=MEDIA_TYPES[export_format], headers=headers)
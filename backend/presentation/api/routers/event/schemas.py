@@ -4,6 +4,7 @@ from uuid import UUID
 from pydantic import BaseModel
 
 from backend.domain.entities.event_dm import EventType
+from backend.domain.entities.event_stats import StatsBucket
 
 
 class EventResponseSchema(BaseModel):
@@ -19,3 +20,15 @@ class EventsReponseSchema(BaseModel):
     total: int
     size: int
     events: list[EventResponseSchema]
+    next_cursor: str | None = None
+
+
+class EventStatsBucketSchema(BaseModel):
+    bucket_start: datetime
+    counts: dict[EventType, int]
+
+
+class EventStatsResponseSchema(BaseModel):
+    bucket: StatsBucket
+    rolled_up_to: datetime | None
+    buckets: list[EventStatsBucketSchema]
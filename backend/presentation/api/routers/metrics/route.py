@@ -0,0 +1,15 @@
+from dishka.integrations.fastapi import DishkaRoute, FromDishka
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from backend.infrastructure.services.metrics import MetricsRegistry
+
+router = APIRouter(
+    route_class=DishkaRoute,
+    tags=['metrics'],
+)
+
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+async def get_metrics(registry: FromDishka[MetricsRegistry]):
+    return PlainTextResponse(content=registry.render(), media_type='text/plain; version=0.0.4')
@@ -1,8 +1,17 @@
+from uuid import UUID
+
 from dishka.integrations.fastapi import DishkaRoute, FromDishka
 from fastapi import APIRouter, Request
 
-from backend.application.use_cases.secret import CreateSecretInteractor, DeleteSecretInteractor, GetSecretInteractor
+from backend.application.use_cases.secret import (
+    CreateSecretBatchInteractor,
+    CreateSecretInteractor,
+    DeleteSecretInteractor,
+    GetSecretInteractor,
+)
 from backend.presentation.api.routers.secret.schemas import (
+    CreateSecretBatchResponseSchema,
+    CreateSecretBatchSchema,
     CreateSecretResponseSchema,
     CreateSecretSchema,
     SecretResponseSchema,
@@ -19,10 +28,10 @@ router = APIRouter(
 async def get_secret(
     request: Request,
     interactor: FromDishka[GetSecretInteractor],
-    secret_key: str,
+    secret_key: UUID,
 ):
     secret = await interactor(
-        secret_id=secret_key, client_ip=request.client.host, client_user_agent=request.headers.get('user-agent')
+        secret_id=secret_key, client_ip=request.client.host, client_user_agent=request.headers.get('user-agent'),
     )
     return SecretResponseSchema(
         secret=secret,
@@ -35,19 +44,31 @@ async def create_secret(
     interactor: FromDishka[CreateSecretInteractor],
     data: CreateSecretSchema,
 ):
-    print(data.passphrase)
     secret_id = await interactor(
-        data=data.to_dto(), client_ip=request.client.host, client_user_agent=request.headers.get('user-agent')
+        data=data.to_dto(), client_ip=request.client.host, client_user_agent=request.headers.get('user-agent'),
     )
 
     return CreateSecretResponseSchema(secret_key=secret_id)
 
 
+@router.post('/batch', response_model=CreateSecretBatchResponseSchema)
+async def create_secret_batch(
+    request: Request,
+    interactor: FromDishka[CreateSecretBatchInteractor],
+    data: CreateSecretBatchSchema,
+):
+    secret_ids = await interactor(
+        data=data.to_dto(), client_ip=request.client.host, client_user_agent=request.headers.get('user-agent'),
+    )
+
+    return CreateSecretBatchResponseSchema(secret_keys=secret_ids)
+
+
 @router.delete('/{secret_key}')
 async def delete_secret(
     request: Request,
     interactor: FromDishka[DeleteSecretInteractor],
-    secret_key: str,
+    secret_key: UUID,
     passphrase: str | None = None,
 ):
     await interactor(
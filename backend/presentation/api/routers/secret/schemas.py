@@ -1,6 +1,6 @@
 from uuid import UUID
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from backend.application.dto.secret import CreateSecretDTO
 
@@ -18,9 +18,20 @@ class CreateSecretSchema(BaseModel):
         )
 
 
+class CreateSecretBatchSchema(BaseModel):
+    secrets: list[CreateSecretSchema] = Field(min_length=1, max_length=1000)
+
+    def to_dto(self) -> list[CreateSecretDTO]:
+        return [secret.to_dto() for secret in self.secrets]
+
+
 class CreateSecretResponseSchema(BaseModel):
     secret_key: UUID
 
 
+class CreateSecretBatchResponseSchema(BaseModel):
+    secret_keys: list[UUID]
+
+
 class SecretResponseSchema(BaseModel):
     secret: str
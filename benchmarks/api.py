@@ -0,0 +1,251 @@
+"""End-to-end benchmark of the HTTP API with regression baselines.
+
+Drives the real ``create_app`` over httpx's in-process ASGI transport::
+
+    python -m benchmarks.api                                  # in-memory backend, prints the results
+    python -m benchmarks.api --save-baseline                  # ... and stores them as the baseline
+    python -m benchmarks.api --compare --threshold 0.15       # exits with 1 if a scenario regressed
+    python -m benchmarks.api --backend local --scenario read_and_burn
+
+``--backend memory`` runs on the in-memory storage backend (``STORAGE_BACKEND=memory``), ``--backend log`` on the
+log-structured store in a temporary directory; ``--backend local`` uses the services configured by the usual
+environment variables, with migrations applied. Baselines are machine specific, so they are kept out of git and
+should be recorded on the machine that compares against them.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from dishka import AsyncContainer, make_async_container
+from httpx import ASGITransport, AsyncClient
+
+BASELINE_DIR = Path(__file__).parent / 'baselines'
+ALLOCATION_SAMPLE = 100
+# distinct cursor pages the event_paging scenario cycles through
+EVENT_PAGES = 20
+
+Request = tuple[str, str, dict[str, Any]]
+
+
+@dataclass(slots=True)
+class ScenarioResult:
+    requests: int
+    errors: int
+    throughput: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    alloc_peak_kib: float
+    alloc_kib_per_request: float
+
+
+async def create_secrets(client: AsyncClient, count: int, passphrase: str | None = None) -> list[str]:
+    keys = []
+    for i in range(0, count, 1000):
+        secrets = [{'secret': f'secret-{n}', 'passphrase': passphrase} for n in range(i, min(count, i + 1000))]
+        response = await client.post('/api/secret/batch', json={'secrets': secrets})
+        response.raise_for_status()
+        keys.extend(response.json()['secret_keys'])
+    return keys
+
+
+async def create_scenario(_: AsyncClient, count: int) -> list[Request]:
+    return [('POST', '/api/secret', {'json': {'secret': f'secret-{n}'}}) for n in range(count)]
+
+
+async def create_with_passphrase_scenario(_: AsyncClient, count: int) -> list[Request]:
+    return [
+        ('POST', '/api/secret', {'json': {'secret': f'secret-{n}', 'passphrase': 'passphrase'}}) for n in range(count)
+    ]
+
+
+async def read_and_burn_scenario(client: AsyncClient, count: int) -> list[Request]:
+    return [('GET', f'/api/secret/{key}', {}) for key in await create_secrets(client, count)]
+
+
+async def delete_scenario(client: AsyncClient, count: int) -> list[Request]:
+    return [('DELETE', f'/api/secret/{key}', {}) for key in await create_secrets(client, count)]
+
+
+async def event_paging_scenario(client: AsyncClient, count: int) -> list[Request]:
+    # walks the cursor chain once, then replays the collected pages
+    await create_secrets(client, 1000)
+    urls = ['/api/event?page_size=50']
+    while len(urls) < EVENT_PAGES:
+        next_cursor = (await client.get(urls[-1])).json()['next_cursor']
+        if next_cursor is None:
+            break
+        urls.append(f'/api/event?page_size=50&cursor={next_cursor}')
+    return [('GET', urls[n % len(urls)], {}) for n in range(count)]
+
+
+# scenario -> (request builder, share of --requests it runs; bcrypt is too slow for the full count)
+SCENARIOS: dict[str, tuple[Callable[[AsyncClient, int], Awaitable[list[Request]]], float]] = {
+    'create': (create_scenario, 1.0),
+    'create_with_passphrase': (create_with_passphrase_scenario, 0.1),
+    'read_and_burn': (read_and_burn_scenario, 1.0),
+    'delete': (delete_scenario, 1.0),
+    'event_paging': (event_paging_scenario, 1.0),
+}
+
+
+def make_container(backend: str) -> AsyncContainer:
+    from backend import ioc
+    from backend.main import config
+
+    if backend == 'memory':
+        infrastructure = ioc.InMemoryInfrastructureProvider()
+    elif backend == 'log':
+        infrastructure = ioc.LogStoreInfrastructureProvider()
+    else:
+        infrastructure = ioc.InfrastructureProvider()
+
+    return make_async_container(ioc.ApplicationProvider(), infrastructure, context={type(config): config})
+
+
+async def send(client: AsyncClient, requests: list[Request], concurrency: int) -> tuple[list[float], int]:
+    latencies = []
+    errors = 0
+    position = 0
+
+    async def worker() -> None:
+        nonlocal errors, position
+        while position < len(requests):
+            method, url, kwargs = requests[position]
+            position += 1
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if response.is_error:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors
+
+
+async def run_scenario(client: AsyncClient, name: str, count: int, concurrency: int) -> ScenarioResult:
+    build, share = SCENARIOS[name]
+    count = max(concurrency, int(count * share))
+
+    requests = await build(client, count)
+    started = time.perf_counter()
+    latencies, errors = await send(client, requests, concurrency)
+    elapsed = time.perf_counter() - started
+
+    # allocations are traced in a separate, smaller pass because tracemalloc slows everything down
+    sample = await build(client, min(count, ALLOCATION_SAMPLE))
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    await send(client, sample, concurrency)
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return ScenarioResult(
+        requests=len(latencies),
+        errors=errors,
+        throughput=len(latencies) / elapsed,
+        p50_ms=percentiles[49] * 1000,
+        p95_ms=percentiles[94] * 1000,
+        p99_ms=percentiles[98] * 1000,
+        alloc_peak_kib=(peak - before) / 1024,
+        alloc_kib_per_request=(after - before) / 1024 / len(sample),
+    )
+
+
+def compare(results: dict[str, ScenarioResult], baseline: dict[str, Any], threshold: float) -> list[str]:
+    regressions = []
+    for name, result in results.items():
+        base = baseline['scenarios'].get(name)
+        if base is None:
+            continue
+        if result.throughput < base['throughput'] * (1 - threshold):
+            regressions.append(f'{name}: throughput {result.throughput:.0f} req/s vs {base["throughput"]:.0f} baseline')
+        if result.p95_ms > base['p95_ms'] * (1 + threshold):
+            regressions.append(f'{name}: p95 {result.p95_ms:.2f} ms vs {base["p95_ms"]:.2f} ms baseline')
+    return regressions
+
+
+def parse_argument() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='End-to-end HTTP benchmark of the secret manager API.')
+    parser.add_argument('--backend', choices=['memory', 'log', 'local'], default='memory')
+    parser.add_argument('--scenario', choices=list(SCENARIOS), action='append', dest='scenarios')
+    parser.add_argument('--requests', type=int, default=1000, help='Requests per scenario. Default is 1000.')
+    parser.add_argument('--concurrency', type=int, default=20, help='Requests in flight. Default is 20.')
+    parser.add_argument(
+        '--baseline',
+        type=Path,
+        help='Baseline file. Default is benchmarks/baselines/api-<backend>.json.',
+    )
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline.')
+    parser.add_argument('--compare', action='store_true', help='Fail if a scenario regressed against the baseline.')
+    parser.add_argument('--threshold', type=float, default=0.15, help='Allowed regression. Default is 0.15 (15%%).')
+    return parser.parse_args()
+
+
+async def main() -> int:
+    args = parse_argument()
+    baseline_path = args.baseline or BASELINE_DIR / f'api-{args.backend}.json'
+
+    if args.backend != 'local':
+        # Config() is built at import time of backend.main
+        os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key')
+        os.environ.setdefault('LOG_STORE_PATH', tempfile.mkdtemp(prefix='secret-log-'))
+
+    from backend.main import create_app
+    from backend.presentation.api.exceptions_mapping import EXCEPTIONS_MAPPING
+    from backend.presentation.api.routers import router
+
+    container = make_container(args.backend)
+    app = create_app(router=router, container=container, exc_mapping=EXCEPTIONS_MAPPING)
+
+    results = {}
+    print(f'{"scenario":<24} {"req/s":>8} {"p50 ms":>8} {"p95 ms":>8} {"p99 ms":>8} {"errors":>7} {"KiB/req":>8}')
+    try:
+        async with AsyncClient(transport=ASGITransport(app), base_url='http://bench') as client:
+            for name in args.scenarios or SCENARIOS:
+                result = results[name] = await run_scenario(client, name, args.requests, args.concurrency)
+                print(
+                    f'{name:<24} {result.throughput:>8.0f} {result.p50_ms:>8.2f} {result.p95_ms:>8.2f} '
+                    f'{result.p99_ms:>8.2f} {result.errors:>7} {result.alloc_kib_per_request:>8.1f}',
+                )
+    finally:
+        await container.close()
+
+    status = 0
+    if args.compare:
+        regressions = compare(results, json.loads(baseline_path.read_text()), args.threshold)
+        for regression in regressions:
+            print(f'REGRESSION {regression}')
+        status = 1 if regressions else 0
+
+    if args.save_baseline:
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline = {
+            'backend': args.backend,
+            'requests': args.requests,
+            'concurrency': args.concurrency,
+            'python': platform.python_version(),
+            'cpu_count': os.cpu_count(),
+            'scenarios': {name: asdict(result) for name, result in results.items()},
+        }
+        baseline_path.write_text(json.dumps(baseline, indent=2) + '\n')
+        print(f'Baseline saved to {baseline_path}')
+
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
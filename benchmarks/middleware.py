@@ -0,0 +1,103 @@
+"""Requests per second on the secret routes with the old and the new middleware stack.
+
+Run with ``python -m benchmarks.middleware``. Interactors are stubbed so that only routing, the middlewares
+and serialization are measured; requests go through httpx's in-process ASGI transport.
+"""
+
+import asyncio
+import time
+from uuid import UUID, uuid4
+
+from dishka import Provider, Scope, make_async_container, provide
+from dishka.integrations import fastapi as fastapi_integration
+from fastapi import FastAPI, Request, Response
+from fastapi.middleware.cors import CORSMiddleware
+from httpx import ASGITransport, AsyncClient
+from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
+
+from backend.application.use_cases.secret import CreateSecretInteractor, GetSecretInteractor
+from backend.presentation.api.middlewares.no_cache import NoCacheMiddleware
+from backend.presentation.api.routers import router
+
+REQUESTS = 5000
+CONCURRENCY = 50
+
+
+class BaseHTTPNoCacheMiddleware(BaseHTTPMiddleware):
+    # the implementation NoCacheMiddleware replaced
+    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+        response = await call_next(request)
+        response.headers['Cache-Control'] = 'no-cache, no-store, must-revalidate'
+        response.headers['Pragma'] = 'no-cache'
+        response.headers['Expires'] = '0'
+        return response
+
+
+class StubInteractor:
+    async def __call__(self, **kwargs) -> str | UUID:
+        return 'secret' if 'secret_id' in kwargs else uuid4()
+
+
+class StubProvider(Provider):
+    @provide(scope=Scope.REQUEST, provides=GetSecretInteractor)
+    def get_secret_interactor(self) -> StubInteractor:
+        return StubInteractor()
+
+    @provide(scope=Scope.REQUEST, provides=CreateSecretInteractor)
+    def create_secret_interactor(self) -> StubInteractor:
+        return StubInteractor()
+
+
+def make_app(no_cache: type, cors: bool, **no_cache_options) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    if cors:
+        app.add_middleware(
+            CORSMiddleware,
+            allow_origins=['*'],
+            allow_credentials=True,
+            allow_methods=['*'],
+            allow_headers=['*'],
+        )
+    app.add_middleware(no_cache, **no_cache_options)
+    fastapi_integration.setup_dishka(make_async_container(StubProvider()), app)
+    return app
+
+
+async def measure(app: FastAPI, method: str, url: str, **kwargs) -> float:
+    async with AsyncClient(transport=ASGITransport(app), base_url='http://bench') as client:
+        headers = {'origin': 'http://example.com'}
+
+        async def worker(count: int) -> None:
+            for _ in range(count):
+                response = await client.request(method, url, headers=headers, **kwargs)
+                if 'cache-control' not in response.headers:
+                    raise RuntimeError(f'{method} {url} answered without the no-cache headers')
+
+        await worker(100)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(REQUESTS // CONCURRENCY) for _ in range(CONCURRENCY)))
+        return REQUESTS / (time.perf_counter() - started)
+
+
+async def main() -> None:
+    stacks = {
+        'before: BaseHTTPMiddleware + CORS': make_app(BaseHTTPNoCacheMiddleware, cors=True),
+        'ASGI + CORS': make_app(NoCacheMiddleware, cors=True),
+        'ASGI + security headers + CORS': make_app(NoCacheMiddleware, cors=True, security_headers=True),
+        'ASGI, CORS disabled': make_app(NoCacheMiddleware, cors=False),
+    }
+    routes = {
+        'GET /api/secret/{key}': ('GET', f'/api/secret/{uuid4()}', {}),
+        'POST /api/secret': ('POST', '/api/secret', {'json': {'secret': 'value'}}),
+    }
+
+    print(f'{"stack":<34} {"route":<22} {"req/s":>8}')
+    for route, (method, url, kwargs) in routes.items():
+        for stack, app in stacks.items():
+            rps = await measure(app, method, url, **kwargs)
+            print(f'{stack:<34} {route:<22} {rps:>8.0f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
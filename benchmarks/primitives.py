@@ -0,0 +1,294 @@
+"""Microbenchmarks of the CPU-bound primitives behind every request.
+
+Run with ``python -m benchmarks.primitives``. Each case is calibrated so that one sample takes at least
+``--min-time`` seconds, then ``--warmups`` samples are run and dropped before ``--samples`` are kept, the way pyperf
+does it. Results are per call: mean ± standard deviation and the median; cases whose relative deviation stays above
+10% are flagged, rerun those on a quieter machine before trusting them::
+
+    python -m benchmarks.primitives --group encryption --sizes 16 1048576
+    python -m benchmarks.primitives --group bcrypt --rounds 4 10 12
+    python -m benchmarks.primitives --group executor --json results.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import statistics
+import sys
+import time
+from collections.abc import Awaitable, Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from uuid import uuid4
+
+from backend.domain.entities.secret_dm import SecretDM
+from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
+from backend.infrastructure.services.bcrypt_hasher import BcryptHasher
+from backend.infrastructure.services.encryption import AesGcmCipherSuite, EncryptionService, LegacyAesCbcCipherSuite
+
+SECRET_KEY = b'benchmark-secret-key'
+PAYLOAD_SIZES = (16, 256, 4 * 1024, 64 * 1024, 1024 * 1024)
+BATCH_SIZE = 256
+BCRYPT_ROUNDS = (4, 8, 10, 12)
+GROUPS = ('encryption', 'cache_mapper', 'bcrypt', 'executor')
+UNSTABLE_DEVIATION = 0.1
+
+
+@dataclass(slots=True)
+class CaseResult:
+    group: str
+    case: str
+    param: str
+    loops: int
+    mean: float
+    stdev: float
+    median: float
+
+    @property
+    def relative_stdev(self) -> float:
+        return self.stdev / self.mean if self.mean else 0.0
+
+
+@dataclass(slots=True)
+class Case:
+    group: str
+    case: str
+    param: str
+    # runs the operation `loops` times and returns the elapsed seconds
+    timer: Callable[[int], float]
+
+
+def sync_timer(func: Callable[[], object]) -> Callable[[int], float]:
+    def timer(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - started
+
+    return timer
+
+
+def async_timer(loop: asyncio.AbstractEventLoop, func: Callable[[], Awaitable[object]]) -> Callable[[int], float]:
+    async def run(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            await func()
+        return time.perf_counter() - started
+
+    return lambda loops: loop.run_until_complete(run(loops))
+
+
+def calibrate(timer: Callable[[int], float], min_time: float) -> int:
+    loops = 1
+    while True:
+        elapsed = timer(loops)
+        if elapsed >= min_time or loops >= 1 << 24:
+            return loops
+        # jump close to the target instead of doubling all the way up
+        loops = max(loops * 2, int(loops * min_time / max(elapsed, 1e-9) * 1.2))
+
+
+def run_case(case: Case, samples: int, warmups: int, min_time: float) -> CaseResult:
+    loops = calibrate(case.timer, min_time)
+    for _ in range(warmups):
+        case.timer(loops)
+    values = [case.timer(loops) / loops for _ in range(samples)]
+    return CaseResult(
+        group=case.group,
+        case=case.case,
+        param=case.param,
+        loops=loops,
+        mean=statistics.fmean(values),
+        stdev=statistics.stdev(values) if len(values) > 1 else 0.0,
+        median=statistics.median(values),
+    )
+
+
+def format_size(size: int) -> str:
+    for unit, factor in (('MiB', 1024 * 1024), ('KiB', 1024)):
+        if size >= factor:
+            return f'{size // factor}{unit}'
+    return f'{size}B'
+
+
+def format_time(seconds: float) -> str:
+    for unit, factor in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= factor:
+            return f'{seconds / factor:.2f}{unit}'
+    return f'{seconds / 1e-9:.0f}ns'
+
+
+def make_service() -> EncryptionService:
+    secret_key = hashlib.sha256(SECRET_KEY).digest()
+    return EncryptionService(
+        suites=[AesGcmCipherSuite(secret_key=secret_key)],
+        legacy_suite=LegacyAesCbcCipherSuite(secret_key=secret_key),
+    )
+
+
+def make_secret(size: int) -> SecretDM:
+    created_at = datetime.now(UTC)
+    return SecretDM(
+        uuid=uuid4(),
+        secret=b'\x01' + os.urandom(size + 28),
+        passphrase=b'$2b$12$' + os.urandom(26).hex().encode(),
+        created_at=created_at,
+        expired_at=created_at + timedelta(hours=1),
+        is_deleted=False,
+    )
+
+
+def legacy_roundtrip(plaintext: str) -> None:
+    # rebuilds the key and the suite on every call, the way get_encription_service used to do per request
+    suite = LegacyAesCbcCipherSuite(secret_key=hashlib.sha256(SECRET_KEY).digest())
+    suite.decrypt(suite.encrypt(plaintext.encode()))
+
+
+def encryption_cases(sizes: tuple[int, ...]) -> Iterator[Case]:
+    service = make_service()
+    legacy_suite = LegacyAesCbcCipherSuite(secret_key=hashlib.sha256(SECRET_KEY).digest())
+    for size in sizes:
+        param = format_size(size)
+        plaintext = os.urandom(size // 2 + 1).hex()[:size]
+        ciphertext = service.encrypt(plaintext)
+        legacy_ciphertext = legacy_suite.encrypt(plaintext.encode())
+        batch = [plaintext] * BATCH_SIZE
+        ciphertexts = service.encrypt_many(batch)
+        yield Case('encryption', 'encrypt', param, sync_timer(lambda p=plaintext: service.encrypt(p)))
+        yield Case('encryption', 'decrypt', param, sync_timer(lambda c=ciphertext: service.decrypt(c)))
+        yield Case('encryption', 'decrypt_legacy', param, sync_timer(lambda c=legacy_ciphertext: service.decrypt(c)))
+        yield Case('encryption', 'legacy_per_call', param, sync_timer(lambda p=plaintext: legacy_roundtrip(p)))
+        # one call handles the whole batch, divide by BATCH_SIZE for the per-secret cost
+        batch_param = f'{param} x{BATCH_SIZE}'
+        yield Case('encryption', 'encrypt_many', batch_param, sync_timer(lambda b=batch: service.encrypt_many(b)))
+        yield Case('encryption', 'decrypt_many', batch_param, sync_timer(lambda c=ciphertexts: service.decrypt_many(c)))
+
+
+def cache_mapper_cases(sizes: tuple[int, ...]) -> Iterator[Case]:
+    mapper = SecretCacheDataMapper()
+    for size in sizes:
+        param = format_size(size)
+        secret = make_secret(size)
+        binary_data = mapper.entity_to_bytes(secret=secret)
+        json_data = mapper.entity_to_json(secret=secret).encode()
+        # the encode cases also show how many bytes each layout puts into Redis
+        yield Case(
+            'cache_mapper',
+            'to_bytes',
+            f'{param} -> {len(binary_data)}B',
+            sync_timer(lambda s=secret: mapper.entity_to_bytes(secret=s)),
+        )
+        yield Case(
+            'cache_mapper',
+            'from_bytes',
+            param,
+            sync_timer(lambda d=binary_data: mapper.bytes_to_entity(data=d)),
+        )
+        yield Case(
+            'cache_mapper',
+            'to_json',
+            f'{param} -> {len(json_data)}B',
+            sync_timer(lambda s=secret: mapper.entity_to_json(secret=s).encode()),
+        )
+        yield Case('cache_mapper', 'from_json', param, sync_timer(lambda d=json_data: mapper.json_to_entity(data=d)))
+
+
+def bcrypt_cases(rounds: tuple[int, ...]) -> Iterator[Case]:
+    for cost in rounds:
+        hasher = BcryptHasher(rounds=cost)
+        hashed = hasher.hash('benchmark-passphrase')
+        yield Case('bcrypt', 'hash', f'rounds={cost}', sync_timer(lambda h=hasher: h.hash('benchmark-passphrase')))
+        yield Case(
+            'bcrypt',
+            'verify',
+            f'rounds={cost}',
+            sync_timer(lambda h=hasher, d=hashed: h.verify(b'benchmark-passphrase', d)),
+        )
+
+
+def executor_cases(
+    loop: asyncio.AbstractEventLoop,
+    executor: ThreadPoolExecutor,
+    sizes: tuple[int, ...],
+) -> Iterator[Case]:
+    # the interactors push encryption to a thread pool; this shows from which payload size the handoff pays off
+    service = make_service()
+
+    async def inline(func: Callable[[], object]) -> object:
+        return func()
+
+    async def handoff(func: Callable[[], object]) -> object:
+        return await loop.run_in_executor(executor, func)
+
+    def noop() -> None:
+        pass
+
+    yield Case('executor', 'inline', 'noop', async_timer(loop, lambda: inline(noop)))
+    yield Case('executor', 'run_in_executor', 'noop', async_timer(loop, lambda: handoff(noop)))
+    for size in sizes:
+        param = f'encrypt {format_size(size)}'
+        plaintext = os.urandom(size // 2 + 1).hex()[:size]
+        encrypt = lambda p=plaintext: service.encrypt(p)  # noqa: E731
+        yield Case('executor', 'inline', param, async_timer(loop, lambda f=encrypt: inline(f)))
+        yield Case('executor', 'run_in_executor', param, async_timer(loop, lambda f=encrypt: handoff(f)))
+
+
+def parse_argument() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Microbenchmarks of encryption, bcrypt and the cache mapper.')
+    parser.add_argument('--group', choices=GROUPS, action='append', dest='groups')
+    parser.add_argument('--sizes', type=int, nargs='+', default=PAYLOAD_SIZES, help='Payload sizes in bytes.')
+    parser.add_argument('--rounds', type=int, nargs='+', default=BCRYPT_ROUNDS, help='bcrypt cost factors.')
+    parser.add_argument('--samples', type=int, default=10, help='Samples kept per case. Default is 10.')
+    parser.add_argument('--warmups', type=int, default=2, help='Samples run and dropped first. Default is 2.')
+    parser.add_argument('--min-time', type=float, default=0.1, help='Minimum seconds per sample. Default is 0.1.')
+    parser.add_argument('--json', type=Path, help='Also write the results to this file.')
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_argument()
+    sizes = tuple(args.sizes)
+    groups = args.groups or GROUPS
+
+    loop = asyncio.new_event_loop()
+    executor = ThreadPoolExecutor(max_workers=1)
+    cases = {
+        'encryption': lambda: encryption_cases(sizes),
+        'cache_mapper': lambda: cache_mapper_cases(sizes),
+        'bcrypt': lambda: bcrypt_cases(tuple(args.rounds)),
+        'executor': lambda: executor_cases(loop, executor, sizes),
+    }
+
+    results = []
+    unstable = 0
+    print(f'{"group":<13} {"case":<16} {"param":<18} {"mean":>10} {"± stdev":>10} {"median":>10} {"loops":>8}')
+    try:
+        for group in groups:
+            for case in cases[group]():
+                result = run_case(case, samples=args.samples, warmups=args.warmups, min_time=args.min_time)
+                results.append(result)
+                flag = ''
+                if result.relative_stdev > UNSTABLE_DEVIATION:
+                    unstable += 1
+                    flag = f'  unstable ({result.relative_stdev:.0%})'
+                print(
+                    f'{result.group:<13} {result.case:<16} {result.param:<18} {format_time(result.mean):>10} '
+                    f'{format_time(result.stdev):>10} {format_time(result.median):>10} {result.loops:>8}{flag}',
+                )
+    finally:
+        executor.shutdown()
+        loop.close()
+
+    if unstable:
+        print(f'{unstable} case(s) deviate by more than {UNSTABLE_DEVIATION:.0%}, the machine is probably busy')
+    if args.json:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2) + '\n')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,19 +1,37 @@
+import asyncio
 from concurrent.futures import Future, ThreadPoolExecutor
-from datetime import datetime
+from datetime import UTC, date, datetime, timedelta
 from unittest.mock import MagicMock, create_autospec
 from uuid import UUID
 
 import pytest
 from faker import Faker
 
-from backend.application import interfaces
-from backend.application.dto.secret import CreateSecretDTO
+from backend.application import exceptions as app_exceptions, interfaces
+from backend.application.dto.event import EventFilterDTO
+from backend.application.dto.secret import CreateSecretDTO, SweptSecretDTO
+from backend.application.services.pagination import PaginationService
+from backend.application.services.single_flight import SingleFlight
+from backend.application.use_cases.events import (
+    GetEventsInteractor,
+    GetEventStatsInteractor,
+    MaintainEventPartitionsInteractor,
+    RollUpEventsInteractor,
+)
 from backend.application.use_cases.secret import (
+    CheckSecretExpirationInteractor,
+    CreateSecretBatchInteractor,
     CreateSecretInteractor,
     DeleteSecretInteractor,
     GetSecretInteractor,
+    PurgeDeletedSecretsInteractor,
+    RebuildSecretFilterInteractor,
     SecretDeleteManager,
 )
+from backend.domain import exceptions as domain_exceptions
+from backend.domain.entities.event_dm import EventDM, EventType
+from backend.domain.entities.event_stats import EventCountDM, StatsBucket
+from backend.domain.entities.pagination import CountStrategy, KeysetCursor
 from backend.domain.entities.secret_dm import SecretDM
 
 pytestmark = pytest.mark.asyncio
@@ -23,10 +41,11 @@ pytestmark = pytest.mark.asyncio
 def create_secret_interactor(faker: Faker) -> CreateSecretInteractor:
     thread_pool = create_autospec(ThreadPoolExecutor)
     secret_repo = create_autospec(interfaces.SecretSaver)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
     event_repo = create_autospec(interfaces.EventSaver)
     db_session = create_autospec(interfaces.DBSession)
     encription_service = create_autospec(interfaces.EncryptionService)
-    hasher = create_autospec(interfaces.BcryptHasher)
+    hashing_engine = create_autospec(interfaces.HashingEngine)
     current_dt = MagicMock(return_value=datetime(2025, 4, 10, 10, 7, 42, 123456))
     uuid_generator = MagicMock(return_value=UUID('12345678-1234-5678-1234-567812345678'))
 
@@ -44,19 +63,65 @@ def create_secret_interactor(faker: Faker) -> CreateSecretInteractor:
     return CreateSecretInteractor(
         thread_pool=thread_pool,
         secret_saver=secret_repo,
+        secret_filter=secret_filter,
         event_saver=event_repo,
         db_session=db_session,
         encription_service=encription_service,
-        hasher=hasher,
+        hashing_engine=hashing_engine,
         current_dt=current_dt,
         uuid_generator=uuid_generator,
+        metrics=create_autospec(interfaces.Metrics),
     )
 
 
+@pytest.fixture
+def create_secret_batch_interactor() -> CreateSecretBatchInteractor:
+    thread_pool = create_autospec(ThreadPoolExecutor)
+    secret_repo = create_autospec(interfaces.SecretSaver)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
+    event_repo = create_autospec(interfaces.EventSaver)
+    db_session = create_autospec(interfaces.DBSession)
+    encription_service = create_autospec(interfaces.EncryptionService)
+    hashing_engine = create_autospec(interfaces.HashingEngine)
+    current_dt = MagicMock(return_value=datetime(2025, 4, 10, 10, 7, 42, 123456))
+    uuid_generator = MagicMock(side_effect=[UUID(int=i) for i in range(100)])
+
+    def submit_mock(func, *args, **kwargs):
+        future = Future()
+        try:
+            result = func(*args, **kwargs)
+            future.set_result(result)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    thread_pool.submit.side_effect = submit_mock
+    encription_service.encrypt_many.side_effect = lambda plaintexts: [
+        f'{plaintext}_encrypted'.encode() for plaintext in plaintexts
+    ]
+    hashing_engine.hash_many.side_effect = lambda raw_data: [f'{item}_hashed'.encode() for item in raw_data]
+
+    interactor = CreateSecretBatchInteractor(
+        thread_pool=thread_pool,
+        secret_saver=secret_repo,
+        secret_filter=secret_filter,
+        event_saver=event_repo,
+        db_session=db_session,
+        encription_service=encription_service,
+        hashing_engine=hashing_engine,
+        current_dt=current_dt,
+        uuid_generator=uuid_generator,
+        metrics=create_autospec(interfaces.Metrics),
+    )
+    interactor.encrypt_chunk_size = 2
+    return interactor
+
+
 @pytest.fixture
 def get_secret_interactor(faker: Faker) -> GetSecretInteractor:
     thread_pool = create_autospec(ThreadPoolExecutor)
-    secret_repo = create_autospec(SecretDeleteManager)
+    secret_repo = create_autospec(interfaces.SecretClaimer)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
     event_repo = create_autospec(interfaces.EventSaver)
     db_session = create_autospec(interfaces.DBSession)
     encription_service = create_autospec(interfaces.EncryptionService)
@@ -80,10 +145,11 @@ def get_secret_interactor(faker: Faker) -> GetSecretInteractor:
         passphrase=None,
         created_at=datetime(2025, 4, 10, 10, 7, 42, 123456),
         expired_at=None,
-        is_deleted=False,
+        is_deleted=True,
     )
 
-    secret_repo.get_by_id.return_value = secret_dm
+    secret_repo.claim.return_value = secret_dm
+    secret_filter.might_contain.return_value = True
 
     def mock_decrypt(ciphertext):
         return ciphertext
@@ -92,37 +158,29 @@ def get_secret_interactor(faker: Faker) -> GetSecretInteractor:
 
     return GetSecretInteractor(
         thread_pool=thread_pool,
-        secret_delete_manager=secret_repo,
+        secret_claimer=secret_repo,
+        secret_filter=secret_filter,
         event_saver=event_repo,
         db_session=db_session,
         encription_service=encription_service,
         current_dt=current_dt,
         uuid_generator=uuid_generator,
+        metrics=create_autospec(interfaces.Metrics),
+        single_flight=SingleFlight(),
     )
 
 
 @pytest.fixture
 def delete_secret_interactor(faker: Faker) -> DeleteSecretInteractor:
-    thread_pool = create_autospec(ThreadPoolExecutor)
     secret_repo = create_autospec(SecretDeleteManager)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
     event_repo = create_autospec(interfaces.EventSaver)
     db_session = create_autospec(interfaces.DBSession)
-    hasher = create_autospec(interfaces.BcryptHasher)
+    hashing_engine = create_autospec(interfaces.HashingEngine)
 
     current_dt = MagicMock(return_value=datetime(2025, 4, 10, 10, 7, 42, 123456))
     uuid_generator = MagicMock(return_value=UUID('12345678-1234-5678-1234-567812345678'))
 
-    def submit_mock(func, *args, **kwargs):
-        future = Future()
-        try:
-            result = func(*args, **kwargs)
-            future.set_result(result)
-        except Exception as e:
-            future.set_exception(e)
-        return future
-
-    thread_pool.submit.side_effect = submit_mock
-
     secret_dm = SecretDM(
         uuid=UUID('12345678-1234-5678-1234-567812345678'),
         secret=b'secret',
@@ -133,15 +191,136 @@ def delete_secret_interactor(faker: Faker) -> DeleteSecretInteractor:
     )
 
     secret_repo.get_by_id.return_value = secret_dm
+    secret_filter.might_contain.return_value = True
 
     return DeleteSecretInteractor(
-        thread_pool=thread_pool,
         secret_delete_manager=secret_repo,
+        secret_filter=secret_filter,
         event_saver=event_repo,
         db_session=db_session,
-        hasher=hasher,
+        hashing_engine=hashing_engine,
         current_dt=current_dt,
         uuid_generator=uuid_generator,
+        metrics=create_autospec(interfaces.Metrics),
+    )
+
+
+@pytest.fixture
+def check_secret_expiration_interactor() -> CheckSecretExpirationInteractor:
+    secret_repo = create_autospec(interfaces.SecretSweeper)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
+    db_session = create_autospec(interfaces.DBSession)
+
+    secret_repo.sweep_expired.side_effect = [
+        [SweptSecretDTO(uuid=UUID(int=i), expiry_lag=timedelta(seconds=i)) for i in range(2)],
+        [SweptSecretDTO(uuid=UUID(int=i), expiry_lag=timedelta(seconds=i)) for i in range(2, 4)],
+        [SweptSecretDTO(uuid=UUID(int=4), expiry_lag=timedelta(seconds=1))],
+    ]
+
+    return CheckSecretExpirationInteractor(secret_sweeper=secret_repo, secret_filter=secret_filter, session=db_session)
+
+
+@pytest.fixture
+def rebuild_secret_filter_interactor() -> RebuildSecretFilterInteractor:
+    secret_repo = create_autospec(interfaces.SecretIdLister)
+    secret_filter = create_autospec(interfaces.SecretIdFilter)
+
+    secret_repo.get_live_ids.side_effect = [
+        [UUID(int=i) for i in range(2)],
+        [UUID(int=i) for i in range(2, 4)],
+        [UUID(int=4)],
+    ]
+    secret_filter.is_ready.return_value = False
+    secret_filter.claim_rebuild.return_value = True
+
+    return RebuildSecretFilterInteractor(secret_id_lister=secret_repo, secret_filter=secret_filter)
+
+
+@pytest.fixture
+def purge_deleted_secrets_interactor() -> PurgeDeletedSecretsInteractor:
+    secret_purger = create_autospec(interfaces.SecretPurger)
+    secret_purger.purge_deleted.side_effect = [2, 2, 1]
+
+    return PurgeDeletedSecretsInteractor(
+        secret_purger=secret_purger,
+        session=create_autospec(interfaces.DBSession),
+        metrics=create_autospec(interfaces.Metrics),
+    )
+
+
+@pytest.fixture
+def maintain_event_partitions_interactor() -> MaintainEventPartitionsInteractor:
+    partition_manager = create_autospec(interfaces.EventPartitionManager)
+    session = create_autospec(interfaces.DBSession)
+    current_dt = MagicMock(return_value=datetime(2025, 11, 20, 10, 7, 42))
+
+    partition_manager.try_lock.return_value = True
+    partition_manager.create_partitions.return_value = ['events_p202602']
+    partition_manager.remove_partitions.return_value = ['events_p202410']
+
+    return MaintainEventPartitionsInteractor(
+        partition_manager=partition_manager,
+        session=session,
+        current_dt=current_dt,
+    )
+
+
+@pytest.fixture
+def roll_up_events_interactor() -> RollUpEventsInteractor:
+    rollup_updater = create_autospec(interfaces.EventRollupUpdater)
+    session = create_autospec(interfaces.DBSession)
+    current_dt = MagicMock(return_value=datetime(2025, 5, 20, 12, 31, tzinfo=UTC))
+
+    rollup_updater.try_lock.return_value = True
+    rollup_updater.get_watermark.side_effect = [
+        datetime(2025, 5, 20, 10, 0, tzinfo=UTC),
+        datetime(2025, 5, 20, 11, 0, tzinfo=UTC),
+        datetime(2025, 5, 20, 12, 0, tzinfo=UTC),
+        datetime(2025, 5, 20, 12, 30, tzinfo=UTC),
+    ]
+    rollup_updater.roll_up.return_value = 3
+
+    return RollUpEventsInteractor(rollup_updater=rollup_updater, session=session, current_dt=current_dt)
+
+
+@pytest.fixture
+def get_event_stats_interactor() -> GetEventStatsInteractor:
+    stats_reader = create_autospec(interfaces.EventStatsReader)
+    stats_reader.get_counts.return_value = [
+        EventCountDM(bucket_start=datetime(2025, 5, 20, 10, tzinfo=UTC), type=EventType.CREATE, count=4),
+        EventCountDM(bucket_start=datetime(2025, 5, 20, 10, tzinfo=UTC), type=EventType.READ, count=2),
+        EventCountDM(bucket_start=datetime(2025, 5, 20, 11, tzinfo=UTC), type=EventType.DELETE, count=1),
+    ]
+    stats_reader.get_rolled_up_to.return_value = datetime(2025, 5, 20, 11, 59, tzinfo=UTC)
+
+    return GetEventStatsInteractor(stats_reader=stats_reader)
+
+
+@pytest.fixture
+def get_events_interactor(faker: Faker) -> GetEventsInteractor:
+    event_repo = create_autospec(interfaces.EventPageReader)
+    event_repo.get_page.return_value = [
+        EventDM(
+            uuid=UUID(int=i),
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+            type=EventType.CREATE,
+            created_at=datetime(2025, 4, 10, 10, 7, 42 - i),
+            secret_id=UUID(int=i),
+        )
+        for i in range(3)
+    ]
+    event_repo.count.return_value = 10
+    count_estimator = create_autospec(interfaces.EventCountEstimator)
+    count_estimator.estimate_count.return_value = 1
+    count_cache = create_autospec(interfaces.CountCache)
+    count_cache.get.return_value = None
+
+    return GetEventsInteractor(
+        event_reader=event_repo,
+        count_estimator=count_estimator,
+        count_cache=count_cache,
+        pagination_service=PaginationService(),
     )
 
 
@@ -159,16 +338,46 @@ async def test_create_secret(create_secret_interactor: CreateSecretInteractor, f
     )
 
     result = await create_secret_interactor(data=data, client_ip=client_ip, client_user_agent=client_user_agent)
-    create_secret_interactor._hasher.hash.assert_called_once_with(raw_data=data.passphrase)
+    create_secret_interactor._hashing_engine.hash.assert_awaited_once_with(raw_data=data.passphrase)
     create_secret_interactor._encription_service.encrypt.assert_called_once_with(plaintext=data.secret)
 
     create_secret_interactor._secret_saver.save.assert_awaited_once()
     create_secret_interactor._event_saver.save.assert_awaited_once()
+    create_secret_interactor._secret_filter.add_many.assert_awaited_once_with(secret_ids=[uuid])
     create_secret_interactor._db_session.commit.assert_awaited_once()
 
     assert result == uuid
 
 
+async def test_create_secret_batch(
+    create_secret_batch_interactor: CreateSecretBatchInteractor,
+    faker: Faker,
+) -> None:
+    data = [
+        CreateSecretDTO(secret='first', passphrase='one', ttl_seconds=60),
+        CreateSecretDTO(secret='second', passphrase=None, ttl_seconds=None),
+        CreateSecretDTO(secret='third', passphrase='three', ttl_seconds=None),
+    ]
+
+    result = await create_secret_batch_interactor(data=data, client_ip=faker.ipv4(), client_user_agent='agent')
+
+    create_secret_batch_interactor._hashing_engine.hash_many.assert_awaited_once_with(raw_data=['one', 'three'])
+    assert create_secret_batch_interactor._thread_pool.submit.call_count == 2
+
+    secrets = create_secret_batch_interactor._secret_saver.save_many.await_args.kwargs['secrets']
+    events = create_secret_batch_interactor._event_saver.save_many.await_args.kwargs['events']
+    assert [secret.secret for secret in secrets] == [b'first_encrypted', b'second_encrypted', b'third_encrypted']
+    assert [secret.passphrase for secret in secrets] == [b'one_hashed', None, b'three_hashed']
+    assert secrets[0].expired_at == datetime(2025, 4, 10, 10, 8, 42, 123456)
+    assert [event.secret_id for event in events] == [secret.uuid for secret in secrets]
+    create_secret_batch_interactor._secret_filter.add_many.assert_awaited_once_with(
+        secret_ids=[secret.uuid for secret in secrets],
+    )
+    create_secret_batch_interactor._db_session.commit.assert_awaited_once()
+
+    assert result == [secret.uuid for secret in secrets]
+
+
 async def test_get_secret(get_secret_interactor: GetSecretInteractor, faker: Faker) -> None:
     uuid = get_secret_interactor._uuid_generator()
     client_ip = faker.ipv4()
@@ -176,16 +385,73 @@ async def test_get_secret(get_secret_interactor: GetSecretInteractor, faker: Fak
 
     result = await get_secret_interactor(secret_id=uuid, client_ip=client_ip, client_user_agent=client_user_agent)
 
-    get_secret_interactor._secret_delete_manager.get_by_id.assert_awaited_once_with(secret_id=uuid)
+    get_secret_interactor._secret_claimer.claim.assert_awaited_once_with(secret_id=uuid)
     get_secret_interactor._encription_service.decrypt.assert_called_once_with(ciphertext=b'secret')
 
-    get_secret_interactor._secret_delete_manager.delete.assert_awaited_once()
     get_secret_interactor._event_saver.save.assert_awaited_once()
     get_secret_interactor._db_session.commit.assert_awaited_once()
+    get_secret_interactor._secret_filter.discard_many.assert_awaited_once_with(secret_ids=[uuid])
 
     assert result == 'secret'
 
 
+async def test_get_secret_rejected_by_filter(get_secret_interactor: GetSecretInteractor, faker: Faker) -> None:
+    get_secret_interactor._secret_filter.might_contain.return_value = False
+
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await get_secret_interactor(secret_id=UUID(int=1), client_ip=faker.ipv4(), client_user_agent='agent')
+
+    get_secret_interactor._secret_claimer.claim.assert_not_awaited()
+
+
+async def test_get_secret_concurrent_duplicates(get_secret_interactor: GetSecretInteractor, faker: Faker) -> None:
+    secret_claimer = get_secret_interactor._secret_claimer
+    secret_dm = secret_claimer.claim.return_value
+
+    async def slow_claim(secret_id: UUID) -> SecretDM:
+        await asyncio.sleep(0.01)
+        return secret_dm
+
+    secret_claimer.claim.side_effect = slow_claim
+
+    results = await asyncio.gather(
+        *(
+            get_secret_interactor(secret_id=secret_dm.uuid, client_ip=faker.ipv4(), client_user_agent='bot')
+            for _ in range(3)
+        ),
+        return_exceptions=True,
+    )
+
+    assert results[0] == 'secret'
+    assert all(isinstance(result, domain_exceptions.SecretNotFound) for result in results[1:])
+    secret_claimer.claim.assert_awaited_once()
+    get_secret_interactor._encription_service.decrypt.assert_called_once()
+
+
+async def test_single_flight_hands_over_abandoned_call() -> None:
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def stuck() -> str:
+        started.set()
+        await asyncio.sleep(10)
+        return 'never'
+
+    async def quick() -> str:
+        return 'done'
+
+    leader = asyncio.create_task(single_flight.do(key=1, func=stuck))
+    await started.wait()
+    follower = asyncio.create_task(single_flight.do(key=1, func=quick))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    # the waiter runs the call itself instead of reporting a result nobody produced
+    assert await follower == ('done', False)
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
 async def test_delete_secret(delete_secret_interactor: DeleteSecretInteractor, faker: Faker) -> None:
     uuid = delete_secret_interactor._uuid_generator()
 
@@ -193,10 +459,244 @@ async def test_delete_secret(delete_secret_interactor: DeleteSecretInteractor, f
     client_user_agent = faker.user_agent()
 
     await delete_secret_interactor(
-        secret_id=uuid, passphrase=None, client_ip=client_ip, client_user_agent=client_user_agent
+        secret_id=uuid, passphrase=None, client_ip=client_ip, client_user_agent=client_user_agent,
     )
 
     delete_secret_interactor._secret_delete_manager.get_by_id.assert_awaited_once_with(secret_id=uuid)
     delete_secret_interactor._secret_delete_manager.delete.assert_awaited_once()
     delete_secret_interactor._event_saver.save.assert_awaited_once()
     delete_secret_interactor._db_session.commit.assert_awaited_once()
+    delete_secret_interactor._secret_filter.discard_many.assert_awaited_once_with(secret_ids=[uuid])
+
+
+async def test_delete_secret_lost_race(delete_secret_interactor: DeleteSecretInteractor, faker: Faker) -> None:
+    # a concurrent delete or burn got the row first, so this one must not decrement the filter again
+    delete_secret_interactor._secret_delete_manager.delete.side_effect = domain_exceptions.SecretNotFound
+
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await delete_secret_interactor(
+            secret_id=delete_secret_interactor._uuid_generator(),
+            passphrase=None,
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+        )
+
+    delete_secret_interactor._db_session.commit.assert_not_awaited()
+    delete_secret_interactor._secret_filter.discard_many.assert_not_awaited()
+
+
+async def test_get_events_first_page(get_events_interactor: GetEventsInteractor) -> None:
+    result = await get_events_interactor(page_size=2)
+
+    get_events_interactor._event_reader.get_page.assert_awaited_once_with(
+        limit=3,
+        after=None,
+        offset=0,
+        filters=EventFilterDTO(),
+    )
+    # keyset pages default to the estimate, raised to the events already shown
+    get_events_interactor._event_reader.count.assert_not_awaited()
+    assert result.total == 2
+    assert result.size == 2
+    assert [event.uuid for event in result.items] == [UUID(int=0), UUID(int=1)]
+    assert PaginationService.decode_cursor(result.next_cursor) == KeysetCursor(
+        created_at=datetime(2025, 4, 10, 10, 7, 41),
+        uuid=UUID(int=1),
+    )
+
+
+async def test_get_events_by_cursor(get_events_interactor: GetEventsInteractor) -> None:
+    cursor = KeysetCursor(created_at=datetime(2025, 4, 10, 10, 7, 43), uuid=UUID(int=7))
+
+    result = await get_events_interactor(page_size=5, page=4, cursor=PaginationService.encode_cursor(cursor))
+
+    get_events_interactor._event_reader.get_page.assert_awaited_once_with(
+        limit=6,
+        after=cursor,
+        offset=0,
+        filters=EventFilterDTO(),
+    )
+    assert len(result.items) == 3
+    assert result.next_cursor is None
+
+
+async def test_get_events_with_filters(get_events_interactor: GetEventsInteractor) -> None:
+    secret_id = UUID(int=42)
+    filters = EventFilterDTO(start=datetime(2025, 4, 10), types=[EventType.READ], secret_id=secret_id)
+
+    await get_events_interactor(page_size=2, filters=filters)
+
+    expected = EventFilterDTO(start=datetime(2025, 4, 10, tzinfo=UTC), types=[EventType.READ], secret_id=secret_id)
+    get_events_interactor._event_reader.get_page.assert_awaited_once_with(
+        limit=3,
+        after=None,
+        offset=0,
+        filters=expected,
+    )
+    get_events_interactor._count_estimator.estimate_count.assert_awaited_once_with(filters=expected)
+
+
+async def test_get_events_offset_page_exact_total(get_events_interactor: GetEventsInteractor) -> None:
+    result = await get_events_interactor(page_size=2, page=2)
+
+    get_events_interactor._event_reader.count.assert_awaited_once_with(filters=EventFilterDTO())
+    assert result.total == 10
+
+
+async def test_get_events_estimated_total(get_events_interactor: GetEventsInteractor) -> None:
+    result = await get_events_interactor(page_size=2, page=3, count_strategy=CountStrategy.ESTIMATED)
+
+    get_events_interactor._event_reader.count.assert_not_awaited()
+    # the estimate of 1 is raised to the events already paged through
+    assert result.total == 6
+
+
+async def test_get_events_cached_total(get_events_interactor: GetEventsInteractor) -> None:
+    count_cache = get_events_interactor._count_cache
+
+    result = await get_events_interactor(page_size=2, count_strategy=CountStrategy.CACHED)
+
+    assert result.total == 10
+    key = count_cache.get.await_args.kwargs['key']
+    count_cache.set.assert_awaited_once_with(key=key, value=10)
+
+    count_cache.get.return_value = 12
+    result = await get_events_interactor(page_size=2, count_strategy=CountStrategy.CACHED)
+
+    assert result.total == 12
+    get_events_interactor._event_reader.count.assert_awaited_once()
+
+
+async def test_get_events_invalid_cursor(get_events_interactor: GetEventsInteractor) -> None:
+    with pytest.raises(app_exceptions.InvalidCursorError):
+        await get_events_interactor(page_size=5, cursor='not-a-cursor')
+
+
+async def test_check_secret_expiration(check_secret_expiration_interactor: CheckSecretExpirationInteractor) -> None:
+    report = await check_secret_expiration_interactor(chunk_size=2)
+
+    assert check_secret_expiration_interactor._secret_sweeper.sweep_expired.await_count == 3
+    assert check_secret_expiration_interactor._session.commit.await_count == 3
+    assert report.swept == 5
+    assert report.chunks == 3
+    assert report.max_lag == timedelta(seconds=3)
+    assert check_secret_expiration_interactor._secret_filter.discard_many.await_count == 3
+
+
+async def test_rebuild_secret_filter(rebuild_secret_filter_interactor: RebuildSecretFilterInteractor) -> None:
+    added = await rebuild_secret_filter_interactor(chunk_size=2)
+
+    rebuild_secret_filter_interactor._secret_id_lister.get_live_ids.assert_awaited_with(limit=2, after=UUID(int=3))
+    assert rebuild_secret_filter_interactor._secret_filter.add_many.await_count == 3
+    rebuild_secret_filter_interactor._secret_filter.mark_ready.assert_awaited_once()
+    assert added == 5
+
+
+async def test_rebuild_secret_filter_claimed_elsewhere(
+    rebuild_secret_filter_interactor: RebuildSecretFilterInteractor,
+) -> None:
+    rebuild_secret_filter_interactor._secret_filter.claim_rebuild.return_value = False
+
+    added = await rebuild_secret_filter_interactor(chunk_size=2)
+
+    assert added == 0
+    rebuild_secret_filter_interactor._secret_filter.add_many.assert_not_awaited()
+    rebuild_secret_filter_interactor._secret_filter.mark_ready.assert_not_awaited()
+
+
+async def test_purge_deleted_secrets(purge_deleted_secrets_interactor: PurgeDeletedSecretsInteractor) -> None:
+    report = await purge_deleted_secrets_interactor(grace=timedelta(days=1), batch_size=2)
+
+    purge_deleted_secrets_interactor._secret_purger.purge_deleted.assert_awaited_with(grace=timedelta(days=1), limit=2)
+    assert purge_deleted_secrets_interactor._session.commit.await_count == 3
+    assert report.purged == 5
+    assert report.batches == 3
+
+
+async def test_purge_deleted_secrets_stops_at_max_batches(
+    purge_deleted_secrets_interactor: PurgeDeletedSecretsInteractor,
+) -> None:
+    report = await purge_deleted_secrets_interactor(grace=timedelta(days=1), batch_size=2, max_batches=1)
+
+    assert report.purged == 2
+    assert report.batches == 1
+
+
+async def test_maintain_event_partitions(
+    maintain_event_partitions_interactor: MaintainEventPartitionsInteractor,
+) -> None:
+    report = await maintain_event_partitions_interactor(months_ahead=3, retention_months=12)
+
+    partition_manager = maintain_event_partitions_interactor._partition_manager
+    partition_manager.create_partitions.assert_awaited_once_with(
+        months=[date(2025, 11, 1), date(2025, 12, 1), date(2026, 1, 1), date(2026, 2, 1)],
+    )
+    partition_manager.remove_partitions.assert_awaited_once_with(before=date(2024, 11, 1), detach=False)
+    maintain_event_partitions_interactor._session.commit.assert_awaited_once()
+    assert report.created == ['events_p202602']
+    assert report.removed == ['events_p202410']
+
+
+async def test_maintain_event_partitions_without_lock(
+    maintain_event_partitions_interactor: MaintainEventPartitionsInteractor,
+) -> None:
+    maintain_event_partitions_interactor._partition_manager.try_lock.return_value = False
+
+    report = await maintain_event_partitions_interactor(months_ahead=3, retention_months=12)
+
+    maintain_event_partitions_interactor._partition_manager.create_partitions.assert_not_awaited()
+    assert report.created == []
+    assert report.removed == []
+
+
+async def test_roll_up_events(roll_up_events_interactor: RollUpEventsInteractor) -> None:
+    written = await roll_up_events_interactor(delay=timedelta(minutes=1))
+
+    rollup_updater = roll_up_events_interactor._rollup_updater
+    assert [call.kwargs for call in rollup_updater.roll_up.await_args_list] == [
+        {'start': datetime(2025, 5, 20, 10, 0, tzinfo=UTC), 'end': datetime(2025, 5, 20, 11, 0, tzinfo=UTC)},
+        {'start': datetime(2025, 5, 20, 11, 0, tzinfo=UTC), 'end': datetime(2025, 5, 20, 12, 0, tzinfo=UTC)},
+        {'start': datetime(2025, 5, 20, 12, 0, tzinfo=UTC), 'end': datetime(2025, 5, 20, 12, 30, tzinfo=UTC)},
+    ]
+    rollup_updater.set_watermark.assert_awaited_with(watermark=datetime(2025, 5, 20, 12, 30, tzinfo=UTC))
+    assert roll_up_events_interactor._session.commit.await_count == 4
+    assert written == 9
+
+
+async def test_roll_up_events_without_lock(roll_up_events_interactor: RollUpEventsInteractor) -> None:
+    roll_up_events_interactor._rollup_updater.try_lock.return_value = False
+
+    assert await roll_up_events_interactor(delay=timedelta(minutes=1)) == 0
+    roll_up_events_interactor._rollup_updater.roll_up.assert_not_awaited()
+
+
+async def test_get_event_stats(get_event_stats_interactor: GetEventStatsInteractor) -> None:
+    stats = await get_event_stats_interactor(
+        bucket=StatsBucket.HOUR,
+        start=datetime(2025, 5, 20, 10),
+        end=datetime(2025, 5, 20, 12),
+    )
+
+    get_event_stats_interactor._stats_reader.get_counts.assert_awaited_once_with(
+        bucket=StatsBucket.HOUR,
+        start=datetime(2025, 5, 20, 10, tzinfo=UTC),
+        end=datetime(2025, 5, 20, 12, tzinfo=UTC),
+    )
+    assert [bucket.counts for bucket in stats.buckets] == [
+        {EventType.READ: 2, EventType.CREATE: 4, EventType.DELETE: 0},
+        {EventType.READ: 0, EventType.CREATE: 0, EventType.DELETE: 1},
+    ]
+    assert stats.rolled_up_to == datetime(2025, 5, 20, 11, 59, tzinfo=UTC)
+
+
+@pytest.mark.parametrize(
+    ('bucket', 'end'),
+    [(StatsBucket.HOUR, datetime(2025, 5, 20, 10)), (StatsBucket.MINUTE, datetime(2025, 5, 22, 10))],
+)
+async def test_get_event_stats_invalid_range(
+    get_event_stats_interactor: GetEventStatsInteractor,
+    bucket: StatsBucket,
+    end: datetime,
+) -> None:
+    with pytest.raises(app_exceptions.InvalidStatsRangeError):
+        await get_event_stats_interactor(bucket=bucket, start=datetime(2025, 5, 20, 10), end=end)
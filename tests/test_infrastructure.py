@@ -1,30 +1,87 @@
-import json
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import os
+from collections.abc import Iterator
+from datetime import UTC, date, datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
 import redis.asyncio as redis
+from cryptography.exceptions import InvalidTag
 from faker import Faker
-from sqlalchemy import insert, select
+from sqlalchemy import insert, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from backend.application import exceptions as app_exceptions
+from backend.application.dto.event import EventFilterDTO
+from backend.domain import exceptions as domain_exceptions
 from backend.domain.entities.event_dm import EventDM, EventType
+from backend.domain.entities.event_stats import StatsBucket
+from backend.domain.entities.pagination import KeysetCursor
 from backend.domain.entities.secret_dm import SecretDM
 from backend.infrastructure.mapper.secret_cache import SecretCacheDataMapper
 from backend.infrastructure.models import Event, Secret
-from backend.infrastructure.repositories.event import EventRepository
+from backend.infrastructure.repositories.event import EventExportRepository, EventRepository
+from backend.infrastructure.repositories.event_buffer import BufferedEventSaver
+from backend.infrastructure.repositories.event_partitions import EventPartitionRepository
+from backend.infrastructure.repositories.event_rollups import EventRollupRepository
+from backend.infrastructure.repositories.log_store import IndexEntry, LogStructuredStore, MmapIndex
+from backend.infrastructure.repositories.memory import InMemoryEventRepository, InMemorySecretRepository
 from backend.infrastructure.repositories.secret import SecretRepository
+from backend.infrastructure.services.bcrypt_hasher import BcryptHasher
+from backend.infrastructure.services.count_cache import InMemoryCountCache
+from backend.infrastructure.services.encryption import (
+    AesGcmCipherSuite,
+    EncryptionService,
+    LegacyAesCbcCipherSuite,
+)
+from backend.infrastructure.services.hashing_engine import ProcessPoolHashingEngine
+from backend.infrastructure.services.lease import RedisLease, ShardedLease
+from backend.infrastructure.services.metrics import (
+    InstrumentedThreadPoolExecutor,
+    create_metrics_registry,
+    instrument_repository,
+)
+from backend.infrastructure.services.periodic_task import PeriodicScheduler, ScheduleMode
+from backend.infrastructure.services.secret_filter import RedisSecretIdFilter
 
 pytestmark = pytest.mark.asyncio
 
 
 @pytest.fixture
 async def secret_repo(
-    session: AsyncSession, redis_client: redis.Redis, data_mapper: SecretCacheDataMapper
+    session: AsyncSession, redis_client: redis.Redis, data_mapper: SecretCacheDataMapper,
 ) -> SecretRepository:
     return SecretRepository(session=session, redis_client=redis_client, data_mapper=data_mapper)
 
 
+@pytest.fixture(scope='session')
+def secret_key() -> bytes:
+    return hashlib.sha256(b'test-secret-key').digest()
+
+
+@pytest.fixture(scope='session')
+def encryption_service(secret_key: bytes) -> EncryptionService:
+    return EncryptionService(
+        suites=[AesGcmCipherSuite(secret_key=secret_key)],
+        legacy_suite=LegacyAesCbcCipherSuite(secret_key=secret_key),
+    )
+
+
+@pytest.fixture
+def hashing_engine() -> Iterator[ProcessPoolHashingEngine]:
+    engine = ProcessPoolHashingEngine(hasher=BcryptHasher(), workers=1, queue_size=1, retry_after=3)
+    yield engine
+    engine.shutdown()
+
+
+@pytest.fixture
+def secret_filter(redis_client: redis.Redis) -> RedisSecretIdFilter:
+    return RedisSecretIdFilter(redis_client=redis_client, key='test-secret-filter', capacity=1000, error_rate=0.01)
+
+
 @pytest.fixture
 async def event_repo(session: AsyncSession) -> EventRepository:
     return EventRepository(session=session)
@@ -34,10 +91,11 @@ async def test_save_secret_without_optional_params(
     session: AsyncSession,
     redis_client: redis.Redis,
     secret_repo: SecretRepository,
+    data_mapper: SecretCacheDataMapper,
     faker: Faker,
 ) -> None:
     secret_dm = SecretDM(
-        uuid=str(uuid4()),
+        uuid=uuid4(),
         secret=faker.pystr(min_chars=10).encode(),
         passphrase=None,
         created_at=datetime.now(),
@@ -60,21 +118,14 @@ async def test_save_secret_without_optional_params(
     cache_result = await redis_client.get(str(secret_dm.uuid))
     assert cache_result is not None
 
-    cache_json = json.loads(cache_result)
-    cache_secret = cache_json['secret'].encode() if cache_json['secret'] else None
-    cache_passphrase = cache_json['passphrase'].encode() if cache_json['passphrase'] else None
-    cache_created_at = (
-        datetime.fromisoformat(cache_json['created_at']) if isinstance(cache_json['created_at'], str) else None
-    )
-    cache_expired_at = (
-        datetime.fromisoformat(cache_json['expired_at']) if isinstance(cache_json['expired_at'], str) else None
-    )
+    cache_secret = data_mapper.bytes_to_entity(data=cache_result)
 
-    assert cache_secret == secret_dm.secret
-    assert cache_passphrase == secret_dm.passphrase
-    assert cache_created_at == secret_dm.created_at
-    assert cache_expired_at == secret_dm.expired_at
-    assert cache_json['is_deleted'] == secret_dm.is_deleted
+    assert cache_secret.uuid == secret_dm.uuid
+    assert cache_secret.secret == secret_dm.secret
+    assert cache_secret.passphrase == secret_dm.passphrase
+    assert cache_secret.created_at == secret_dm.created_at
+    assert cache_secret.expired_at == secret_dm.expired_at
+    assert cache_secret.is_deleted == secret_dm.is_deleted
 
     ttl = await redis_client.ttl(str(secret_dm.uuid))
     assert 250 <= ttl <= 300
@@ -84,10 +135,11 @@ async def test_save_secret_with_optional_params(
     session: AsyncSession,
     redis_client: redis.Redis,
     secret_repo: SecretRepository,
+    data_mapper: SecretCacheDataMapper,
     faker: Faker,
 ) -> None:
     secret_dm = SecretDM(
-        uuid=str(uuid4()),
+        uuid=uuid4(),
         secret=faker.pystr(min_chars=10).encode(),
         passphrase=faker.pystr(min_chars=10).encode(),
         created_at=datetime.now(),
@@ -110,26 +162,48 @@ async def test_save_secret_with_optional_params(
     cache_result = await redis_client.get(str(secret_dm.uuid))
     assert cache_result is not None
 
-    cache_json = json.loads(cache_result)
-    cache_secret = cache_json['secret'].encode() if cache_json['secret'] else None
-    cache_passphrase = cache_json['passphrase'].encode() if cache_json['passphrase'] else None
-    cache_created_at = (
-        datetime.fromisoformat(cache_json['created_at']) if isinstance(cache_json['created_at'], str) else None
-    )
-    cache_expired_at = (
-        datetime.fromisoformat(cache_json['expired_at']) if isinstance(cache_json['expired_at'], str) else None
-    )
+    cache_secret = data_mapper.bytes_to_entity(data=cache_result)
 
-    assert cache_secret == secret_dm.secret
-    assert cache_passphrase == secret_dm.passphrase
-    assert cache_created_at == secret_dm.created_at
-    assert cache_expired_at == secret_dm.expired_at
-    assert cache_json['is_deleted'] == secret_dm.is_deleted
+    assert cache_secret.uuid == secret_dm.uuid
+    assert cache_secret.secret == secret_dm.secret
+    assert cache_secret.passphrase == secret_dm.passphrase
+    assert cache_secret.created_at == secret_dm.created_at
+    assert cache_secret.expired_at == secret_dm.expired_at
+    assert cache_secret.is_deleted == secret_dm.is_deleted
 
     ttl = await redis_client.ttl(str(secret_dm.uuid))
     assert 250 <= ttl <= 300
 
 
+async def test_save_many_secrets(
+    session: AsyncSession,
+    redis_client: redis.Redis,
+    secret_repo: SecretRepository,
+    data_mapper: SecretCacheDataMapper,
+    faker: Faker,
+) -> None:
+    secrets = [
+        SecretDM(
+            uuid=uuid4(),
+            secret=faker.pystr(min_chars=10).encode(),
+            passphrase=None,
+            created_at=datetime.now(),
+            expired_at=None,
+            is_deleted=False,
+        )
+        for _ in range(3)
+    ]
+
+    await secret_repo.save_many(secrets=secrets)
+
+    result = await session.execute(select(Secret.uuid).where(Secret.uuid.in_([secret.uuid for secret in secrets])))
+    assert {row.uuid for row in result.fetchall()} == {secret.uuid for secret in secrets}
+
+    for secret in secrets:
+        cache_result = await redis_client.get(str(secret.uuid))
+        assert data_mapper.bytes_to_entity(data=cache_result) == secret
+
+
 async def test_delete_secret(
     session: AsyncSession,
     redis_client: redis.Redis,
@@ -153,7 +227,7 @@ async def test_delete_secret(
             created_at=secret_dm.created_at,
             expired_at=secret_dm.expired_at,
             is_deleted=secret_dm.is_deleted,
-        )
+        ),
     )
 
     secret_dm.is_deleted = True
@@ -164,6 +238,202 @@ async def test_delete_secret(
     assert secret.is_deleted is True
     cache_result = await redis_client.get(str(secret_dm.uuid))
     assert cache_result is None
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await secret_repo.delete(secret=secret_dm)
+
+
+async def test_claim_secret(
+    session: AsyncSession,
+    redis_client: redis.Redis,
+    secret_repo: SecretRepository,
+    faker: Faker,
+):
+    secret_dm = SecretDM(
+        uuid=uuid4(),
+        secret=faker.pystr(min_chars=10).encode(),
+        passphrase=None,
+        created_at=datetime.now(),
+        expired_at=None,
+        is_deleted=False,
+    )
+    await secret_repo.save(secret=secret_dm)
+
+    claimed = await secret_repo.claim(secret_id=secret_dm.uuid)
+
+    assert claimed.uuid == secret_dm.uuid
+    assert claimed.secret == secret_dm.secret
+    assert claimed.is_deleted is True
+    assert await redis_client.get(str(secret_dm.uuid)) is None
+
+    result = await session.execute(select(Secret.is_deleted).where(Secret.uuid == secret_dm.uuid))
+    assert result.scalar_one() is True
+
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await secret_repo.claim(secret_id=secret_dm.uuid)
+
+
+async def test_claim_secret_without_cache(
+    session: AsyncSession,
+    secret_repo: SecretRepository,
+    faker: Faker,
+):
+    secret_id = uuid4()
+    secret = faker.pystr(min_chars=10).encode()
+    await session.execute(
+        insert(Secret).values(
+            uuid=secret_id,
+            secret=secret,
+            passphrase=None,
+            created_at=datetime.now(),
+            expired_at=None,
+            is_deleted=False,
+        ),
+    )
+
+    claimed = await secret_repo.claim(secret_id=secret_id)
+
+    assert claimed.secret == secret
+    assert claimed.is_deleted is True
+
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await secret_repo.claim(secret_id=secret_id)
+
+
+async def test_sweep_expired_secrets(
+    session: AsyncSession,
+    redis_client: redis.Redis,
+    secret_repo: SecretRepository,
+    faker: Faker,
+):
+    expired_ids = [str(uuid4()) for _ in range(3)]
+    live_id = str(uuid4())
+
+    for secret_id, expired_at in [
+        *((secret_id, datetime.now() - timedelta(minutes=5)) for secret_id in expired_ids),
+        (live_id, datetime.now() + timedelta(minutes=5)),
+    ]:
+        await session.execute(
+            insert(Secret).values(
+                uuid=secret_id,
+                secret=faker.pystr(min_chars=10).encode(),
+                passphrase=None,
+                created_at=datetime.now(),
+                expired_at=expired_at,
+                is_deleted=False,
+            ),
+        )
+        await redis_client.set(name=secret_id, value=b'cached')
+
+    first_chunk = await secret_repo.sweep_expired(limit=2)
+    second_chunk = await secret_repo.sweep_expired(limit=2)
+
+    assert len(first_chunk) == 2
+    assert len(second_chunk) == 1
+    assert {str(secret.uuid) for secret in [*first_chunk, *second_chunk]} == set(expired_ids)
+    assert all(secret.expiry_lag >= timedelta(minutes=5) for secret in [*first_chunk, *second_chunk])
+
+    result = await session.execute(select(Secret.uuid).where(Secret.is_deleted.is_(False)))
+    assert [str(row.uuid) for row in result.fetchall()] == [live_id]
+    assert await redis_client.exists(*expired_ids) == 0
+    assert await redis_client.exists(live_id) == 1
+
+
+async def test_get_live_secret_ids(session: AsyncSession, secret_repo: SecretRepository, faker: Faker) -> None:
+    live_ids = sorted(uuid4() for _ in range(3))
+    deleted_id = uuid4()
+
+    for secret_id in [*live_ids, deleted_id]:
+        await session.execute(
+            insert(Secret).values(
+                uuid=secret_id,
+                secret=faker.pystr(min_chars=10).encode(),
+                passphrase=None,
+                created_at=datetime.now(),
+                expired_at=None,
+                is_deleted=secret_id == deleted_id,
+            ),
+        )
+
+    first_chunk = await secret_repo.get_live_ids(limit=2)
+    second_chunk = await secret_repo.get_live_ids(limit=2, after=first_chunk[-1])
+
+    assert [*first_chunk, *second_chunk] == live_ids
+
+
+async def test_secret_filter(secret_filter: RedisSecretIdFilter) -> None:
+    live_ids = [uuid4() for _ in range(100)]
+    burned_id = uuid4()
+
+    await secret_filter.add_many(secret_ids=[*live_ids, burned_id])
+    assert await secret_filter.might_contain(secret_id=uuid4()) is True
+
+    await secret_filter.mark_ready()
+    await secret_filter.discard_many(secret_ids=[burned_id])
+
+    assert all([await secret_filter.might_contain(secret_id=secret_id) for secret_id in live_ids])
+    unknown_hits = [await secret_filter.might_contain(secret_id=uuid4()) for _ in range(200)]
+    assert sum(unknown_hits) < 20
+
+
+async def test_secret_filter_evicted(secret_filter: RedisSecretIdFilter, redis_client: redis.Redis) -> None:
+    live_id = uuid4()
+    assert await secret_filter.claim_rebuild() is True
+    await secret_filter.add_many(secret_ids=[live_id])
+    await secret_filter.mark_ready()
+    assert await secret_filter.is_ready() is True
+
+    # the ready marker lives in the same key, so losing the filter never leaves it answering "absent"
+    await redis_client.delete('test-secret-filter')
+    await secret_filter.add_many(secret_ids=[uuid4()])
+
+    assert await secret_filter.is_ready() is False
+    assert await secret_filter.might_contain(secret_id=live_id) is True
+
+
+async def test_sweep_expired_secrets_by_shard(session: AsyncSession, secret_repo: SecretRepository, faker: Faker):
+    expired_ids = [uuid4() for _ in range(8)]
+
+    for secret_id in expired_ids:
+        await session.execute(
+            insert(Secret).values(
+                uuid=secret_id,
+                secret=faker.pystr(min_chars=10).encode(),
+                passphrase=None,
+                created_at=datetime.now(),
+                expired_at=datetime.now() - timedelta(minutes=5),
+                is_deleted=False,
+            ),
+        )
+
+    swept = {shard: await secret_repo.sweep_expired(limit=100, shard=shard, shards=2) for shard in range(2)}
+
+    assert {secret.uuid for secret in swept[0]} == {uuid for uuid in expired_ids if uuid.bytes[15] % 2 == 0}
+    assert {secret.uuid for secret in swept[1]} == {uuid for uuid in expired_ids if uuid.bytes[15] % 2 == 1}
+
+
+async def test_redis_lease(redis_client: redis.Redis) -> None:
+    first = RedisLease(redis_client=redis_client, key='lease:test', ttl=5, holder='first')
+    second = RedisLease(redis_client=redis_client, key='lease:test', ttl=5, holder='second')
+
+    assert await first.acquire() is True
+    assert await second.acquire() is False
+    assert await first.acquire() is True
+    assert await second.renew() is False
+
+    await second.release()
+    assert await second.acquire() is False
+
+    await first.release()
+    assert await second.acquire() is True
+
+
+async def test_sharded_lease(redis_client: redis.Redis) -> None:
+    lease = ShardedLease(redis_client=redis_client, name='test', shards=4, ttl=5)
+    await RedisLease(redis_client=redis_client, key='lease:test:2', ttl=5, holder='other').acquire()
+
+    claimed = [shard async for shard in lease.claim()]
+
+    assert sorted(claimed) == [0, 1, 3]
 
 
 async def test_save_event(
@@ -191,3 +461,722 @@ async def test_save_event(
     assert event.type == event_dm.type
     assert event.created_at == event_dm.created_at
     assert str(event.secret_id) == event_dm.secret_id
+
+
+async def test_purge_deleted_secrets(secret_repo: SecretRepository, session: AsyncSession, faker: Faker) -> None:
+    now = datetime.now()
+    secrets = [
+        Secret(
+            uuid=uuid4(),
+            secret=faker.pystr().encode(),
+            passphrase=None,
+            created_at=now,
+            expired_at=None,
+            is_deleted=is_deleted,
+            deleted_at=deleted_at,
+        )
+        for is_deleted, deleted_at in (
+            (True, now - timedelta(days=2)),
+            (True, None),
+            (True, now),
+            (False, None),
+        )
+    ]
+    session.add_all(secrets)
+    await session.flush()
+
+    assert await secret_repo.purge_deleted(grace=timedelta(days=1), limit=1) == 1
+    assert await secret_repo.purge_deleted(grace=timedelta(days=1), limit=10) == 1
+    assert await secret_repo.purge_deleted(grace=timedelta(days=1), limit=10) == 0
+
+    remaining = await session.execute(select(Secret.uuid))
+    assert set(remaining.scalars()) == {secrets[2].uuid, secrets[3].uuid}
+
+
+async def test_event_partitions(session: AsyncSession) -> None:
+    repository = EventPartitionRepository(session=session)
+
+    assert await repository.try_lock() is True
+    assert await repository.create_partitions(months=[date(2020, 1, 1), date(2020, 2, 1)]) == [
+        'events_p202001',
+        'events_p202002',
+    ]
+    assert await repository.create_partitions(months=[date(2020, 2, 1)]) == []
+    assert await repository.remove_partitions(before=date(2020, 2, 1)) == ['events_p202001']
+
+
+async def test_event_partitions_skip_covered_months(session: AsyncSession, faker: Faker) -> None:
+    repository = EventPartitionRepository(session=session)
+    # the migration leaves the old table as a partition of everything before the next month
+    await session.execute(
+        text("CREATE TABLE events_legacy PARTITION OF events FOR VALUES FROM (MINVALUE) TO ('2019-02-01')"),
+    )
+    session.add(
+        Event(
+            uuid=str(uuid4()),
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+            type=EventType.CREATE,
+            created_at=datetime(2019, 3, 5),
+            secret_id=str(uuid4()),
+        ),
+    )
+    await session.flush()
+
+    months = [date(2019, 1, 1), date(2019, 2, 1), date(2019, 3, 1), date(2019, 4, 1)]
+    # January is covered by the legacy partition and March already has rows in the default one
+    assert await repository.create_partitions(months=months) == ['events_p201902', 'events_p201904']
+    assert await repository.create_partitions(months=months) == []
+
+
+async def test_event_export(session: AsyncSession, faker: Faker) -> None:
+    started = datetime(2025, 5, 20, 10, tzinfo=UTC)
+    events = [
+        EventDM(
+            uuid=uuid4(),
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+            type=EventType.DELETE if i % 3 == 0 else EventType.CREATE,
+            created_at=started + timedelta(seconds=i),
+            secret_id=uuid4(),
+        )
+        for i in range(7)
+    ]
+    await EventRepository(session=session).save_many(events=events)
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = session
+    repository = EventExportRepository(session_maker=session_maker, batch_size=2)
+
+    filters = EventFilterDTO(start=started, end=started + timedelta(seconds=6), types=[EventType.CREATE])
+    batches = [batch async for batch in repository.export(filters=filters)]
+
+    assert [len(batch) for batch in batches] == [2, 2]
+    assert [event.uuid for batch in batches for event in batch] == [events[i].uuid for i in (1, 2, 4, 5)]
+
+
+async def test_event_count_estimate(session: AsyncSession, faker: Faker) -> None:
+    repository = EventRepository(session=session)
+    secret_id = uuid4()
+    await repository.save_many(events=[make_event(faker) for _ in range(3)])
+
+    assert await repository.estimate_count() >= 0
+    assert await repository.estimate_count(filters=EventFilterDTO(secret_id=secret_id)) >= 0
+
+
+async def test_in_memory_count_cache() -> None:
+    cache = InMemoryCountCache(ttl=60)
+
+    assert await cache.get(key='events') is None
+    await cache.set(key='events', value=7)
+    assert await cache.get(key='events') == 7
+
+    expired = InMemoryCountCache(ttl=0)
+    await expired.set(key='events', value=7)
+    assert await expired.get(key='events') is None
+
+
+async def test_event_rollups(session: AsyncSession, faker: Faker) -> None:
+    event_repo = EventRepository(session=session)
+    started = datetime(2025, 5, 20, 10, 58, tzinfo=UTC)
+    await event_repo.save_many(
+        events=[
+            EventDM(
+                uuid=uuid4(),
+                client_ip=faker.ipv4(),
+                client_user_agent=faker.user_agent(),
+                type=EventType.CREATE if i % 2 else EventType.READ,
+                created_at=started + timedelta(minutes=i),
+                secret_id=uuid4(),
+            )
+            for i in range(4)
+        ],
+    )
+    repository = EventRollupRepository(session=session)
+
+    assert await repository.try_lock() is True
+    assert await repository.get_watermark() is None
+    assert await repository.get_first_event_time() == started
+    # two windows cut through the same hour and day buckets, their counts have to add up
+    await repository.roll_up(start=started, end=started + timedelta(minutes=2))
+    await repository.roll_up(start=started + timedelta(minutes=2), end=started + timedelta(minutes=4))
+    await repository.set_watermark(watermark=started + timedelta(minutes=4))
+
+    hourly = await repository.get_counts(
+        bucket=StatsBucket.HOUR,
+        start=started - timedelta(hours=1),
+        end=started + timedelta(hours=2),
+    )
+    assert [(row.bucket_start.hour, row.type, row.count) for row in hourly] == [
+        (10, EventType.READ, 1),
+        (10, EventType.CREATE, 1),
+        (11, EventType.READ, 1),
+        (11, EventType.CREATE, 1),
+    ]
+    daily = await repository.get_counts(
+        bucket=StatsBucket.DAY,
+        start=started - timedelta(days=1),
+        end=started + timedelta(days=1),
+    )
+    assert sum(row.count for row in daily) == 4
+    assert await repository.get_rolled_up_to() == started + timedelta(minutes=4)
+
+
+async def test_hashing_engine(hashing_engine: ProcessPoolHashingEngine, faker: Faker) -> None:
+    passphrase = faker.pystr(min_chars=10)
+
+    hashed_passphrase = await hashing_engine.hash(raw_data=passphrase)
+
+    assert await hashing_engine.verify(raw_data=passphrase.encode(), hashed_data=hashed_passphrase) is True
+    assert await hashing_engine.verify(raw_data=b'wrong', hashed_data=hashed_passphrase) is False
+
+    stats = hashing_engine.stats()
+    assert stats.completed == 3
+    assert stats.in_flight == 0
+    assert stats.wait_time_max >= 0
+
+
+async def test_bcrypt_hasher_rounds(faker: Faker) -> None:
+    passphrase = faker.pystr(min_chars=10)
+
+    hashed_passphrase = BcryptHasher(rounds=4).hash(raw_data=passphrase)
+
+    assert hashed_passphrase.startswith(b'$2b$04$')
+    # verification takes the cost from the hash itself, so any hasher can check it
+    assert BcryptHasher().verify(raw_data=passphrase.encode(), hashed_data=hashed_passphrase) is True
+
+
+async def test_hashing_engine_rejects_when_full(hashing_engine: ProcessPoolHashingEngine, faker: Faker) -> None:
+    results = await asyncio.gather(
+        *(hashing_engine.hash(raw_data=faker.pystr(min_chars=10)) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    rejected = [result for result in results if isinstance(result, app_exceptions.HashingEngineOverloadedError)]
+    assert len(rejected) == 1
+    assert rejected[0].retry_after == 3
+    assert hashing_engine.stats().rejected == 1
+
+
+async def test_hashing_engine_admits_batches_per_window(hashing_engine: ProcessPoolHashingEngine, faker: Faker) -> None:
+    # one worker and one queue slot: a batch takes a slot per passphrase of its window, which is half the capacity
+    busy = [asyncio.create_task(hashing_engine.hash(raw_data=faker.pystr(min_chars=10))) for _ in range(2)]
+    await asyncio.sleep(0)
+    with pytest.raises(app_exceptions.HashingEngineOverloadedError):
+        await hashing_engine.hash_many(raw_data=[faker.pystr(min_chars=10)])
+    await asyncio.gather(*busy)
+
+    # larger than the whole capacity, still admitted window by window
+    passphrases = [faker.pystr(min_chars=10) for _ in range(3)]
+    hashed_passphrases = await hashing_engine.hash_many(raw_data=passphrases)
+
+    assert len(hashed_passphrases) == len(passphrases)
+    assert await hashing_engine.verify(raw_data=passphrases[2].encode(), hashed_data=hashed_passphrases[2]) is True
+    assert hashing_engine.stats().rejected == 1
+    assert hashing_engine.stats().in_flight == 0
+
+
+async def test_hashing_engine_replaces_broken_pool(hashing_engine: ProcessPoolHashingEngine, faker: Faker) -> None:
+    await hashing_engine.hash(raw_data=faker.pystr(min_chars=10))
+    broken = hashing_engine._executor
+    for process in list(broken._processes.values()):
+        process.kill()
+        process.join()
+
+    passphrase = faker.pystr(min_chars=10)
+    hashed_passphrase = await hashing_engine.hash(raw_data=passphrase)
+
+    assert hashing_engine._executor is not broken
+    assert await hashing_engine.verify(raw_data=passphrase.encode(), hashed_data=hashed_passphrase) is True
+    assert hashing_engine.stats().in_flight == 0
+
+
+@pytest.fixture
+def buffer_session() -> AsyncMock:
+    return AsyncMock(spec=AsyncSession)
+
+
+@pytest.fixture
+async def event_buffer(buffer_session: AsyncMock) -> BufferedEventSaver:
+    session_maker = MagicMock()
+    session_maker.return_value.__aenter__.return_value = buffer_session
+
+    event_buffer = BufferedEventSaver(
+        session_maker=session_maker,
+        flush_interval=0.05,
+        flush_batch_size=2,
+        max_buffer_size=10,
+    )
+    yield event_buffer
+    await event_buffer.close()
+
+
+def make_event(faker: Faker) -> EventDM:
+    return EventDM(
+        uuid=uuid4(),
+        client_ip=faker.ipv4(),
+        client_user_agent=faker.user_agent(),
+        type=EventType.CREATE,
+        created_at=datetime.now(),
+        secret_id=uuid4(),
+    )
+
+
+async def test_event_buffer_flushes_full_batch(
+    event_buffer: BufferedEventSaver,
+    buffer_session: AsyncMock,
+    faker: Faker,
+) -> None:
+    events = [make_event(faker) for _ in range(2)]
+
+    await event_buffer.save_many(events=events)
+    await asyncio.sleep(0.01)
+
+    buffer_session.execute.assert_awaited_once()
+    assert [params['uuid'] for params in buffer_session.execute.await_args.kwargs['params']] == [
+        event.uuid for event in events
+    ]
+    buffer_session.commit.assert_awaited_once()
+
+
+async def test_event_buffer_flushes_partial_batch_after_interval(
+    event_buffer: BufferedEventSaver,
+    buffer_session: AsyncMock,
+    faker: Faker,
+) -> None:
+    await event_buffer.save(event=make_event(faker))
+    await asyncio.sleep(0.01)
+    buffer_session.execute.assert_not_awaited()
+
+    await asyncio.sleep(0.1)
+    buffer_session.execute.assert_awaited_once()
+
+
+async def test_event_buffer_keeps_events_on_failure(
+    event_buffer: BufferedEventSaver,
+    buffer_session: AsyncMock,
+    faker: Faker,
+) -> None:
+    buffer_session.execute.side_effect = [ConnectionError, None]
+    event = make_event(faker)
+
+    await event_buffer.save(event=event)
+    assert await event_buffer.flush() is False
+    assert await event_buffer.flush() is True
+
+    assert buffer_session.execute.await_args.kwargs['params'][0]['uuid'] == event.uuid
+
+
+async def test_encryption_roundtrip(encryption_service: EncryptionService, faker: Faker) -> None:
+    plaintext = faker.pystr(min_chars=10) + '\0'
+
+    ciphertext = encryption_service.encrypt(plaintext=plaintext)
+
+    assert ciphertext[0] == AesGcmCipherSuite.header
+    assert plaintext.encode() not in ciphertext
+    assert encryption_service.decrypt(ciphertext=ciphertext) == plaintext.encode()
+
+
+async def test_encryption_many(encryption_service: EncryptionService, faker: Faker) -> None:
+    plaintexts = [faker.pystr(min_chars=10) for _ in range(5)]
+
+    ciphertexts = encryption_service.encrypt_many(plaintexts=plaintexts)
+
+    assert len(set(ciphertexts)) == len(plaintexts)
+    assert encryption_service.decrypt_many(ciphertexts=ciphertexts) == [plaintext.encode() for plaintext in plaintexts]
+
+
+async def test_decrypt_legacy_ciphertext(encryption_service: EncryptionService, secret_key: bytes, faker: Faker) -> None:
+    plaintext = faker.pystr(min_chars=10)
+    legacy_ciphertext = LegacyAesCbcCipherSuite(secret_key=secret_key).encrypt(plaintext=plaintext.encode())
+
+    assert encryption_service.decrypt(ciphertext=legacy_ciphertext) == plaintext.encode()
+
+
+async def test_decrypt_tampered_ciphertext(encryption_service: EncryptionService, faker: Faker) -> None:
+    ciphertext = bytearray(encryption_service.encrypt(plaintext=faker.pystr(min_chars=10)))
+    ciphertext[-1] ^= 1
+
+    with pytest.raises(InvalidTag):
+        encryption_service.decrypt(ciphertext=bytes(ciphertext))
+
+
+@pytest.mark.parametrize(
+    'secret_dm',
+    [
+        SecretDM(
+            uuid=uuid4(),
+            secret=b'\x01' + bytes(range(256)),
+            passphrase=b'$2b$12$hashed',
+            created_at=datetime(2025, 4, 10, 10, 7, 42, 123456, tzinfo=UTC),
+            expired_at=datetime(2025, 4, 10, 11, 7, 42, 123456, tzinfo=UTC),
+            is_deleted=False,
+        ),
+        SecretDM(
+            uuid=uuid4(),
+            secret=b'',
+            passphrase=None,
+            created_at=datetime(1969, 12, 31, 23, 59, 59, 999999),
+            expired_at=None,
+            is_deleted=True,
+        ),
+        SecretDM(
+            uuid=uuid4(),
+            secret=b'\x01',
+            passphrase=None,
+            created_at=datetime(2025, 4, 10, 10, 7, 42),
+            expired_at=datetime(2025, 4, 10, 13, 7, 42, tzinfo=timezone(timedelta(hours=3))),
+            is_deleted=False,
+        ),
+    ],
+)
+async def test_cache_mapper_binary_roundtrip(data_mapper: SecretCacheDataMapper, secret_dm: SecretDM) -> None:
+    data = data_mapper.entity_to_bytes(secret=secret_dm)
+
+    decoded = data_mapper.bytes_to_entity(data=data)
+    assert decoded == secret_dm
+    assert (decoded.created_at.tzinfo is None) == (secret_dm.created_at.tzinfo is None)
+    if secret_dm.expired_at is not None:
+        assert (decoded.expired_at.tzinfo is None) == (secret_dm.expired_at.tzinfo is None)
+
+
+async def test_cache_mapper_reads_json_entries(data_mapper: SecretCacheDataMapper, faker: Faker) -> None:
+    secret_dm = SecretDM(
+        uuid=uuid4(),
+        secret=faker.pystr(min_chars=10).encode(),
+        passphrase=None,
+        created_at=datetime.now(),
+        expired_at=None,
+        is_deleted=False,
+    )
+
+    data = data_mapper.entity_to_json(secret=secret_dm).encode()
+
+    assert data_mapper.bytes_to_entity(data=data) == secret_dm
+
+
+def make_secret_dm(faker: Faker, expired_at: datetime | None = None) -> SecretDM:
+    return SecretDM(
+        uuid=uuid4(),
+        secret=faker.pystr(min_chars=10).encode(),
+        passphrase=None,
+        created_at=datetime.now(UTC),
+        expired_at=expired_at,
+        is_deleted=False,
+    )
+
+
+async def test_in_memory_secret_delete_after_claim(faker: Faker) -> None:
+    repository = InMemorySecretRepository()
+    secret_dm = make_secret_dm(faker)
+    await repository.save(secret=secret_dm)
+    await repository.claim(secret_id=secret_dm.uuid)
+
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await repository.delete(secret=secret_dm)
+
+
+async def test_in_memory_secret_claim_is_single_use(faker: Faker) -> None:
+    repository = InMemorySecretRepository()
+    secret_dm = make_secret_dm(faker)
+    await repository.save(secret=secret_dm)
+
+    results = await asyncio.gather(
+        *(repository.claim(secret_id=secret_dm.uuid) for _ in range(3)),
+        return_exceptions=True,
+    )
+
+    claimed = [result for result in results if isinstance(result, SecretDM)]
+    assert len(claimed) == 1
+    assert claimed[0].secret == secret_dm.secret
+    assert claimed[0].is_deleted is True
+    assert sum(isinstance(result, domain_exceptions.SecretNotFound) for result in results) == 2
+    with pytest.raises(domain_exceptions.SecretNotFound):
+        await repository.get_by_id(secret_id=secret_dm.uuid)
+
+
+async def test_in_memory_secret_sweep_expired(faker: Faker) -> None:
+    repository = InMemorySecretRepository()
+    now = datetime.now(UTC)
+    expired = [make_secret_dm(faker, expired_at=now - timedelta(minutes=1)) for _ in range(20)]
+    burned = make_secret_dm(faker, expired_at=now - timedelta(minutes=1))
+    live = [make_secret_dm(faker, expired_at=now + timedelta(hours=1)), make_secret_dm(faker)]
+    await repository.save_many(secrets=[*expired, burned, *live])
+    await repository.claim(secret_id=burned.uuid)
+
+    by_shard = [await repository.sweep_expired(limit=100, shard=shard, shards=2) for shard in range(2)]
+
+    assert {swept.uuid for swept in by_shard[0]} == {s.uuid for s in expired if s.uuid.bytes[15] % 2 == 0}
+    assert {swept.uuid for swept in by_shard[1]} == {s.uuid for s in expired if s.uuid.bytes[15] % 2 == 1}
+    assert all(swept.expiry_lag >= timedelta(minutes=1) for swept in by_shard[0])
+    assert await repository.sweep_expired(limit=100) == []
+    assert set(await repository.get_live_ids(limit=10)) == {s.uuid for s in live}
+
+
+async def test_in_memory_event_ring_buffer(faker: Faker) -> None:
+    repository = InMemoryEventRepository(capacity=5)
+    started = datetime.now(UTC)
+    events = [
+        EventDM(
+            uuid=uuid4(),
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+            type=EventType.CREATE,
+            created_at=started + timedelta(seconds=i),
+            secret_id=uuid4(),
+        )
+        for i in range(7)
+    ]
+    # the last two arrive out of order
+    await repository.save_many(events=[*events[:5], events[6], events[5]])
+
+    assert await repository.count() == 5
+    first_page = await repository.get_page(limit=3)
+    assert first_page == [events[6], events[5], events[4]]
+    cursor = KeysetCursor(created_at=first_page[-1].created_at, uuid=first_page[-1].uuid)
+    assert await repository.get_page(limit=3, after=cursor) == [events[3], events[2]]
+
+
+async def test_in_memory_event_stats(faker: Faker) -> None:
+    repository = InMemoryEventRepository(capacity=10)
+    started = datetime(2025, 5, 20, 10, 59, 30, tzinfo=UTC)
+    await repository.save_many(
+        events=[
+            EventDM(
+                uuid=uuid4(),
+                client_ip=faker.ipv4(),
+                client_user_agent=faker.user_agent(),
+                type=EventType.READ,
+                created_at=started + timedelta(seconds=20 * i),
+                secret_id=uuid4(),
+            )
+            for i in range(4)
+        ],
+    )
+
+    counts = await repository.get_counts(bucket=StatsBucket.MINUTE, start=started, end=started + timedelta(minutes=1))
+    assert [(row.bucket_start.minute, row.count) for row in counts] == [(59, 2), (0, 1)]
+
+
+def open_log_store(path: Path, **kwargs) -> LogStructuredStore:
+    store = LogStructuredStore(path=path, data_mapper=SecretCacheDataMapper(), index_capacity=16, **kwargs)
+    store.open()
+    return store
+
+
+async def test_log_store_recovers_after_reopen(tmp_path: Path, faker: Faker) -> None:
+    store = open_log_store(tmp_path)
+    secrets = [make_secret_dm(faker, expired_at=datetime.now(UTC) + timedelta(hours=1)) for _ in range(50)]
+    for secret_dm in secrets:
+        store.put(secret_dm)
+    burned = store.remove(secrets[0].uuid)
+    await store.sync()
+    # no close, as after a crash: the checkpoint is still where open() left it and the whole tail is replayed
+
+    reopened = open_log_store(tmp_path)
+
+    assert burned is not None and burned.secret == secrets[0].secret
+    assert reopened.get(secrets[0].uuid) is None
+    assert reopened.get(secrets[1].uuid) == secrets[1]
+    assert len(reopened.live_ids(limit=100)) == 49
+    reopened.close()
+
+
+async def test_log_store_truncates_torn_tail(tmp_path: Path, faker: Faker) -> None:
+    store = open_log_store(tmp_path)
+    kept, torn = make_secret_dm(faker), make_secret_dm(faker)
+    store.put(kept)
+    store.put(torn)
+    store.close()
+    segment = next(tmp_path.glob('segment-*.log'))
+    # the index checkpoint now points past the end of the log, so it is rebuilt from the segments
+    os.truncate(segment, segment.stat().st_size - 3)
+
+    reopened = open_log_store(tmp_path)
+
+    assert reopened.get(kept.uuid) == kept
+    assert reopened.get(torn.uuid) is None
+    reopened.put(torn)
+    assert reopened.get(torn.uuid) == torn
+    reopened.close()
+
+
+async def test_log_store_compaction(tmp_path: Path, faker: Faker) -> None:
+    store = open_log_store(tmp_path, segment_size=4096)
+    secrets = [make_secret_dm(faker) for _ in range(200)]
+    for secret_dm in secrets:
+        store.put(secret_dm)
+    for secret_dm in secrets[:150]:
+        store.remove(secret_dm.uuid)
+    segments_before = len(list(tmp_path.glob('segment-*.log')))
+
+    reclaimed = await store.compact()
+    store.close()
+    reopened = open_log_store(tmp_path)
+
+    assert reclaimed > 0
+    assert len(list(tmp_path.glob('segment-*.log'))) < segments_before
+    assert all(reopened.get(secret_dm.uuid) is None for secret_dm in secrets[:150])
+    assert all(reopened.get(secret_dm.uuid) == secret_dm for secret_dm in secrets[150:])
+    reopened.close()
+
+
+async def test_log_store_index_spreads_uuid4_keys(tmp_path: Path) -> None:
+    index = MmapIndex.create(tmp_path / 'index.bin', capacity=1 << 16)
+    keys = [uuid4().bytes for _ in range(20000)]
+    for i, key in enumerate(keys):
+        index.put(key, IndexEntry(segment=1, offset=i, length=1, expires_at=0))
+
+    table = index._table
+    mask = table.capacity - 1
+    # with the version nibble in the hash only 4096 home slots exist and these probes run into the thousands
+    assert max((table._find(key)[0] - table._home(key)) & mask for key in keys) < 64
+    assert all(index.get(key).offset == i for i, key in enumerate(keys))
+    index.close()
+
+
+async def test_log_store_index_grows_incrementally(tmp_path: Path) -> None:
+    index = MmapIndex.create(tmp_path / 'index.bin', capacity=16)
+    keys = [uuid4().bytes for _ in range(3000)]
+    for i, key in enumerate(keys):
+        index.put(key, IndexEntry(segment=1, offset=i, length=1, expires_at=0))
+        if i % 3 == 0:
+            index.remove(keys[i // 3])
+
+    removed = set(keys[:1000])
+    assert index.live == len(keys) - len(removed)
+    assert all(index.get(key) is None for key in removed)
+    assert all(index.get(key).offset == i for i, key in enumerate(keys) if key not in removed)
+    assert index.capacity * 0.7 >= index.live
+
+    index.close()
+    assert not (tmp_path / 'index.resize').exists()
+    reopened = MmapIndex.load(tmp_path / 'index.bin')
+    assert reopened is not None
+    assert sorted(key for key, _ in reopened.items()) == sorted(set(keys) - removed)
+    reopened.close()
+
+
+async def test_log_store_index_recounts_after_crash(tmp_path: Path) -> None:
+    index = MmapIndex.create(tmp_path / 'index.bin', capacity=1024)
+    keys = [uuid4().bytes for _ in range(700)]
+    for i, key in enumerate(keys[:100]):
+        index.put(key, IndexEntry(segment=1, offset=i, length=1, expires_at=0))
+    index.flush()
+    for i, key in enumerate(keys[100:], start=100):
+        index.put(key, IndexEntry(segment=1, offset=i, length=1, expires_at=0))
+    # no close, as after a crash: the header still holds the counters of the flush above
+
+    reopened = MmapIndex.load(tmp_path / 'index.bin')
+    assert reopened is not None
+    assert reopened.live == len(keys)
+
+    more = [uuid4().bytes for _ in range(1000)]
+    for i, key in enumerate(more):
+        reopened.put(key, IndexEntry(segment=2, offset=i, length=1, expires_at=0))
+    assert reopened.live == len(keys) + len(more)
+    assert reopened.capacity * 0.7 >= reopened.live
+    assert all(reopened.get(key) is not None for key in keys + more)
+    reopened.close()
+
+
+async def test_log_store_live_ids_walk(tmp_path: Path, faker: Faker) -> None:
+    store = open_log_store(tmp_path)
+    secrets = [make_secret_dm(faker) for _ in range(25)]
+    for secret_dm in secrets:
+        store.put(secret_dm)
+
+    walked, after = [], None
+    while chunk := store.live_ids(limit=10, after=after):
+        walked.extend(chunk)
+        after = chunk[-1]
+
+    assert walked == sorted(secret_dm.uuid for secret_dm in secrets)
+    store.close()
+
+
+async def test_periodic_scheduler_survives_failures() -> None:
+    scheduler = PeriodicScheduler()
+    failing = AsyncMock(side_effect=RuntimeError)
+    scheduler.add(name='failing', func=failing, interval=0.01)
+
+    scheduler.start()
+    await asyncio.sleep(0.055)
+    await scheduler.stop()
+
+    stats = scheduler.stats()['failing']
+    assert failing.await_count >= 3
+    assert stats.runs == failing.await_count
+    assert stats.failures == stats.runs
+
+
+async def test_periodic_scheduler_skips_overlapping_runs() -> None:
+    calls = 0
+
+    async def slow() -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.035)
+
+    scheduler = PeriodicScheduler()
+    scheduler.add(name='slow', func=slow, interval=0.01, mode=ScheduleMode.FIXED_RATE)
+
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.stop(grace=0)
+
+    assert calls == 2
+    assert scheduler.stats()['slow'].skipped >= 2
+
+
+async def test_periodic_scheduler_stop_waits_for_running_job() -> None:
+    finished = asyncio.Event()
+
+    async def job() -> None:
+        await asyncio.sleep(0.02)
+        finished.set()
+
+    scheduler = PeriodicScheduler()
+    scheduler.add(name='job', func=job, interval=10, mode=ScheduleMode.FIXED_DELAY)
+
+    scheduler.start()
+    await asyncio.sleep(0.005)
+    await scheduler.stop(grace=1)
+
+    assert finished.is_set()
+    assert scheduler.stats()['job'].runs == 1
+
+
+async def test_metrics_registry_renders_histograms() -> None:
+    registry = create_metrics_registry()
+
+    stages = registry.stages(operation='create_secret')
+    stages.lap(stage='hash')
+    registry.observe('repository_call_seconds', 0.003, repository='secret', method='claim')
+    registry.observe('repository_call_seconds', 20, repository='secret', method='claim')
+
+    lines = registry.render().splitlines()
+
+    assert '# TYPE secret_manager_stage_seconds histogram' in lines
+    assert 'secret_manager_stage_seconds_count{operation="create_secret",stage="hash"} 1' in lines
+    assert 'secret_manager_repository_call_seconds_bucket{repository="secret",method="claim",le="0.0025"} 0' in lines
+    assert 'secret_manager_repository_call_seconds_bucket{repository="secret",method="claim",le="0.005"} 1' in lines
+    assert 'secret_manager_repository_call_seconds_bucket{repository="secret",method="claim",le="+Inf"} 2' in lines
+    assert 'secret_manager_repository_call_seconds_sum{repository="secret",method="claim"} 20.003' in lines
+
+
+async def test_instrumented_repository_and_executor(faker: Faker) -> None:
+    registry = create_metrics_registry()
+    secret_dm = make_secret_dm(faker)
+
+    repository = instrument_repository(InMemorySecretRepository(), metrics=registry, name='secret')
+    await repository.save(secret=secret_dm)
+    # the repository is instrumented in place and keeps its type
+    assert isinstance(repository, InMemorySecretRepository)
+    assert (await repository.claim(secret_id=secret_dm.uuid)).secret == secret_dm.secret
+
+    with InstrumentedThreadPoolExecutor(max_workers=1, metrics=registry, name='default') as executor:
+        assert await asyncio.get_running_loop().run_in_executor(executor, sum, [1, 2]) == 3
+
+    rendered = registry.render()
+    assert 'secret_manager_repository_call_seconds_count{repository="secret",method="claim"} 1' in rendered
+    assert 'secret_manager_executor_wait_seconds_count{executor="default"} 1' in rendered
@@ -1,5 +1,6 @@
+import gzip
 from collections.abc import AsyncIterator
-from datetime import datetime
+from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 from uuid import uuid4
 
@@ -14,10 +15,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from backend import ioc
 from backend.application import interfaces
 from backend.config import Config
-from backend.domain.entities.event_dm import EventType
+from backend.domain.entities.event_dm import EventDM, EventType
 from backend.infrastructure.models import Event, Secret
 from backend.presentation.api.exceptions_mapping import EXCEPTIONS_MAPPING
+from backend.presentation.api.middlewares.no_cache import NoCacheMiddleware
 from backend.presentation.api.routers import router
+from backend.presentation.api.routers.event.export import ExportFormat, encode_events, gzip_chunks
 
 pytestmark = pytest.mark.asyncio
 
@@ -37,6 +40,9 @@ def mock_provider(session: AsyncSession) -> Provider:
             encryption_service.decrypt = (
                 lambda ciphertext, **kwargs: ciphertext.decode().replace('_encrypt_data', '').encode()
             )
+            encryption_service.encrypt_many = lambda plaintexts, **kwargs: [
+                encryption_service.encrypt(plaintext) for plaintext in plaintexts
+            ]
 
             return encryption_service
 
@@ -64,6 +70,21 @@ async def test_create_secret(session: AsyncSession, client: AsyncClient, faker:
     assert 'secret_key' in response.json()
 
 
+async def test_create_secret_batch(session: AsyncSession, client: AsyncClient, faker: Faker):
+    secrets = [faker.pystr(min_chars=10) for _ in range(3)]
+    response = await client.post(
+        url='/api/secret/batch',
+        json={'secrets': [{'secret': secret, 'ttl_seconds': 60} for secret in secrets]},
+    )
+    assert response.status_code == 200
+    secret_keys = response.json()['secret_keys']
+    assert len(secret_keys) == len(secrets)
+
+    for secret_key, secret in zip(secret_keys, secrets, strict=True):
+        response = await client.get(url=f'/api/secret/{secret_key}')
+        assert response.json()['secret'] == secret
+
+
 async def test_success_get_secret(session: AsyncSession, client: AsyncClient, faker: Faker):
     uuid = str(uuid4())
     secret = faker.pystr(min_chars=10)
@@ -76,7 +97,7 @@ async def test_success_get_secret(session: AsyncSession, client: AsyncClient, fa
             created_at=datetime.now(),
             expired_at=None,
             is_deleted=False,
-        )
+        ),
     )
     await session.flush()
 
@@ -97,7 +118,7 @@ async def test_failure_get_secret(session: AsyncSession, client: AsyncClient, fa
             created_at=datetime.now(),
             expired_at=None,
             is_deleted=True,
-        )
+        ),
     )
     await session.flush()
 
@@ -105,6 +126,11 @@ async def test_failure_get_secret(session: AsyncSession, client: AsyncClient, fa
     assert response.status_code == 404
 
 
+async def test_get_secret_malformed_key(client: AsyncClient):
+    response = await client.get(url='/api/secret/not-a-uuid')
+    assert response.status_code == 422
+
+
 async def test_delete_secret(session: AsyncSession, client: AsyncClient, faker: Faker):
     uuid = str(uuid4())
     secret = faker.pystr(min_chars=10)
@@ -117,7 +143,7 @@ async def test_delete_secret(session: AsyncSession, client: AsyncClient, faker:
             created_at=datetime.now(),
             expired_at=None,
             is_deleted=False,
-        )
+        ),
     )
     await session.flush()
 
@@ -154,3 +180,146 @@ async def test_get_events(session: AsyncSession, client: AsyncClient, faker: Fak
     assert response_json['events'][0]['type'] == event_type
     assert datetime.fromisoformat(response_json['events'][0]['created_at']) == created_at
     assert response_json['events'][0]['secret_id'] == secret_id
+
+
+async def test_get_events_by_cursor(session: AsyncSession, client: AsyncClient, faker: Faker):
+    created_at = datetime.now()
+    uuids = [str(uuid4()) for _ in range(3)]
+
+    for i, uuid in enumerate(uuids):
+        session.add(
+            Event(
+                uuid=uuid,
+                client_ip=faker.ipv4(),
+                client_user_agent=faker.user_agent(),
+                type=EventType.CREATE,
+                created_at=created_at - timedelta(seconds=i),
+                secret_id=str(uuid4()),
+            ),
+        )
+    await session.flush()
+
+    response = await client.get(url='/api/event', params={'page_size': 2})
+    assert response.status_code == 200
+    first_page = response.json()
+    assert [event['id'] for event in first_page['events']] == uuids[:2]
+    assert first_page['next_cursor'] is not None
+
+    response = await client.get(url='/api/event', params={'page_size': 2, 'cursor': first_page['next_cursor']})
+    assert response.status_code == 200
+    second_page = response.json()
+    assert [event['id'] for event in second_page['events']] == uuids[2:]
+    assert second_page['next_cursor'] is None
+
+
+async def test_get_events_filtered(session: AsyncSession, client: AsyncClient, faker: Faker):
+    created_at = datetime.now()
+    secret_id = str(uuid4())
+    events = ((EventType.CREATE, secret_id), (EventType.READ, secret_id), (EventType.READ, str(uuid4())))
+    for event_type, event_secret_id in events:
+        session.add(
+            Event(
+                uuid=str(uuid4()),
+                client_ip=faker.ipv4(),
+                client_user_agent=faker.user_agent(),
+                type=event_type,
+                created_at=created_at,
+                secret_id=event_secret_id,
+            ),
+        )
+    await session.flush()
+
+    response = await client.get(url='/api/event', params={'page_size': 10, 'secret_id': secret_id, 'count': 'exact'})
+    assert response.status_code == 200
+    assert response.json()['total'] == 2
+    assert {event['type'] for event in response.json()['events']} == {EventType.CREATE, EventType.READ}
+
+    response = await client.get(url='/api/event', params={'page_size': 10, 'secret_id': secret_id, 'type': 'READ'})
+    assert [event['type'] for event in response.json()['events']] == [EventType.READ]
+
+    response = await client.get(
+        url='/api/event',
+        params={'page_size': 10, 'secret_id': secret_id, 'to': (created_at - timedelta(minutes=1)).isoformat()},
+    )
+    assert response.json()['events'] == []
+
+
+async def test_get_events_invalid_cursor(client: AsyncClient):
+    response = await client.get(url='/api/event', params={'page_size': 2, 'cursor': '%%%'})
+    assert response.status_code == 400
+
+
+async def test_export_events_filtered(session: AsyncSession, client: AsyncClient, faker: Faker):
+    created_at = datetime.now()
+    session.add(
+        Event(
+            uuid=str(uuid4()),
+            client_ip=faker.ipv4(),
+            client_user_agent=faker.user_agent(),
+            type=EventType.CREATE,
+            created_at=created_at,
+            secret_id=str(uuid4()),
+        ),
+    )
+    await session.flush()
+
+    response = await client.get(
+        url='/api/event/export',
+        params={'format': 'csv', 'to': (created_at - timedelta(minutes=1)).isoformat()},
+    )
+    assert response.status_code == 200
+    assert response.text.splitlines() == ['id,client_ip,client_user_agent,type,created_at,secret_id']
+
+
+async def test_export_encoding(faker: Faker):
+    events = [
+        EventDM(
+            uuid=uuid4(),
+            client_ip=faker.ipv4(),
+            client_user_agent='agent, with "quotes"',
+            type=EventType.READ,
+            created_at=datetime(2025, 5, 20, 10, i),
+            secret_id=uuid4(),
+        )
+        for i in range(3)
+    ]
+
+    async def batches() -> AsyncIterator[list[EventDM]]:
+        yield events[:2]
+        yield events[2:]
+
+    chunks = [chunk async for chunk in gzip_chunks(encode_events(batches(), ExportFormat.CSV))]
+    lines = gzip.decompress(b''.join(chunks)).decode().splitlines()
+
+    assert lines[0] == 'id,client_ip,client_user_agent,type,created_at,secret_id'
+    assert lines[1] == (
+        f'{events[0].uuid},{events[0].client_ip},"agent, with ""quotes""",READ,'
+        f'2025-05-20T10:00:00,{events[0].secret_id}'
+    )
+    assert len(lines) == 4
+
+
+@pytest.mark.parametrize('security_headers', [False, True])
+async def test_no_cache_middleware(container: AsyncContainer, security_headers: bool):
+    app = FastAPI(exception_handlers=EXCEPTIONS_MAPPING)
+    app.include_router(router)
+    app.add_middleware(NoCacheMiddleware, security_headers=security_headers)
+    fastapi_integration.setup_dishka(container, app)
+
+    async with AsyncClient(transport=ASGITransport(app), base_url='http://test') as client:
+        response = await client.get(url='/api/secret/not-a-uuid')
+
+    assert response.headers['cache-control'] == 'no-cache, no-store, must-revalidate'
+    assert response.headers['pragma'] == 'no-cache'
+    assert response.headers['expires'] == '0'
+    assert ('x-content-type-options' in response.headers) is security_headers
+
+
+async def test_metrics(client: AsyncClient, faker: Faker):
+    await client.post(url='/api/secret', json={'secret': faker.pystr(min_chars=10)})
+
+    response = await client.get(url='/metrics')
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith('text/plain; version=0.0.4')
+    assert 'secret_manager_stage_seconds_count{operation="create_secret",stage="commit"} 1' in response.text